@@ -10,7 +10,13 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+from pyomo.environ import check_optimal_termination
+
 from idaes.core.util.exceptions import InitializationError
+import idaes.logger as idaeslog
+
+from watertap.core.solvers import get_solver
+from watertap.core.util.presolve import presolve_block
 
 
 class InitializationMixin:
@@ -25,3 +31,90 @@ class InitializationMixin:
             for blk in self._initialization_order:
                 blk.activate()
             raise
+
+
+class PresolveInitializationMixin:
+    """
+    Class adding an optional pre-solve with ``presolve_block`` to the
+    initialization routine of unit models with a single control volume, e.g.
+    reactors with ASM kinetics, to start the solver from the steady state.
+    Without the pre-solve, the initialization routine of the base class is
+    used unchanged.
+    """
+
+    def initialize_build(
+        self,
+        state_args=None,
+        outlvl=idaeslog.NOTSET,
+        solver=None,
+        optarg=None,
+        presolve=False,
+    ):
+        """
+        Initialization routine for the unit model.
+
+        Keyword Arguments:
+            state_args : a dict of arguments to be passed to the property
+                           package(s) to provide an initial state for
+                           initialization (see documentation of the specific
+                           property package) (default = {}).
+            outlvl : sets output level of initialization routine
+            optarg : solver options dictionary object (default=None, use
+                     default solver options)
+            solver : str indicating which solver to use during
+                     initialization (default = None, use default IDAES solver)
+            presolve : bool indicating whether to pre-solve the unit model with
+                     a Newton method before solving it with the solver
+                     (default = False)
+
+        Returns:
+            None
+        """
+        if not presolve:
+            return super().initialize_build(
+                state_args=state_args, outlvl=outlvl, solver=solver, optarg=optarg
+            )
+
+        # Same steps as UnitModelBlockData.initialize_build, with the pre-solve
+        # before solving the unit
+        if optarg is None:
+            optarg = {}
+
+        init_log = idaeslog.getInitLogger(self.name, outlvl, tag="unit")
+        solve_log = idaeslog.getSolveLogger(self.name, outlvl, tag="unit")
+
+        opt = get_solver(solver, optarg)
+
+        # ---------------------------------------------------------------------
+        # Initialize control volume block
+        flags = self.control_volume.initialize(
+            outlvl=outlvl,
+            optarg=optarg,
+            solver=solver,
+            state_args=state_args,
+        )
+
+        init_log.info_high("Initialization Step 1 Complete.")
+
+        # ---------------------------------------------------------------------
+        # Pre-solve and solve unit
+        presolve_block(self, outlvl=outlvl)
+
+        with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+            results = opt.solve(self, tee=slc.tee)
+
+        init_log.info_high(
+            "Initialization Step 2 {}.".format(idaeslog.condition(results))
+        )
+
+        # ---------------------------------------------------------------------
+        # Release Inlet state
+        self.control_volume.release_state(flags, outlvl)
+
+        if not check_optimal_termination(results):
+            raise InitializationError(
+                f"{self.name} failed to initialize successfully. Please check "
+                f"the output logs for more information."
+            )
+
+        init_log.info("Initialization Complete: {}".format(idaeslog.condition(results)))
@@ -14,8 +14,10 @@ Tests for WaterTAP database wrapper
 """
 import pytest
 import os
+import shutil
+from copy import deepcopy
 
-from watertap.core.wt_database import Database
+from watertap.core.wt_database import Database, ReadOnlyDict
 
 
 @pytest.mark.unit
@@ -227,3 +229,124 @@ class TestDatabase:
         db.flush_cache()
 
         assert db._cached_files == {}
+
+
+class TestPreload:
+    @pytest.fixture
+    def dbpath(self, tmp_path):
+        src = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "..",
+            "..",
+            "data",
+            "techno_economic",
+        )
+        for f in ["component_list", "water_sources", "nanofiltration"]:
+            shutil.copy(os.path.join(src, f + ".yaml"), tmp_path)
+        return str(tmp_path)
+
+    @pytest.mark.unit
+    def test_preload(self, dbpath):
+        db = Database(dbpath=dbpath)
+        db.preload()
+
+        assert set(db._cached_files) == {"water_sources", "nanofiltration"}
+        assert db._component_list is not None
+        assert set(db._file_mtimes) == {
+            "component_list",
+            "water_sources",
+            "nanofiltration",
+        }
+
+        # Data is served from the cache without re-reading files
+        os.remove(os.path.join(dbpath, "nanofiltration.yaml"))
+        assert "capital_cost" in db.get_unit_operation_parameters("nanofiltration")
+
+        # Removed files are dropped on the next preload
+        db.preload()
+        assert "nanofiltration" not in db._cached_files
+
+    @pytest.mark.unit
+    def test_read_only(self, dbpath):
+        db = Database(dbpath=dbpath)
+
+        data = db.get_unit_operation_parameters("nanofiltration")
+        assert isinstance(data, ReadOnlyDict)
+        assert data is db.get_unit_operation_parameters("nanofiltration")
+        with pytest.raises(TypeError, match="Database parameter data is read-only."):
+            data["recovery_frac_mass_H2O"] = 1
+        with pytest.raises(TypeError, match="Database parameter data is read-only."):
+            data["recovery_frac_mass_H2O"]["value"] = 1
+        with pytest.raises(TypeError, match="Database parameter data is read-only."):
+            data.update({})
+
+        # Copies are not needed, so the same object is returned
+        assert deepcopy(data) is data
+
+        # Merged subtype data is read-only too
+        sdata = db.get_unit_operation_parameters(
+            "nanofiltration", subtype="rHGO_dye_rejection"
+        )
+        assert isinstance(sdata, ReadOnlyDict)
+        with pytest.raises(TypeError, match="Database parameter data is read-only."):
+            sdata.pop("recovery_frac_mass_H2O")
+
+    @pytest.mark.unit
+    def test_mtime_invalidation(self, dbpath):
+        db = Database(dbpath=dbpath)
+        db.preload()
+        data = db._cached_files["nanofiltration"]
+
+        # Unchanged files are not re-read
+        db.preload()
+        assert db._cached_files["nanofiltration"] is data
+
+        fpath = os.path.join(dbpath, "nanofiltration.yaml")
+        with open(fpath, "a") as f:
+            f.write("\nnew_subtype:\n  energy_electric_flow_vol_inlet:\n    value: 1\n")
+        mtime = os.stat(fpath).st_mtime_ns + 1000000000
+        os.utime(fpath, ns=(mtime, mtime))
+
+        db.preload()
+        assert db._cached_files["nanofiltration"] is not data
+        assert "new_subtype" in db._cached_files["nanofiltration"]
+
+    @pytest.mark.unit
+    def test_compiled_cache(self, dbpath, tmp_path):
+        cache_file = str(tmp_path / "db_cache.pkl")
+
+        db = Database(dbpath=dbpath)
+        db.preload(cache_file=cache_file)
+        assert os.path.isfile(cache_file)
+
+        db2 = Database(dbpath=dbpath)
+        db2.preload(cache_file=cache_file)
+        assert db2._cached_files == db._cached_files
+        assert db2._component_list == db._component_list
+        assert isinstance(db2._cached_files["nanofiltration"]["default"], ReadOnlyDict)
+
+        # Stale entries are re-parsed
+        fpath = os.path.join(dbpath, "nanofiltration.yaml")
+        mtime = os.stat(fpath).st_mtime_ns + 1000000000
+        os.utime(fpath, ns=(mtime, mtime))
+        db3 = Database(dbpath=dbpath)
+        db3.preload(cache_file=cache_file)
+        assert db3._file_mtimes["nanofiltration"] == mtime
+        assert db3._cached_files == db._cached_files
+
+    @pytest.mark.unit
+    def test_compiled_cache_unreadable(self, dbpath, tmp_path):
+        cache_file = tmp_path / "db_cache.pkl"
+        cache_file.write_bytes(b"not a pickle")
+
+        db = Database(dbpath=dbpath)
+        db.preload(cache_file=str(cache_file))
+        assert "nanofiltration" in db._cached_files
+
+    @pytest.mark.unit
+    def test_shared(self, dbpath):
+        db = Database.shared(dbpath)
+
+        assert db is Database.shared(dbpath)
+        assert db is not Database.shared()
+        assert "nanofiltration" in db._cached_files
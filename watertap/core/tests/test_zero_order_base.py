@@ -361,6 +361,103 @@ class TestZOBase:
                 use_default_removal=True,
             )
 
+    @pytest.mark.unit
+    def test_set_params_from_data(self, model, caplog):
+        caplog.set_level(idaeslog.DEBUG, logger="watertap")
+        log = idaeslog.getLogger("idaes.watertap.core.zero_order_base")
+        log.setLevel(idaeslog.DEBUG)
+
+        model.fs.params.phase_list = ["Liq"]
+        model.fs.params.solvent_set = ["H2O"]
+        model.fs.params.solute_set = ["A", "B", "C"]
+        model.fs.params.component_list = ["H2O", "A", "B", "C"]
+
+        model.fs.unit = DerivedZOBase(property_package=model.fs.params)
+
+        model.fs.unit.recovery_vol = Var(model.fs.time)
+        model.fs.unit.energy = Var(model.fs.time, units=pyunits.kWh / pyunits.m**3)
+        model.fs.unit.scalar = Var(units=pyunits.m)
+
+        model.fs.unit.set_params_from_data(
+            model.fs.unit.recovery_vol,
+            {"recovery_vol": {"value": 0.42, "units": "m^3/m^3"}},
+        )
+        model.fs.unit.set_params_from_data(
+            model.fs.unit.energy,
+            {"energy": {"value": 3.6, "units": "MJ/m^3"}},
+        )
+        model.fs.unit.set_params_from_data(
+            model.fs.unit.scalar,
+            {"scalar": {"value": 2, "units": "km"}},
+        )
+
+        for t in model.fs.time:
+            assert model.fs.unit.recovery_vol[t].value == 0.42
+            assert model.fs.unit.recovery_vol[t].fixed
+            assert model.fs.unit.energy[t].value == pytest.approx(1, rel=1e-12)
+            assert model.fs.unit.energy[t].fixed
+        assert model.fs.unit.scalar.value == pytest.approx(2000, rel=1e-12)
+        assert model.fs.unit.scalar.fixed
+
+        assert "fs.unit.recovery_vol fixed to value 0.42 dimensionless" in caplog.text
+
+    @pytest.mark.unit
+    def test_set_params_from_data_indexed(self, model):
+        model.fs.params.phase_list = ["Liq"]
+        model.fs.params.solvent_set = ["H2O"]
+        model.fs.params.solute_set = ["A", "B", "C"]
+        model.fs.params.component_list = ["H2O", "A", "B", "C"]
+
+        model.fs.unit = DerivedZOBase(property_package=model.fs.params)
+
+        model.fs.unit.removal_frac_mass_comp = Var(
+            model.fs.time, model.fs.params.solute_set
+        )
+
+        model.fs.unit.set_params_from_data(
+            model.fs.unit.removal_frac_mass_comp,
+            {
+                "removal_frac_mass_comp": {
+                    "A": {"value": 0.42, "units": "m^3/m^3"},
+                    "B": {"value": 0.1, "units": "dimensionless"},
+                },
+                "default_removal_frac_mass_comp": {"value": 0.70, "units": "kg/kg"},
+            },
+            index_position=-1,
+            use_default_removal=True,
+        )
+
+        for t in model.fs.time:
+            assert model.fs.unit.removal_frac_mass_comp[t, "A"].value == 0.42
+            assert model.fs.unit.removal_frac_mass_comp[t, "B"].value == 0.1
+            assert model.fs.unit.removal_frac_mass_comp[t, "C"].value == 0.70
+        assert all(v.fixed for v in model.fs.unit.removal_frac_mass_comp.values())
+
+    @pytest.mark.unit
+    def test_set_params_from_data_indexed_no_entry(self, model):
+        model.fs.params.phase_list = ["Liq"]
+        model.fs.params.solvent_set = ["H2O"]
+        model.fs.params.solute_set = ["A", "B", "C"]
+        model.fs.params.component_list = ["H2O", "A", "B", "C"]
+
+        model.fs.unit = DerivedZOBase(property_package=model.fs.params)
+
+        model.fs.unit.removal_frac_mass_comp = Var(
+            model.fs.time, model.fs.params.solute_set
+        )
+
+        with pytest.raises(
+            KeyError,
+            match="fs.unit - database provided does not "
+            "contain an entry for removal_frac_mass_comp with "
+            "index B for technology.",
+        ):
+            model.fs.unit.set_params_from_data(
+                model.fs.unit.removal_frac_mass_comp,
+                {"removal_frac_mass_comp": {"A": {"value": 0.42, "units": "m^3/m^3"}}},
+                index_position=-1,
+            )
+
     @pytest.mark.unit
     def test_get_performance_contents(self, model):
         model.fs.params.phase_list = ["Liq"]
@@ -1,13 +1,18 @@
+import csv
+from functools import lru_cache
 from re import findall
 from pathlib import Path
 
 import pandas as pd
 from pyomo.environ import units as pyunits
 
+_PERIODIC_TABLE_PATH = Path(__file__).parent / "periodic_table.csv"
 
+
+@lru_cache(maxsize=None)
 def get_charge(watertap_name: str) -> int:
     """
-    Gets charge from WaterTAP formatted names.
+    Gets charge from WaterTAP formatted names. Results are cached.
     :param watertap_name: string name of a solute in WaterTAP format
     :return charge: integer value of charge
     """
@@ -51,20 +56,28 @@ def get_charge(watertap_name: str) -> int:
     return charge
 
 
-def get_molar_mass(watertap_name: str) -> float:
+@lru_cache(maxsize=None)
+def get_atomic_masses() -> dict:
     """
-    Extracts atomic weight data from a periodic table file
-    to generate the molar mass of a chemical substance.
-    TODO: additional testing for complex solutes
-    such as CH3CO2H, [UO2]2[OH]4, etc.
-    :param watertap_name: string name of a solute in WaterTAP format
-    :return molar_mass: float value for molar mass of solute
+    Reads the atomic mass of each element from the periodic table file. The
+    file is read once and the result cached; the returned dict must not be
+    modified.
+
+    :return atomic_masses: dict mapping element symbols to atomic masses in g/mol
     """
+    with open(_PERIODIC_TABLE_PATH, newline="") as f:
+        return {row["Symbol"]: float(row["AtomicMass"]) for row in csv.DictReader(f)}
 
-    periodic_table = get_periodic_table()
 
-    components = watertap_name.split("_")
-    elements = findall("[A-Z][a-z]?[0-9]*", components[0])
+@lru_cache(maxsize=1024)
+def _parse_formula(formula: str) -> tuple:
+    """
+    Parses the elements and their counts from a chemical formula.
+
+    :param formula: string formula of a solute, without the charge
+    :return element_counts: tuple of (element, count) pairs
+    """
+    elements = findall("[A-Z][a-z]?[0-9]*", formula)
     element_counts = {}
     for element in elements:
         if len(element) == 1:
@@ -80,28 +93,42 @@ def get_molar_mass(watertap_name: str) -> float:
         else:
             raise IOError(f" Too many characters in {element}.")
 
-        element_location = components[0].find(element)
+        element_location = formula.find(element)
 
-        if "[" in components[0]:
-            boundary = (components[0].find("["), components[0].find("]"))
-            coefficient = int(components[0][boundary[1] + 1])
+        if "[" in formula:
+            boundary = (formula.find("["), formula.find("]"))
+            coefficient = int(formula[boundary[1] + 1])
             if element_location > boundary[0] and element_location < boundary[1]:
                 element_counts[element] *= coefficient
 
+    return tuple(element_counts.items())
+
+
+@lru_cache(maxsize=None)
+def get_molar_mass(watertap_name: str) -> float:
+    """
+    Extracts atomic weight data from a periodic table file
+    to generate the molar mass of a chemical substance.
+    Results are cached.
+    TODO: additional testing for complex solutes
+    such as CH3CO2H, [UO2]2[OH]4, etc.
+    :param watertap_name: string name of a solute in WaterTAP format
+    :return molar_mass: float value for molar mass of solute
+    """
+
+    atomic_masses = get_atomic_masses()
+
+    formula = watertap_name.split("_")[0]
     molar_mass = 0
-    for element in element_counts:
+    for element, count in _parse_formula(formula):
         try:
-            atomic_mass = float(
-                periodic_table["AtomicMass"][
-                    (periodic_table["Symbol"] == element)
-                ].values[0]
-            )
-        except IndexError:
+            atomic_mass = atomic_masses[element]
+        except KeyError:
             raise IOError(
-                f"The symbol '{element}' from the component name '{components[0]}' could not be found in the periodic table."
+                f"The symbol '{element}' from the component name '{formula}' could not be found in the periodic table."
             )
 
-        molar_mass += element_counts[element] * atomic_mass
+        molar_mass += count * atomic_mass
 
     if not molar_mass:
         raise IOError(f"Molecular weight data could not be found for {watertap_name}.")
@@ -109,6 +136,16 @@ def get_molar_mass(watertap_name: str) -> float:
     return molar_mass
 
 
+def get_molar_masses(watertap_names) -> dict:
+    """
+    Gets the molar masses of several chemical substances, see get_molar_mass.
+
+    :param watertap_names: iterable of string names of solutes in WaterTAP format
+    :return molar_masses: dict mapping each name to its molar mass in g/mol
+    """
+    return {name: get_molar_mass(name) for name in watertap_names}
+
+
 def get_charge_group(charge: int) -> str:
     """
     Categorizes molecule based on its charge.
@@ -128,8 +165,7 @@ def get_charge_group(charge: int) -> str:
 
 
 def get_periodic_table() -> pd.DataFrame:
-    parent_dir = Path(__file__).parent
-    return pd.read_csv(parent_dir / "periodic_table.csv")
+    return pd.read_csv(_PERIODIC_TABLE_PATH)
 
 
 def get_molar_mass_quantity(watertap_name: str, units=pyunits.kg / pyunits.mol):
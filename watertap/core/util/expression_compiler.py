@@ -0,0 +1,191 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a compiler of Pyomo expressions to Python functions
+evaluating them with NumPy, for evaluating many expressions over arrays of
+input values without walking the expression trees every time.
+"""
+
+import numpy as np
+
+import pyomo.environ as pyo
+from pyomo.common.numeric_types import native_types
+from pyomo.core.base.units_container import _PyomoUnit
+from pyomo.core.expr import numeric_expr, relational_expr
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor
+
+_NUMPY_FUNCTIONS = {
+    "exp": "exp",
+    "log": "log",
+    "log10": "log10",
+    "sqrt": "sqrt",
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "asin": "arcsin",
+    "acos": "arccos",
+    "atan": "arctan",
+    "sinh": "sinh",
+    "cosh": "cosh",
+    "tanh": "tanh",
+    "asinh": "arcsinh",
+    "acosh": "arccosh",
+    "atanh": "arctanh",
+    "ceil": "ceil",
+    "floor": "floor",
+}
+
+
+class _CompiledCode:
+    """
+    Lines of code, inputs and temporaries of expressions being compiled.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.lines = []
+        self.inputs = []
+        self.input_index = {}
+        self.temporaries = {}
+        # Whether the code is analytic, so it can be evaluated at complex
+        # values to get derivatives by the complex step method
+        self.analytic = True
+
+
+class _NumpyCompiler(StreamBasedExpressionVisitor):
+    """
+    Translate Pyomo expressions to Python code evaluating them with NumPy.
+    Named Expressions and inlined Vars are evaluated once and assigned to
+    temporaries, other Vars and mutable Params are read from ``x``.
+    """
+
+    def __init__(self, code):
+        super().__init__()
+        self.code = code
+
+    def compile(self, expr):
+        return self.walk_expression(expr)
+
+    def initializeWalker(self, expr):
+        descend, result = self.beforeChild(None, expr, 0)
+        if descend:
+            return True, None
+        return False, result
+
+    def beforeChild(self, node, child, child_idx):
+        if type(child) in native_types:
+            return False, repr(float(child))
+        if not child.is_expression_type():
+            return False, self._leaf(child)
+        if child.is_named_expression_type():
+            return False, self._temporary(child, child.expr)
+        return True, None
+
+    def exitNode(self, node, data):
+        if isinstance(node, numeric_expr.SumExpression):
+            return "(" + " + ".join(data) + ")"
+        if isinstance(node, numeric_expr.ProductExpression):
+            return f"({data[0]} * {data[1]})"
+        if isinstance(node, numeric_expr.DivisionExpression):
+            return f"({data[0]} / {data[1]})"
+        if isinstance(node, numeric_expr.PowExpression):
+            return f"({data[0]} ** {data[1]})"
+        if isinstance(node, numeric_expr.NegationExpression):
+            return f"(-{data[0]})"
+        if isinstance(node, numeric_expr.AbsExpression):
+            self.code.analytic = False
+            return f"np.abs({data[0]})"
+        if isinstance(node, numeric_expr.UnaryFunctionExpression):
+            name = node.getname()
+            if name in _NUMPY_FUNCTIONS:
+                if name in ("ceil", "floor"):
+                    self.code.analytic = False
+                return f"np.{_NUMPY_FUNCTIONS[name]}({data[0]})"
+        if isinstance(node, numeric_expr.Expr_ifExpression):
+            self.code.analytic = False
+            return f"np.where({data[0]}, {data[1]}, {data[2]})"
+        if isinstance(node, relational_expr.EqualityExpression):
+            return f"({data[0]} == {data[1]})"
+        if isinstance(node, relational_expr.InequalityExpression):
+            op = "<" if node.strict else "<="
+            return f"({data[0]} {op} {data[1]})"
+        if isinstance(node, relational_expr.RangedExpression):
+            op1 = "<" if node.strict[0] else "<="
+            op2 = "<" if node.strict[1] else "<="
+            return f"(({data[0]} {op1} {data[1]}) & ({data[1]} {op2} {data[2]}))"
+        if node.getname() in ("max", "min"):
+            self.code.analytic = False
+            function = "np.maximum" if node.getname() == "max" else "np.minimum"
+            code = data[-1]
+            for arg in reversed(data[:-1]):
+                code = f"{function}({arg}, {code})"
+            return code
+        raise TypeError(
+            f"Cannot compile expression of type {type(node).__name__}: {node}"
+        )
+
+    def _leaf(self, obj):
+        if isinstance(obj, _PyomoUnit):
+            return "1.0"
+        if obj.is_variable_type():
+            definition = self.code.definitions.get(id(obj), None)
+            if definition is not None:
+                return self._temporary(obj, definition)
+            return self._input(obj)
+        if obj.is_parameter_type() and obj.parent_component().mutable:
+            return self._input(obj)
+        return repr(float(pyo.value(obj)))
+
+    def _input(self, obj):
+        code = self.code
+        index = code.input_index.get(id(obj), None)
+        if index is None:
+            index = code.input_index[id(obj)] = len(code.inputs)
+            code.inputs.append(obj)
+        return f"x[{index}]"
+
+    def _temporary(self, obj, expr):
+        code = self.code
+        name = code.temporaries.get(id(obj), None)
+        if name is None:
+            # Walkers are not reentrant, so definitions are compiled by a new one
+            result = _NumpyCompiler(code).compile(expr)
+            name = code.temporaries[id(obj)] = f"t{len(code.temporaries)}"
+            code.lines.append(f"{name} = {result}")
+        return name
+
+
+def compile_expressions(expressions, definitions=None):
+    """
+    Compile expressions into a NumPy function.
+
+    Args:
+        expressions: list of Pyomo expressions to compile
+        definitions: dict mapping ids of Vars to expressions defining them,
+            which are inlined instead of reading the Vars from the inputs
+
+    Returns:
+        tuple of the function, called with a list of input values and
+        returning a tuple of the values of the expressions, and the list of
+        input components. The ``analytic`` attribute of the function is False
+        if the expressions contain non-smooth functions or conditionals.
+    """
+    if definitions is None:
+        definitions = {}
+    code = _CompiledCode(definitions)
+    results = [_NumpyCompiler(code).compile(expr) for expr in expressions]
+    lines = code.lines + ["return (" + ", ".join(results) + ",)"]
+    namespace = {"np": np, "__builtins__": {}}
+    exec("def _evaluate(x):\n    " + "\n    ".join(lines), namespace)
+    function = namespace["_evaluate"]
+    function.analytic = code.analytic
+    return function, code.inputs
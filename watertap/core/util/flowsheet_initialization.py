@@ -0,0 +1,290 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a graph-based initializer for WaterTAP flowsheets.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyomo.environ import Var, value
+from pyomo.network import Port, SequentialDecomposition
+
+from idaes.core.util.initialization import propagate_state
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _initialize_unit(unit):
+    """
+    Default unit initialization routine, calling ``unit.initialize()``.
+    """
+    unit.initialize()
+
+
+def _get_unit_vars(unit):
+    return list(unit.component_data_objects(Var, descend_into=True))
+
+
+def _get_var_state(variables):
+    return [(v.value, v.fixed) for v in variables]
+
+
+def _set_var_state(variables, state):
+    for v, (val, fixed) in zip(variables, state):
+        v.set_value(val, skip_validation=True)
+        v.fixed = fixed
+
+
+# State of worker processes: each holds its own copy of the model, made when
+# the pool is created at the start of FlowsheetInitializer.initialize
+_worker_model = None
+_worker_unit_vars = {}
+
+
+def _worker_setup(model):
+    global _worker_model
+    _worker_model = model
+    _worker_unit_vars.clear()
+
+
+def _worker_initialize(unit_name, state, unit_initialize):
+    """
+    Initialize a unit in the model copy of a worker process, starting from the
+    variable values and fixed flags shipped from the parent process.
+    """
+    try:
+        unit_vars = _worker_unit_vars[unit_name]
+    except KeyError:
+        unit = _worker_model.find_component(unit_name)
+        unit_vars = _worker_unit_vars[unit_name] = (unit, _get_unit_vars(unit))
+    unit, variables = unit_vars
+
+    _set_var_state(variables, state)
+    unit_initialize(unit)
+
+    return _get_var_state(variables)
+
+
+class FlowsheetInitializer:
+    """
+    Initialize a flowsheet by sweeping through the graph of its units.
+
+    The units connected by Arcs are ordered into levels using the calculation
+    order of Pyomo's ``SequentialDecomposition``, with the tear streams removed.
+    Units within a level do not depend on each other, so they can be
+    initialized concurrently in a pool of worker processes. Inlet states are
+    passed between units with ``propagate_state``, and the sweep is repeated,
+    passing values across the tear streams, until the tear streams converge or
+    ``max_iter`` sweeps have been done.
+
+    Worker processes each hold a copy of the model, made once when the pool is
+    created at the start of ``initialize``. The values and fixed flags of the
+    variables of the unit being initialized are sent to a worker with every
+    task, so each sweep starts from the current inlet states and tear values,
+    and are returned from it. Anything else (e.g. mutable Params, or variables
+    of other blocks such as property parameter blocks) is read from the copy,
+    so units must not depend on the state of other units during
+    initialization, and changes made to it in the parent process during
+    ``initialize`` are not seen by the workers.
+    """
+
+    def __init__(
+        self,
+        unit_initialize=None,
+        tear_set=None,
+        tear_guesses=None,
+        max_iter=10,
+        tolerance=1e-6,
+        processes=1,
+        logger=_log,
+    ):
+        """
+        Keyword Arguments:
+            unit_initialize : function called with each unit to initialize it
+                (default: call ``unit.initialize()``). Must be picklable (e.g. a
+                module-level function or functools.partial) if processes > 1
+            tear_set : list of Arcs to tear (default: selected by the heuristic
+                of SequentialDecomposition)
+            tear_guesses : dict mapping destination Ports of tear streams to
+                dicts of initial guesses for the members of the Port, e.g.
+                {port: {"flow_vol": {0: 1.0}}} (default: use current values)
+            max_iter : maximum number of sweeps through the flowsheet (default: 10)
+            tolerance : relative tolerance for convergence of tear streams
+                (default: 1e-6)
+            processes : number of worker processes used to initialize
+                independent units concurrently (default: 1, initialize all
+                units in this process)
+            logger : logger to use (default: watertap.core.util.flowsheet_initialization)
+        """
+        if max_iter < 1:
+            raise ValueError(f"max_iter must be a positive integer, not {max_iter}.")
+        if processes < 1:
+            raise ValueError(f"processes must be a positive integer, not {processes}.")
+        self.unit_initialize = (
+            _initialize_unit if unit_initialize is None else unit_initialize
+        )
+        self.tear_set = tear_set
+        self.tear_guesses = {} if tear_guesses is None else tear_guesses
+        self.max_iter = max_iter
+        self.tolerance = tolerance
+        self.processes = processes
+        self.logger = logger
+
+    def get_calculation_order(self, model):
+        """
+        Get the tear streams and order in which to initialize units.
+
+        Args:
+            model : Pyomo model with expanded Arcs
+
+        Returns:
+            tuple of list of tear Arcs, and list of levels each containing a
+            list of units which can be initialized independently
+        """
+        seq = SequentialDecomposition()
+        graph = seq.create_graph(model)
+        if self.tear_set is None:
+            tears = seq.tear_set_arcs(graph, method="heuristic")
+        else:
+            tears = list(self.tear_set)
+        seq.options.tear_set = tears
+        return tears, seq.calculation_order(graph)
+
+    def initialize(self, model):
+        """
+        Initialize all units connected by Arcs in model.
+
+        Args:
+            model : Pyomo model with expanded Arcs
+
+        Returns:
+            dict with the number of sweeps done ("iterations"), whether the tear
+            streams converged ("converged"), the final maximum relative tear
+            residual ("residual") and wall time in seconds ("time")
+        """
+        start = time.perf_counter()
+        tears, order = self.get_calculation_order(model)
+        tear_ids = {id(arc) for arc in tears}
+        self.logger.info(
+            f"Initializing {sum(len(level) for level in order)} units in "
+            f"{len(order)} levels with {len(tears)} tear streams"
+        )
+
+        for port, guesses in self.tear_guesses.items():
+            _load_guesses(port, guesses)
+
+        pool = None
+        if self.processes > 1 and any(len(level) > 1 for level in order):
+            pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_worker_setup,
+                initargs=(model,),
+            )
+
+        unit_vars = {}
+        residual = 0.0
+        converged = False
+        try:
+            for iteration in range(1, self.max_iter + 1):
+                for level in order:
+                    for unit in level:
+                        _propagate_inlets(unit, tear_ids)
+                    if pool is None or len(level) == 1:
+                        for unit in level:
+                            self.unit_initialize(unit)
+                    else:
+                        self._initialize_level(pool, level, unit_vars)
+
+                residual = max((_tear_residual(arc) for arc in tears), default=0.0)
+                self.logger.info(
+                    f"Initialization sweep {iteration}: maximum relative tear "
+                    f"residual {residual:.3e}"
+                )
+                if residual <= self.tolerance:
+                    converged = True
+                    break
+                for arc in tears:
+                    propagate_state(arc=arc)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if not converged:
+            self.logger.warning(
+                f"Tear streams did not converge after {self.max_iter} sweeps "
+                f"(maximum relative residual {residual:.3e})"
+            )
+
+        return {
+            "iterations": iteration,
+            "converged": converged,
+            "residual": residual,
+            "time": time.perf_counter() - start,
+        }
+
+    def _initialize_level(self, pool, level, unit_vars):
+        futures = []
+        for unit in level:
+            if unit not in unit_vars:
+                unit_vars[unit] = _get_unit_vars(unit)
+            futures.append(
+                pool.submit(
+                    _worker_initialize,
+                    unit.name,
+                    _get_var_state(unit_vars[unit]),
+                    self.unit_initialize,
+                )
+            )
+        for unit, future in zip(level, futures):
+            _set_var_state(unit_vars[unit], future.result())
+
+
+def _propagate_inlets(unit, tear_ids):
+    """
+    Propagate the state to each inlet of unit, except along tear streams.
+    """
+    for port in unit.component_data_objects(Port, descend_into=False):
+        for arc in port.sources():
+            if id(arc) not in tear_ids:
+                propagate_state(arc=arc)
+
+
+def _load_guesses(port, guesses):
+    """
+    Set values of members of port from a dict of guesses.
+    """
+    for name, guess in guesses.items():
+        member = port.vars[name]
+        if isinstance(guess, dict):
+            for index, val in guess.items():
+                member[index].set_value(val)
+        else:
+            member.set_value(guess)
+
+
+def _tear_residual(arc):
+    """
+    Get the maximum relative difference between the source and destination
+    values of a tear stream.
+    """
+    residual = 0.0
+    for name, dest_member in arc.dest.vars.items():
+        src_member = arc.src.vars[name]
+        for index in dest_member:
+            src_val = value(src_member[index])
+            dest_val = dest_member[index].value
+            if dest_val is None:
+                return float("inf")
+            residual = max(residual, abs(src_val - dest_val) / max(1.0, abs(src_val)))
+    return residual
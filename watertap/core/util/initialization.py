@@ -16,7 +16,12 @@ This module contains utility functions for initialization of WaterTAP models.
 
 __author__ = "Adam Atia"
 
-from pyomo.environ import check_optimal_termination, ComponentMap, Var
+import logging
+import time
+
+import numpy as np
+
+from pyomo.environ import check_optimal_termination, Var
 from pyomo.contrib.fbbt.fbbt import fbbt
 
 from idaes.core.util.exceptions import InitializationError
@@ -140,8 +145,20 @@ def assert_no_degrees_of_freedom(blk):
     check_dof(blk, True)
 
 
+def _get_bounds(variables):
+    """
+    Get arrays of the lower and upper bounds of variables, with NaN for
+    missing bounds.
+    """
+    bounds = np.array([v.bounds for v in variables], dtype=float).reshape(-1, 2)
+    return bounds[:, 0], bounds[:, 1]
+
+
 def interval_initializer(
-    blk, feasibility_tol=1e-6, default_initial_value=0.0, logger=_log
+    blk,
+    feasibility_tol=1e-6,
+    default_initial_value=0.0,
+    logger=_log,
 ):
     """
     Improve the initialization of ``blk`` utilizing interval arithmetic.
@@ -153,40 +170,71 @@ def interval_initializer(
         logger : logger to use (default: watertap.core.util.initialization)
 
     Returns:
-        None
+        dict of the time in seconds spent in each phase (gather, fbbt,
+        project and restore)
 
     """
+    timing = {}
+    start = time.perf_counter()
 
-    bound_cache = ComponentMap()
-
-    for v in blk.component_data_objects(Var, active=True, descend_into=True):
-        bound_cache[v] = v.bounds
+    variables = list(blk.component_data_objects(Var, active=True, descend_into=True))
+    lb0, ub0 = _get_bounds(variables)
+    timing["gather"] = time.perf_counter() - start
 
+    start = time.perf_counter()
     fbbt(blk, feasibility_tol=feasibility_tol, deactivate_satisfied_constraints=False)
-
-    for v, bounds in bound_cache.items():
-        if v.value is None:
-            logger.info(
-                f"variable {v.name} has no initial value: setting to {default_initial_value}"
-            )
-            v.set_value(default_initial_value, skip_validation=True)
-        if v.lb is not None:
-            if v.lb == v.ub:
-                logger.debug(f"setting {v.name} to derived value {v.value}")
-                v.set_value(v.lb, skip_validation=True)
-                continue
-            if v.value < v.lb:
+    timing["fbbt"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lb, ub = _get_bounds(variables)
+    values = np.array([v.value for v in variables], dtype=float)
+
+    missing = np.isnan(values)
+    for i in np.flatnonzero(missing):
+        logger.info(
+            f"variable {variables[i].name} has no initial value: setting to {default_initial_value}"
+        )
+    values[missing] = default_initial_value
+
+    # Project values onto derived bounds, or set to derived value if fixed by them
+    projected = np.clip(
+        values,
+        np.where(np.isnan(lb), -np.inf, lb),
+        np.where(np.isnan(ub), np.inf, ub),
+    )
+    update = missing | (projected != values)
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for i in np.flatnonzero(update):
+        v = variables[i]
+        if debug and not missing[i]:
+            if lb[i] == ub[i]:
+                logger.debug(f"setting {v.name} to derived value {lb[i]}")
+            elif values[i] < lb[i]:
                 logger.debug(
-                    f"projecting {v.name} at value {v.value} onto derived lower bound {v.lb}"
+                    f"projecting {v.name} at value {values[i]} onto derived lower bound {lb[i]}"
                 )
-                v.set_value(v.lb, skip_validation=True)
-        if v.ub is not None:
-            if v.value > v.ub:
+            else:
                 logger.debug(
-                    f"projecting {v.name} at value {v.value} onto derived upper bound {v.ub}"
+                    f"projecting {v.name} at value {values[i]} onto derived upper bound {ub[i]}"
                 )
-                v.set_value(v.ub, skip_validation=True)
-
-    for v, bounds in bound_cache.items():
-        # restore bounds to original
-        v.bounds = bounds
+        v.set_value(float(projected[i]), skip_validation=True)
+    timing["project"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    # restore bounds to original, only touching those FBBT changed
+    lb_changed = ~((lb == lb0) | (np.isnan(lb) & np.isnan(lb0)))
+    ub_changed = ~((ub == ub0) | (np.isnan(ub) & np.isnan(ub0)))
+    for i in np.flatnonzero(lb_changed | ub_changed):
+        variables[i].bounds = (
+            None if np.isnan(lb0[i]) else float(lb0[i]),
+            None if np.isnan(ub0[i]) else float(ub0[i]),
+        )
+    timing["restore"] = time.perf_counter() - start
+
+    logger.debug(
+        f"interval_initializer timing for {blk.name}: "
+        + ", ".join(f"{k} {v:.3g} s" for k, v in timing.items())
+    )
+
+    return timing
@@ -0,0 +1,129 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a cache of built and initialized flowsheets, from which
+independent copies are handed out instead of rebuilding the flowsheet.
+"""
+
+import functools
+import sys
+import time
+from collections import OrderedDict
+
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _make_key(args, kwargs):
+    """
+    Make a hashable key from the arguments of a build function. Unhashable
+    arguments (e.g. lists or dicts of options) are keyed by their repr.
+    """
+    key = []
+    for arg in list(args) + sorted(kwargs.items()):
+        try:
+            hash(arg)
+            key.append(arg)
+        except TypeError:
+            key.append(repr(arg))
+    return tuple(key)
+
+
+class ModelTemplateCache:
+    """
+    Cache of models returned by a build function, keyed by the arguments the
+    function was called with.
+
+    The first time a configuration is requested the build function is called
+    and the model it returns is stored as a template. Every request, including
+    the first, returns an independent clone of the template, so changes to
+    the returned models do not affect the template or each other. The build
+    function should therefore return a model which is fully constructed and
+    initialized, so that repeated requests skip both steps.
+    """
+
+    def __init__(self, build_function, maxsize=None):
+        """
+        Args:
+            build_function: function returning a Pyomo model
+            maxsize: (optional) maximum number of templates to keep, discarding
+                the least recently used (default: no limit)
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer, not {maxsize}.")
+        self.build_function = build_function
+        self.maxsize = maxsize
+        self._templates = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        functools.update_wrapper(self, build_function)
+
+    def __len__(self):
+        return len(self._templates)
+
+    def __reduce__(self):
+        # Templates are not sent to other processes; a decorated module-level
+        # function is pickled by reference, anything else is rebuilt empty
+        module = sys.modules.get(getattr(self, "__module__", None))
+        if getattr(module, getattr(self, "__qualname__", ""), None) is self:
+            return self.__qualname__
+        return (ModelTemplateCache, (self.build_function, self.maxsize))
+
+    def __call__(self, *args, **kwargs):
+        """
+        Get a copy of the model built with the given arguments.
+
+        Returns:
+            clone of the template model for these arguments
+        """
+        key = _make_key(args, kwargs)
+        try:
+            template = self._templates[key]
+        except KeyError:
+            self.misses += 1
+            start = time.perf_counter()
+            template = self.build_function(*args, **kwargs)
+            _log.info(
+                f"Built template for {self.build_function.__name__} in "
+                f"{time.perf_counter() - start:.1f} s"
+            )
+            self._templates[key] = template
+            if self.maxsize is not None and len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        else:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        return template.clone()
+
+    def clear(self):
+        """
+        Discard all templates.
+
+        Returns:
+            None
+        """
+        self._templates.clear()
+
+
+def cache_model_template(build_function=None, maxsize=None):
+    """
+    Decorator caching the models returned by a build function, see
+    ModelTemplateCache. Can be used with or without arguments, e.g.
+    ``@cache_model_template`` or ``@cache_model_template(maxsize=4)``.
+
+    The undecorated build function is available as ``build_function`` on the
+    decorated function, and cached templates can be discarded with ``clear()``.
+    """
+    if build_function is None:
+        return functools.partial(cache_model_template, maxsize=maxsize)
+    return ModelTemplateCache(build_function, maxsize=maxsize)
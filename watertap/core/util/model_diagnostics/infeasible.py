@@ -13,10 +13,18 @@
 This module contains utility functions for infeasibility diagnostics of WaterTAP models.
 """
 import logging, sys
+import math
+import re
 
 from contextlib import contextmanager
 from math import isclose
+
+import numpy as np
+
 from pyomo.environ import Var, Constraint, value
+from pyomo.core.base.units_container import _PyomoUnit
+from pyomo.core.expr.symbol_map import SymbolMap
+from pyomo.core.expr.visitor import identify_components
 from pyomo.util.infeasible import log_infeasible_constraints, log_infeasible_bounds
 
 _logger = logging.getLogger("watertap.core.util.infeasible.print")
@@ -181,3 +189,394 @@ def _eval_close(obj, val, rel_tol, abs_tol):
         print(f"{obj.name} near LB of {lb}")
     if ub is not None and isclose(val, ub, rel_tol=rel_tol, abs_tol=abs_tol):
         print(f"{obj.name} near UB of {ub}")
+
+
+# Globals of compiled expressions
+_NAMESPACE = {
+    name: getattr(math, name)
+    for name in (
+        "exp log log10 sqrt sin cos tan asin acos atan sinh cosh tanh "
+        "asinh acosh atanh ceil floor"
+    ).split()
+}
+_NAMESPACE["abs"] = abs
+_NAMESPACE["__builtins__"] = {}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+# Errors raised evaluating an expression at a point where it is not defined,
+# or if the compiled expression is invalid (e.g. for external functions)
+_EVALUATION_ERRORS = (ArithmeticError, ValueError, TypeError, NameError)
+
+
+def _evaluate_with_pyomo(x, p):
+    # Expressions which cannot be compiled are evaluated by the fallback
+    raise TypeError("expression not compiled")
+
+
+class InfeasibilityDiagnostics:
+    """
+    Diagnostics of infeasible constraints and variables and constraints close
+    to their bounds, evaluated over the whole model at once.
+
+    On construction the bodies and bounds of all active constraints are
+    compiled to Python functions of arrays of variable and mutable parameter
+    values, so that evaluating them does not walk the Pyomo expression trees.
+    Expressions which cannot be compiled (e.g. containing external functions)
+    are evaluated with Pyomo. Call ``evaluate`` after each solve to update the
+    residuals and distances to bounds, which are then queried as tables of
+    rows sorted from the worst offender.
+
+    The model structure (e.g. which constraints are active) is fixed when the
+    diagnostics are created; create a new instance if it changes.
+    """
+
+    def __init__(self, m):
+        """
+        Args:
+            m : A Pyomo Block or ConcreteModel
+        """
+        self.model = m
+        self.variables = list(m.component_data_objects(Var, descend_into=True))
+        self._num_block_variables = len(self.variables)
+        self.constraints = list(
+            m.component_data_objects(Constraint, descend_into=True, active=True)
+        )
+        self._params = []
+        self._compile()
+        self.evaluated = False
+
+    def _compile(self):
+        var_index = {id(v): i for i, v in enumerate(self.variables)}
+
+        def labeler(obj):
+            if obj.is_variable_type():
+                index = var_index.get(id(obj), None)
+                if index is None:
+                    # Variables outside the block
+                    index = var_index[id(obj)] = len(self.variables)
+                    self.variables.append(obj)
+                return f"x[{index}]"
+            self._params.append(obj)
+            return f"p[{len(self._params) - 1}]"
+
+        smap = SymbolMap(labeler)
+        # Units of measurement are written by name and have value 1, as in
+        # Pyomo. Any other unknown name (e.g. of an external function) is left
+        # undefined, so the expression is evaluated with Pyomo.
+        namespace = dict(_NAMESPACE)
+
+        def compile_expression(expr):
+            if expr is None:
+                return None
+            for unit in identify_components(expr, {_PyomoUnit}):
+                for name in _IDENTIFIER.findall(unit.to_string()):
+                    namespace.setdefault(name, 1.0)
+            try:
+                function = eval("lambda x, p: " + expr.to_string(smap=smap), namespace)
+            except SyntaxError:
+                return _evaluate_with_pyomo
+            if not namespace.keys() >= set(function.__code__.co_names):
+                return _evaluate_with_pyomo
+            return function
+
+        self._bodies = [compile_expression(c.body) for c in self.constraints]
+        self._lower = [compile_expression(c.lower) for c in self.constraints]
+        self._upper = [compile_expression(c.upper) for c in self.constraints]
+
+    def _evaluate_functions(self, functions, attr, x, p):
+        result = np.full(len(functions), np.nan)
+        for i, f in enumerate(functions):
+            if f is None:
+                continue
+            try:
+                result[i] = f(x, p)
+            except _EVALUATION_ERRORS:
+                # Fall back to Pyomo, e.g. for external functions
+                try:
+                    val = value(getattr(self.constraints[i], attr), exception=False)
+                except _EVALUATION_ERRORS:
+                    val = None
+                if val is not None:
+                    result[i] = val
+        return result
+
+    def evaluate(self):
+        """
+        Evaluate the constraints and bounds at the current values of the
+        variables and parameters of the model.
+
+        Returns:
+            None
+        """
+        nan = float("nan")
+        x = [nan if v.value is None else v.value for v in self.variables]
+        p = [value(param, exception=False) for param in self._params]
+        p = [nan if val is None else val for val in p]
+
+        self.var_values = np.array(x, dtype=float)[: self._num_block_variables]
+        block_variables = self.variables[: self._num_block_variables]
+        self.var_fixed = np.array([v.fixed for v in block_variables], dtype=bool)
+        self.var_lb = np.array(
+            [nan if v.lb is None else v.lb for v in block_variables], dtype=float
+        )
+        self.var_ub = np.array(
+            [nan if v.ub is None else v.ub for v in block_variables], dtype=float
+        )
+
+        self.con_body = self._evaluate_functions(self._bodies, "body", x, p)
+        self.con_lb = self._evaluate_functions(self._lower, "lower", x, p)
+        self.con_ub = self._evaluate_functions(self._upper, "upper", x, p)
+        self.con_equality = np.array([c.equality for c in self.constraints], dtype=bool)
+
+        # Violation of bounds, which is nan where the value is missing
+        with np.errstate(invalid="ignore"):
+            self.con_residual = np.fmax(
+                np.fmax(self.con_lb - self.con_body, self.con_body - self.con_ub),
+                0,
+            )
+            self.con_residual[np.isnan(self.con_body)] = np.nan
+            self.var_violation = np.fmax(
+                np.fmax(self.var_lb - self.var_values, self.var_values - self.var_ub),
+                0,
+            )
+            self.var_violation[np.isnan(self.var_values)] = np.nan
+        self.evaluated = True
+
+    def _check_evaluated(self):
+        if not self.evaluated:
+            self.evaluate()
+
+    @staticmethod
+    def _rows(components, indices, columns, sort_key, top):
+        order = indices[np.argsort(sort_key, kind="stable")]
+        if top is not None:
+            order = order[:top]
+        rows = []
+        for i in order:
+            c = components[i]
+            row = {"name": c.name, "block": c.parent_block().name}
+            for name, array in columns.items():
+                val = array[i]
+                if array.dtype == bool:
+                    row[name] = bool(val)
+                else:
+                    row[name] = None if np.isnan(val) else float(val)
+            rows.append(row)
+        return rows
+
+    def infeasible_constraints(self, tol=1e-6, top=None):
+        """
+        Get the active constraints violated by more than tol, or which could not
+        be evaluated.
+
+        Args:
+            tol : (optional) absolute feasibility tolerance, default 1e-06
+            top : (optional) maximum number of rows to return
+
+        Returns:
+            list of dicts with the "name", "block", "body", "lb", "ub" and
+            "residual" (violation of the bounds) of each constraint, in order of
+            decreasing residual, with unevaluated constraints first
+        """
+        self._check_evaluated()
+        residual = self.con_residual
+        indices = np.flatnonzero(np.isnan(residual) | (residual > tol))
+        return self._rows(
+            self.constraints,
+            indices,
+            {
+                "body": self.con_body,
+                "lb": self.con_lb,
+                "ub": self.con_ub,
+                "residual": residual,
+            },
+            -np.nan_to_num(residual[indices], nan=np.inf),
+            top,
+        )
+
+    def infeasible_bounds(self, tol=1e-6, top=None):
+        """
+        Get the variables outside their bounds by more than tol.
+
+        Args:
+            tol : (optional) absolute feasibility tolerance, default 1e-06
+            top : (optional) maximum number of rows to return
+
+        Returns:
+            list of dicts with the "name", "block", "value", "lb", "ub" and
+            "violation" of each variable, in order of decreasing violation
+        """
+        self._check_evaluated()
+        violation = self.var_violation
+        with np.errstate(invalid="ignore"):
+            indices = np.flatnonzero(violation > tol)
+        return self._rows(
+            self.variables,
+            indices,
+            {
+                "value": self.var_values,
+                "lb": self.var_lb,
+                "ub": self.var_ub,
+                "violation": violation,
+            },
+            -violation[indices],
+            top,
+        )
+
+    @staticmethod
+    def _close_to_bounds(val, lb, ub, rel_tol, abs_tol):
+        """
+        Vectorized version of the checks of _eval_close, returning boolean
+        arrays of values close to the lower and upper bounds, and the relative
+        distance to the nearest bound.
+        """
+
+        def isclose(a, b):
+            with np.errstate(invalid="ignore"):
+                return np.abs(a - b) <= np.fmax(
+                    rel_tol * np.fmax(np.abs(a), np.abs(b)), abs_tol
+                )
+
+        # Components with (nearly) equal bounds are not reported
+        equal_bounds = isclose(lb, ub)
+        near_lb = isclose(lb, val) & ~equal_bounds
+        near_ub = isclose(val, ub) & ~equal_bounds
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.fmax(np.fmax(np.abs(val), np.abs(lb)), abs_tol)
+            distance_lb = np.abs(val - lb) / scale
+            scale = np.fmax(np.fmax(np.abs(val), np.abs(ub)), abs_tol)
+            distance_ub = np.abs(val - ub) / scale
+        distance = np.fmin(distance_lb, distance_ub)
+        return near_lb, near_ub, distance
+
+    def variables_close_to_bounds(self, rel_tol=1e-4, abs_tol=1e-12, top=None):
+        """
+        Get the unfixed variables close to their bounds.
+
+        Args:
+            rel_tol : (optional) relative tolerance for comparing the value
+                       to the bound, default 1e-04
+            abs_tol : (optional) absolute tolerance for comparing the value
+                       to the bound, default 1e-12
+            top : (optional) maximum number of rows to return
+
+        Returns:
+            list of dicts with the "name", "block", "value", "lb", "ub" and
+            relative "distance" to the nearest bound of each variable, in order
+            of increasing distance. "near_lb" and "near_ub" give which bounds
+            the value is close to.
+        """
+        self._check_evaluated()
+        near_lb, near_ub, distance = self._close_to_bounds(
+            self.var_values, self.var_lb, self.var_ub, rel_tol, abs_tol
+        )
+        indices = np.flatnonzero((near_lb | near_ub) & ~self.var_fixed)
+        return self._rows(
+            self.variables,
+            indices,
+            {
+                "value": self.var_values,
+                "lb": self.var_lb,
+                "ub": self.var_ub,
+                "distance": distance,
+                "near_lb": near_lb,
+                "near_ub": near_ub,
+            },
+            distance[indices],
+            top,
+        )
+
+    def constraints_close_to_bounds(self, rel_tol=1e-4, abs_tol=1e-5, top=None):
+        """
+        Get the active inequality constraints close to their bounds.
+
+        Args:
+            rel_tol : (optional) relative tolerance for comparing the value
+                       to the bound, default 1e-04
+            abs_tol : (optional) absolute tolerance for comparing the value
+                       to the bound, default 1e-05
+            top : (optional) maximum number of rows to return
+
+        Returns:
+            list of dicts with the "name", "block", "body", "lb", "ub" and
+            relative "distance" to the nearest bound of each constraint, in
+            order of increasing distance. "near_lb" and "near_ub" give which
+            bounds the body is close to.
+        """
+        self._check_evaluated()
+        near_lb, near_ub, distance = self._close_to_bounds(
+            self.con_body, self.con_lb, self.con_ub, rel_tol, abs_tol
+        )
+        indices = np.flatnonzero((near_lb | near_ub) & ~self.con_equality)
+        return self._rows(
+            self.constraints,
+            indices,
+            {
+                "body": self.con_body,
+                "lb": self.con_lb,
+                "ub": self.con_ub,
+                "distance": distance,
+                "near_lb": near_lb,
+                "near_ub": near_ub,
+            },
+            distance[indices],
+            top,
+        )
+
+    def report(self, tol=1e-6, rel_tol=1e-4, top=10, output_file=None):
+        """
+        Print tables of the worst infeasible constraints and variable bounds,
+        and the variables and constraints closest to their bounds.
+
+        Args:
+            tol : (optional) absolute feasibility tolerance, default 1e-06
+            rel_tol : (optional) relative tolerance for comparing values to
+                       bounds, default 1e-04
+            top : (optional) maximum number of rows in each table, default 10
+            output_file : (optional) file to write results to. If None
+                          (default) print to the screen.
+
+        Returns:
+            None
+        """
+        tables = [
+            (
+                "Infeasible constraints",
+                self.infeasible_constraints(tol=tol, top=top),
+                ("body", "lb", "ub", "residual"),
+            ),
+            (
+                "Infeasible variable bounds",
+                self.infeasible_bounds(tol=tol, top=top),
+                ("value", "lb", "ub", "violation"),
+            ),
+            (
+                "Variables close to bounds",
+                self.variables_close_to_bounds(rel_tol=rel_tol, top=top),
+                ("value", "lb", "ub", "distance"),
+            ),
+            (
+                "Constraints close to bounds",
+                self.constraints_close_to_bounds(rel_tol=rel_tol, top=top),
+                ("body", "lb", "ub", "distance"),
+            ),
+        ]
+        with _logging_handler(output_file) as logger:
+            for title, rows, columns in tables:
+                logger.info(f"{title}: {len(rows)}")
+                if not rows:
+                    continue
+                width = max(len(row["name"]) for row in rows) + 2
+                logger.info(
+                    f"  {'Name':<{width}}" + "".join(f"{c:>13}" for c in columns)
+                )
+                for row in rows:
+                    logger.info(
+                        f"  {row['name']:<{width}}"
+                        + "".join(
+                            f"{'-' if row[c] is None else format(row[c], '.4g'):>13}"
+                            for c in columns
+                        )
+                    )
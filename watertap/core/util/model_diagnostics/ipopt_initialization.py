@@ -10,10 +10,24 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+import numpy as np
 import pyomo.environ as pyo
-from idaes.core.util.scaling import get_scaling_factor, __none_left_mult
+from idaes.core.util.scaling import get_scaling_factor
+import idaes.logger as idaeslog
 from watertap.core.solvers import get_solver
 
+_log = idaeslog.getLogger(__name__)
+
+# dtype of the array returned by get_initialization_perturbation
+PERTURBATION_DTYPE = np.dtype(
+    [
+        ("index", np.int64),
+        ("value", np.float64),
+        ("perturbed_value", np.float64),
+        ("bound", "U5"),
+    ]
+)
+
 
 def assert_no_initialization_perturbation(blk, optarg=None, solver=None):
     """
@@ -50,11 +64,13 @@ def assert_no_initialization_perturbation(blk, optarg=None, solver=None):
             options.get("nlp_scaling_method", "gradient-based") == "user-scaling"
         )
 
-    for v, val, result in generate_initialization_perturbation(
+    variables, perturbations = get_initialization_perturbation(
         blk, bound_push, bound_frac, bound_relax_factor, user_scaling
-    ):
+    )
+    if len(perturbations) > 0:
+        i, val, result, _ = perturbations[0]
         raise ValueError(
-            f"IPOPT will move scaled initial value for variable {v.name} from {val:e} to {result:e}"
+            f"IPOPT will move scaled initial value for variable {variables[i].name} from {val:e} to {result:e}"
         )
 
 
@@ -100,36 +116,85 @@ def generate_initialization_perturbation(
     Yields:
         tuple: (pyo.Var object, current_value, perturbed_value)
     """
-    kappa1 = bound_push
-    kappa2 = bound_frac
+    variables, perturbations = get_initialization_perturbation(
+        blk, bound_push, bound_frac, bound_relax_factor, user_scaling
+    )
+    for i, val, result, _ in perturbations:
+        yield (variables[i], val, result)
+
+
+def get_initialization_perturbation(
+    blk, bound_push=1e-2, bound_frac=1e-2, bound_relax_factor=1e-8, user_scaling=False
+):
+    """
+    Get the initialization perturbations performed by IPOPT for a given Block,
+    evaluated for all variables at once.
+
+    Args:
+        blk: Pyomo block
+        bound_push: bound_push to evaluate (same as IPOPT option) (default=1e-2)
+        bound_frac: bound_frac to evaluate (same as IPOPT option) (default=1e-2)
+        bound_relax_factor: bound_relax_factor to evaluate (same as IPOPT option) (default=1e-8)
+        user_scaling: If True, the variables are scaled as if `nlp_scaling_method = user-scaling`
+                       is used. (default=False)
+
+    Returns:
+        tuple: (list of unfixed pyo.Var objects with values, structured array of
+        perturbations with dtype PERTURBATION_DTYPE). Each row holds the index
+        of the variable in the list, the current and perturbed scaled values,
+        and which bound ("lower" or "upper") causes the perturbation.
+    """
+    variables = []
+    data = []
     for v in blk.component_data_objects(pyo.Var):
         if v.value is None:
             _log.warning(f"Variable {v.name} has no initial value")
             continue
         if v.fixed:
             continue
+        variables.append(v)
         if user_scaling:
-            sf = get_scaling_factor(v, default=1.0)
+            data.append((v.lb, v.ub, v.value, get_scaling_factor(v, default=1.0)))
         else:
-            sf = 1.0
-        v_lb = __none_left_mult(v.lb, sf)
-        if v_lb is not None:
-            v_lb -= bound_relax_factor * max(1, abs(v_lb))
-        v_value = v.value * sf
-        v_ub = __none_left_mult(v.ub, sf)
-        if v_ub is not None:
-            v_ub += bound_relax_factor * max(1, abs(v_ub))
-        if v_lb is not None:
-            if v_ub is not None:
-                pl = min(kappa1 * max(1, abs(v_lb)), kappa2 * (v_ub - v_lb))
-            else:
-                pl = kappa1 * max(1, abs(v_lb))
-            if v_value < v_lb + pl:
-                yield (v, v_value, v_lb + pl)
-        if v_ub is not None:
-            if v_lb is not None:
-                pu = min(kappa1 * max(1, abs(v_ub)), kappa2 * (v_ub - v_lb))
-            else:
-                pu = kappa1 * max(1, abs(v_ub))
-            if v_value > v_ub - pu:
-                yield (v, v_value, v_ub - pu)
+            data.append((v.lb, v.ub, v.value, 1.0))
+
+    # None bounds become NaN
+    data = np.array(data, dtype=np.float64).reshape(-1, 4)
+    lb, ub, values, sf = data.T
+
+    has_lb = ~np.isnan(lb)
+    has_ub = ~np.isnan(ub)
+
+    v_lb = lb * sf
+    v_lb = v_lb - bound_relax_factor * np.maximum(1, np.abs(v_lb))
+    v_value = values * sf
+    v_ub = ub * sf
+    v_ub = v_ub + bound_relax_factor * np.maximum(1, np.abs(v_ub))
+
+    # Perturbations of IPOPT's bound_push/bound_frac projection
+    frac = bound_frac * (v_ub - v_lb)
+    with np.errstate(invalid="ignore"):
+        pl = bound_push * np.maximum(1, np.abs(v_lb))
+        pl = np.where(has_ub, np.minimum(pl, frac), pl)
+        pu = bound_push * np.maximum(1, np.abs(v_ub))
+        pu = np.where(has_lb, np.minimum(pu, frac), pu)
+
+        lower = np.flatnonzero(has_lb & (v_value < v_lb + pl))
+        upper = np.flatnonzero(has_ub & (v_value > v_ub - pu))
+
+    # Order as variables are visited, with lower bound before upper bound
+    index = np.concatenate([lower, upper])
+    order = np.lexsort((np.repeat([0, 1], [len(lower), len(upper)]), index))
+    index = index[order]
+
+    perturbations = np.empty(len(index), dtype=PERTURBATION_DTYPE)
+    perturbations["index"] = index
+    perturbations["value"] = v_value[index]
+    perturbations["perturbed_value"] = np.concatenate(
+        [v_lb[lower] + pl[lower], v_ub[upper] - pu[upper]]
+    )[order]
+    perturbations["bound"] = np.array(["lower"] * len(lower) + ["upper"] * len(upper))[
+        order
+    ]
+
+    return variables, perturbations
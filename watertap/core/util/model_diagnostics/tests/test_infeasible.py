@@ -10,9 +10,22 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+import math
+
 import pytest
-from pyomo.environ import ConcreteModel, Var, Constraint
+from pyomo.environ import (
+    Block,
+    ConcreteModel,
+    Constraint,
+    Expr_if,
+    log,
+    Param,
+    units,
+    Var,
+)
 from watertap.core.util.model_diagnostics.infeasible import (
+    InfeasibilityDiagnostics,
+    _evaluate_with_pyomo,
     print_infeasible_constraints,
     print_infeasible_bounds,
     print_variables_close_to_bounds,
@@ -121,3 +134,108 @@ VAR b: LB -10 </= -20
             == """CONSTR abcon: 0.0 </= -40 <= 10.0
 """
         )
+
+
+class TestInfeasibilityDiagnostics:
+    @pytest.fixture
+    def m(self):
+        m = ConcreteModel()
+        m.b1 = Block()
+        m.b1.a = Var(bounds=(0, 10))
+        m.b1.b = Var(bounds=(-10, 10))
+        m.c = Var(initialize=1)
+        m.c.fix()
+        m.p = Param(initialize=2, mutable=True)
+        m.abcon = Constraint(expr=(0, m.b1.a + m.b1.b, 10))
+        m.logcon = Constraint(expr=log(m.b1.a) * units.m == m.p * m.c)
+        m.ifcon = Constraint(expr=Expr_if(m.b1.a >= 1, m.b1.b, 0) == 0)
+        return m
+
+    @pytest.mark.unit
+    def test_var_not_set(self, m):
+        diagnostics = InfeasibilityDiagnostics(m)
+        rows = diagnostics.infeasible_constraints()
+        assert [row["name"] for row in rows] == ["abcon", "logcon", "ifcon"]
+        assert all(row["body"] is None for row in rows)
+        assert diagnostics.variables_close_to_bounds() == []
+
+    @pytest.mark.unit
+    def test_reevaluate(self, m):
+        diagnostics = InfeasibilityDiagnostics(m)
+        m.b1.a.value = 1
+        m.b1.b.value = 2
+        diagnostics.evaluate()
+        # Pyomo moves the right hand side into the body
+        assert diagnostics.con_body == pytest.approx([3, 2, 2])
+        rows = diagnostics.infeasible_constraints()
+        assert [(row["name"], row["residual"]) for row in rows] == [
+            ("logcon", 2),
+            ("ifcon", 2),
+        ]
+        assert rows[0]["block"] == "unknown"
+        assert rows[0]["lb"] == rows[0]["ub"] == 0
+
+        # values and mutable parameters are read again
+        m.b1.a.value = 0.5
+        m.p = 0
+        diagnostics.evaluate()
+        assert diagnostics.con_body == pytest.approx([2.5, -math.log(0.5), 0])
+        assert diagnostics.infeasible_constraints(top=1)[0]["name"] == "logcon"
+        assert diagnostics.infeasible_constraints(tol=1) == []
+
+    @pytest.mark.unit
+    def test_compiled(self, m):
+        m.unitcon = Constraint(
+            expr=m.b1.a * units.kg / units.m**3 == 2 * units.g / units.L
+        )
+        m.b1.a.value = 1
+        m.b1.b.value = 2
+        diagnostics = InfeasibilityDiagnostics(m)
+        # Only the names of units are defined, so Expr_if is evaluated by Pyomo
+        assert diagnostics._bodies[1] is not _evaluate_with_pyomo
+        assert diagnostics._bodies[2] is _evaluate_with_pyomo
+        assert diagnostics._bodies[3] is not _evaluate_with_pyomo
+        diagnostics.evaluate()
+        assert diagnostics.con_body == pytest.approx([3, 2, 2, -1])
+
+    @pytest.mark.unit
+    def test_undefined(self, m):
+        m.b1.a.value = -1
+        m.b1.b.value = 1
+        diagnostics = InfeasibilityDiagnostics(m)
+        rows = diagnostics.infeasible_constraints()
+        assert rows[0]["name"] == "logcon"
+        assert rows[0]["residual"] is None
+
+    @pytest.mark.unit
+    def test_bounds(self, m):
+        m.b1.a.value = 20
+        m.b1.b.value = -10
+        diagnostics = InfeasibilityDiagnostics(m)
+
+        rows = diagnostics.infeasible_bounds()
+        assert [(row["name"], row["block"], row["violation"]) for row in rows] == [
+            ("b1.a", "b1", 10)
+        ]
+
+        rows = diagnostics.variables_close_to_bounds()
+        assert [(row["name"], row["near_lb"], row["near_ub"]) for row in rows] == [
+            ("b1.b", True, False)
+        ]
+
+        m.b1.a.value = 10
+        diagnostics.evaluate()
+        rows = diagnostics.variables_close_to_bounds()
+        assert [row["name"] for row in rows] == ["b1.a", "b1.b"]
+        rows = diagnostics.constraints_close_to_bounds()
+        assert [(row["name"], row["near_lb"]) for row in rows] == [("abcon", True)]
+
+    @pytest.mark.unit
+    def test_report(self, m, capsys):
+        m.b1.a.value = 20
+        m.b1.b.value = -10
+        InfeasibilityDiagnostics(m).report()
+        captured = capsys.readouterr()
+        assert "Infeasible constraints: 2" in captured.out
+        assert "Infeasible variable bounds: 1" in captured.out
+        assert "  b1.a " in captured.out
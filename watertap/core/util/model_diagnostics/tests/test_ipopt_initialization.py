@@ -15,6 +15,7 @@ from pyomo.environ import Block, Var, SolverFactory
 from watertap.core.solvers import get_solver
 from watertap.core.util.model_diagnostics.ipopt_initialization import (
     generate_initialization_perturbation,
+    get_initialization_perturbation,
     print_initialization_perturbation,
     assert_no_initialization_perturbation,
 )
@@ -90,6 +91,21 @@ class TestPerturbationHelper:
         assert r[0][2] == 1.0e-6
         assert r[1][2] == 99.999900999999
 
+    @pytest.mark.unit
+    def test_get_initialization_perturbation(self, b):
+        variables, r = get_initialization_perturbation(b, bound_relax_factor=0.0)
+
+        assert [v.name for v in variables] == ["x", "y", "w"]
+        assert len(r) == 2
+        assert list(r["index"]) == [0, 1]
+        assert list(r["value"]) == [1e-7, 1e3]
+        assert list(r["perturbed_value"]) == [1.000001e-2, 99.1]
+        assert list(r["bound"]) == ["lower", "upper"]
+
+        variables, r = get_initialization_perturbation(b, bound_push=1e-20)
+        assert len(r) == 1
+        assert r[0]["bound"] == "upper"
+
     @pytest.mark.unit
     def test_print_initialization_perturbation(self, b, capsys):
         print_initialization_perturbation(b, 1e-2, 1e-2, 1e-8, True)
@@ -0,0 +1,238 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a process-parallel driver for sweeps over WaterTAP
+flowsheets which does not require MPI.
+"""
+
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from pyomo.environ import check_optimal_termination, Var, value
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+
+class _SweepWorker:
+    """
+    Model and sweep definition held by each worker process.
+    """
+
+    def __init__(self, build_function, initialize_function, solve_function, outputs):
+        self.solve_function = solve_function
+        self.outputs = outputs
+
+        self.model = build_function()
+        if initialize_function is not None:
+            initialize_function(self.model)
+
+        # State to restore after a failed sample, so the next one does not
+        # start from the values the failure left behind
+        self._variables = list(self.model.component_data_objects(Var))
+        self._initial_values = [v.value for v in self._variables]
+        self._components = {}
+        # Look up output components now, so a wrong name is an error rather
+        # than a failed sample
+        for output in outputs.values():
+            if not callable(output):
+                self._get_component(output)
+
+    def _get_component(self, name):
+        try:
+            return self._components[name]
+        except KeyError:
+            component = self.model.find_component(name)
+            if component is None:
+                raise KeyError(f"Could not find component {name} in model.")
+            self._components[name] = component
+            return component
+
+    def _reset(self):
+        for v, val in zip(self._variables, self._initial_values):
+            if not v.fixed:
+                v.set_value(val, skip_validation=True)
+
+    def run(self, sample):
+        for name, val in sample.items():
+            component = self._get_component(name)
+            if component.is_variable_type():
+                component.fix(val)
+            else:
+                component.set_value(val)
+
+        start = time.perf_counter()
+        try:
+            results = self.solve_function(self.model)
+            success = results is None or check_optimal_termination(results)
+        except Exception as err:
+            _log.warning(f"Sample {sample} failed: {err}")
+            success = False
+        solve_time = time.perf_counter() - start
+
+        outputs = {}
+        if success:
+            try:
+                for name, output in self.outputs.items():
+                    if callable(output):
+                        outputs[name] = output(self.model)
+                    else:
+                        outputs[name] = value(self._get_component(output))
+            except Exception as err:
+                _log.warning(f"Outputs of sample {sample} failed: {err}")
+                success = False
+        if not success:
+            outputs = {name: np.nan for name in self.outputs}
+            self._reset()
+
+        return success, solve_time, outputs
+
+
+_worker = None
+
+
+def _setup_worker(*args):
+    global _worker
+    _worker = _SweepWorker(*args)
+
+
+def _run_samples(indexed_samples, worker=None):
+    if worker is None:
+        worker = _worker
+    return [(index, *worker.run(sample)) for index, sample in indexed_samples]
+
+
+def run_parallel_sweep(
+    build_function,
+    samples,
+    solve_function,
+    initialize_function=None,
+    outputs=None,
+    results_file=None,
+    processes=1,
+    chunk_size=1,
+):
+    """
+    Solve a flowsheet at each of a table of samples, using a pool of worker
+    processes each holding its own model.
+
+    Each worker builds (and optionally initializes) one model, which it reuses
+    for every sample it runs, restoring its initialized state after a failed
+    sample. Samples are handed out to workers in chunks as they become free,
+    so slow samples do not hold up the others, and results are written to
+    ``results_file`` as they finish.
+
+    Args:
+        build_function: function returning a model ready to solve, e.g. after
+            setting operating conditions
+        samples: dict mapping names of components of the model (Vars to fix or
+            mutable Params to set) to sequences of sample values of equal length
+        solve_function: function called with the model to solve it, returning
+            solver results (or None); exceptions are treated as failed solves
+        initialize_function: (optional) function called with the model after it
+            is built
+        outputs: (optional) dict mapping output names to component names, or
+            to functions called with the model, whose values are recorded after
+            each successful solve
+        results_file: (optional) path of a CSV file to stream results to
+        processes: number of worker processes (default: 1, run in this process)
+        chunk_size: number of samples handed to a worker at a time (default: 1)
+
+    Functions must be picklable (e.g. module-level functions or
+    functools.partial) when processes > 1.
+
+    Returns:
+        dict mapping sample names, output names, "solve_successful" and
+        "solve_time" to numpy arrays in sample order
+    """
+    if processes < 1:
+        raise ValueError(f"processes must be a positive integer, not {processes}.")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, not {chunk_size}.")
+    if outputs is None:
+        outputs = {}
+
+    names = list(samples)
+    columns = [np.asarray(samples[name], dtype=float) for name in names]
+    num_samples = len(columns[0]) if columns else 0
+    if any(len(col) != num_samples for col in columns):
+        raise ValueError("All sample columns must have the same length.")
+
+    chunks = [
+        [
+            (i, {name: float(col[i]) for name, col in zip(names, columns)})
+            for i in range(start, min(start + chunk_size, num_samples))
+        ]
+        for start in range(0, num_samples, chunk_size)
+    ]
+
+    results = {name: col.copy() for name, col in zip(names, columns)}
+    for name in outputs:
+        results[name] = np.full(num_samples, np.nan)
+    results["solve_successful"] = np.zeros(num_samples, dtype=bool)
+    results["solve_time"] = np.full(num_samples, np.nan)
+
+    header = ["sample"] + names + list(outputs) + ["solve_successful", "solve_time"]
+    worker_args = (build_function, initialize_function, solve_function, outputs)
+
+    csv_file = None
+    writer = None
+    if results_file is not None:
+        csv_file = open(results_file, "w", newline="")
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+
+    def record(chunk_results):
+        for index, success, solve_time, sample_outputs in chunk_results:
+            for name, val in sample_outputs.items():
+                results[name][index] = val
+            results["solve_successful"][index] = success
+            results["solve_time"][index] = solve_time
+            if writer is not None:
+                writer.writerow(
+                    [index]
+                    + [col[index] for col in columns]
+                    + [sample_outputs[name] for name in outputs]
+                    + [success, solve_time]
+                )
+        if csv_file is not None:
+            csv_file.flush()
+
+    start = time.perf_counter()
+    try:
+        if processes == 1:
+            worker = _SweepWorker(*worker_args)
+            for chunk in chunks:
+                record(_run_samples(chunk, worker))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_setup_worker,
+                initargs=worker_args,
+            ) as pool:
+                futures = [pool.submit(_run_samples, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+
+    _log.info(
+        f"Sweep of {num_samples} samples finished in "
+        f"{time.perf_counter() - start:.1f} s with "
+        f"{int(np.sum(~results['solve_successful']))} failures"
+    )
+
+    return results
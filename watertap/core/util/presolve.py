@@ -0,0 +1,239 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a pre-solver of square blocks, e.g. the kinetics and
+balances of the ADM1 and ASM reactors, by a damped Newton method on NumPy code
+compiled from the constraints of the block, to provide a good initial point
+for a subsequent solve with IPOPT.
+"""
+
+import numpy as np
+
+from pyomo.environ import Constraint
+from pyomo.core.expr.visitor import identify_variables
+
+import idaes.logger as idaeslog
+from idaes.core.util import scaling as iscale
+
+from watertap.core.util.expression_compiler import compile_expressions
+
+# Maximum number of columns of the Jacobian evaluated at once
+_JACOBIAN_CHUNK = 256
+
+
+class _SquareSystem:
+    """
+    Compiled residuals of the active equality constraints of a block in its
+    unfixed variables, in the units of the scaled constraints.
+    """
+
+    def __init__(self, blk):
+        self.constraints = [
+            con
+            for con in blk.component_data_objects(
+                Constraint, active=True, descend_into=True
+            )
+            if con.equality
+        ]
+        self.variables = []
+        seen = set()
+        for con in self.constraints:
+            for var in identify_variables(con.body, include_fixed=False):
+                if id(var) not in seen:
+                    seen.add(id(var))
+                    self.variables.append(var)
+        if len(self.variables) != len(self.constraints):
+            raise ValueError(
+                f"The system of equations of {blk.name} is not square: "
+                f"{len(self.constraints)} equality constraints in "
+                f"{len(self.variables)} unfixed variables."
+            )
+
+        self.function, inputs = compile_expressions(
+            [con.body - con.upper for con in self.constraints]
+        )
+        position = {id(obj): i for i, obj in enumerate(inputs)}
+        self.index = [position[id(var)] for var in self.variables]
+        self.inputs = [np.nan if obj.value is None else obj.value for obj in inputs]
+
+        self.con_scale = np.array(
+            [iscale.get_scaling_factor(con, default=1) for con in self.constraints],
+            dtype=float,
+        )
+        self.var_scale = np.array(
+            [iscale.get_scaling_factor(var, default=1) for var in self.variables],
+            dtype=float,
+        )
+        self.lb = np.array(
+            [-np.inf if var.lb is None else var.lb for var in self.variables],
+            dtype=float,
+        )
+        self.ub = np.array(
+            [np.inf if var.ub is None else var.ub for var in self.variables],
+            dtype=float,
+        )
+
+    def initial_point(self):
+        """
+        Get the current values of the variables, moved inside their bounds.
+        """
+        x = np.array(
+            [0 if var.value is None else var.value for var in self.variables],
+            dtype=float,
+        )
+        return self.project(x)
+
+    def _evaluate(self, columns, shape):
+        x = list(self.inputs)
+        for i, col in zip(self.index, columns):
+            x[i] = col
+        with np.errstate(all="ignore"):
+            results = self.function(x)
+        return np.array([np.broadcast_to(r, shape) for r in results])
+
+    def residual(self, x):
+        """
+        Get the scaled residuals of the constraints at values of the variables.
+        """
+        return self.con_scale * self._evaluate(x, ())
+
+    def jacobian(self, x):
+        """
+        Get the Jacobian of the scaled residuals with respect to the variables,
+        by the complex step method if the residuals are analytic or else by
+        forward differences, evaluating many columns at once.
+        """
+        n = len(x)
+        step = np.maximum(np.abs(x), 1 / self.var_scale)
+        jac = np.empty((n, n))
+        if self.function.analytic:
+            step *= 1e-20
+            base = x.astype(complex)
+        else:
+            step *= 1e-7
+            base = x
+            f0 = self._evaluate(x, ())[:, None]
+        for start in range(0, n, _JACOBIAN_CHUNK):
+            cols = np.arange(start, min(start + _JACOBIAN_CHUNK, n))
+            points = np.repeat(base[:, None], len(cols), axis=1)
+            if self.function.analytic:
+                points[cols, np.arange(len(cols))] += 1j * step[cols]
+                values = self._evaluate(points, (len(cols),)).imag
+            else:
+                points[cols, np.arange(len(cols))] += step[cols]
+                values = self._evaluate(points, (len(cols),)) - f0
+            jac[:, cols] = values / step[cols]
+        return self.con_scale[:, None] * jac
+
+    def project(self, x):
+        """
+        Project values of the variables inside their bounds.
+        """
+        margin = 1e-10 / self.var_scale
+        margin = np.minimum(margin, 0.5 * (self.ub - self.lb))
+        return np.clip(x, self.lb + margin, self.ub - margin)
+
+
+def _newton_step(jac, f):
+    try:
+        dx = np.linalg.solve(jac, -f)
+    except np.linalg.LinAlgError:
+        return None
+    return dx if np.all(np.isfinite(dx)) else None
+
+
+def _levenberg_marquardt_step(jac, f):
+    mu = np.linalg.norm(f)
+    jtj = jac.T @ jac
+    jtj[np.diag_indices_from(jtj)] += mu
+    try:
+        return np.linalg.solve(jtj, -jac.T @ f)
+    except np.linalg.LinAlgError:
+        return None
+
+
+def presolve_block(blk, tolerance=1e-8, max_iter=100, outlvl=idaeslog.NOTSET):
+    """
+    Solve the square system of the active equality constraints of a block in
+    its unfixed variables by a damped Newton method, with the residuals and
+    their Jacobian evaluated by NumPy code compiled from the constraints.
+    Fixed variables and mutable parameters, e.g. the parameters of property
+    and reaction packages, are read from the model, so the system solved is
+    exactly the one of the model.
+
+    Steps are scaled with the scaling factors of the variables and constraints,
+    projected within the bounds of the variables, and shortened by a backtracking
+    line search on the norm of the scaled residuals. If the Newton step does
+    not reduce the residuals, a Levenberg-Marquardt step is tried instead.
+
+    Args:
+        blk: block of which to solve the equality constraints
+        tolerance: tolerance on the largest scaled residual
+        max_iter: maximum number of iterations
+        outlvl: output level of the logger
+
+    Returns:
+        True if the system converged, in which case the solution is loaded in
+        the variables of the block, else False, leaving them unchanged.
+    """
+    init_log = idaeslog.getInitLogger(blk.name, outlvl)
+    system = _SquareSystem(blk)
+    if not system.variables:
+        return True
+
+    x = system.initial_point()
+    f = system.residual(x)
+    if not np.all(np.isfinite(f)):
+        init_log.warning("Pre-solve failed: residuals undefined at the initial point.")
+        return False
+
+    norm = np.linalg.norm(f)
+    iteration = 0
+    while np.max(np.abs(f)) > tolerance and iteration < max_iter:
+        jac = system.jacobian(x) / system.var_scale
+        accepted = False
+        for direction in (_newton_step, _levenberg_marquardt_step):
+            dy = direction(jac, f)
+            if dy is None:
+                continue
+            dx = dy / system.var_scale
+            alpha = 1.0
+            while alpha > 1e-4:
+                x_trial = system.project(x + alpha * dx)
+                f_trial = system.residual(x_trial)
+                norm_trial = np.linalg.norm(f_trial)
+                if np.isfinite(norm_trial) and norm_trial <= (1 - 1e-4 * alpha) * norm:
+                    accepted = True
+                    break
+                alpha *= 0.5
+            if accepted:
+                break
+        if not accepted:
+            break
+        x, f, norm = x_trial, f_trial, norm_trial
+        iteration += 1
+        init_log.info_high(
+            f"Pre-solve iteration {iteration}: "
+            f"residual {np.max(np.abs(f)):.3e}, step {alpha:.3e}"
+        )
+
+    converged = np.max(np.abs(f)) <= tolerance
+    if not converged:
+        init_log.warning(
+            f"Pre-solve failed to converge, largest residual {np.max(np.abs(f)):.3e}."
+        )
+        return False
+
+    for var, val in zip(system.variables, x):
+        var.set_value(float(val), skip_validation=True)
+    init_log.info(f"Pre-solve converged in {iteration} iterations.")
+    return True
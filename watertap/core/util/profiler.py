@@ -0,0 +1,320 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a profiler recording where time is spent initializing
+and solving a flowsheet.
+"""
+
+import functools
+import json
+import re
+import time
+
+from pyomo.opt.base.solvers import OptSolver
+from pyomo.environ import check_optimal_termination
+
+from idaes.core import UnitModelBlockData
+from idaes.core.base.property_base import StateBlock
+from idaes.core.initialization.initializer_base import InitializerBase
+
+from watertap.core.initialization_mixin import InitializationMixin
+
+_active_profiler = None
+
+# Statistics printed by IPOPT at the end of a solve. IPOPT 3.14 reports the
+# function evaluation time only with print_timing_statistics=yes
+_IPOPT_ITERATIONS = re.compile(r"Number of Iterations\.*:\s*(\d+)")
+_IPOPT_TOTAL_TIME = re.compile(
+    r"Total (?:CPU )?(?:seconds|secs) in IPOPT[^=]*=\s*([-\d.eE+]+)"
+)
+_IPOPT_EVALUATION_TIME = re.compile(
+    r"Total (?:CPU )?(?:seconds|secs) in NLP function evaluations\s*=\s*([-\d.eE+]+)"
+)
+_IPOPT_FUNCTION_TIMING = re.compile(
+    r"Function Evaluations\.*:\s*([-\d.eE+]+)\s*\(sys\)\s*([-\d.eE+]+)\s*\(wall\)"
+)
+
+
+def parse_ipopt_output(output):
+    """
+    Get the iteration count and times from the output of an IPOPT solve.
+
+    Args:
+        output: string printed by IPOPT
+
+    Returns:
+        dict with the number of iterations ("iterations"), the time reported by
+        IPOPT ("solver_time") and the time in function evaluations
+        ("evaluation_time"), with None for any value not found
+    """
+    stats = {"iterations": None, "solver_time": None, "evaluation_time": None}
+    if not output:
+        return stats
+    match = _IPOPT_ITERATIONS.search(output)
+    if match:
+        stats["iterations"] = int(match.group(1))
+    match = _IPOPT_TOTAL_TIME.search(output)
+    if match:
+        stats["solver_time"] = float(match.group(1))
+    match = _IPOPT_EVALUATION_TIME.search(output)
+    if match:
+        stats["evaluation_time"] = float(match.group(1))
+    else:
+        match = _IPOPT_FUNCTION_TIMING.search(output)
+        if match:
+            stats["evaluation_time"] = float(match.group(2))
+    return stats
+
+
+class ProfileRecord:
+    """
+    Time spent in one call to initialize or solve a block, and in the calls
+    made within it.
+    """
+
+    def __init__(self, name, kind, block=None):
+        self.name = name
+        self.kind = kind
+        self.block = block
+        self.time = 0.0
+        self.success = None
+        self.iterations = None
+        self.evaluation_time = None
+        self.children = []
+
+    @property
+    def total_iterations(self):
+        """
+        Number of solver iterations in this call and all calls within it.
+        """
+        return (self.iterations or 0) + sum(
+            child.total_iterations for child in self.children
+        )
+
+    @property
+    def total_evaluation_time(self):
+        """
+        Time spent in function evaluations in this call and all calls within it.
+        """
+        return (self.evaluation_time or 0.0) + sum(
+            child.total_evaluation_time for child in self.children
+        )
+
+    @property
+    def self_time(self):
+        """
+        Time spent in this call but not in calls within it.
+        """
+        return self.time - sum(child.time for child in self.children)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "time": self.time,
+            "success": self.success,
+            "iterations": self.iterations,
+            "evaluation_time": self.evaluation_time,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def _get_block(kind, obj, args, kwargs):
+    if kind == "initialize":
+        return obj
+    # Solvers and Initializer objects take the block as first argument
+    if args:
+        return args[0]
+    return kwargs.get("model", None)
+
+
+def _instrument(function, kind):
+    """
+    Wrap a method initializing or solving a block to record it with the
+    active profiler.
+    """
+
+    @functools.wraps(function)
+    def profiled(obj, *args, **kwargs):
+        profiler = _active_profiler
+        if profiler is None:
+            return function(obj, *args, **kwargs)
+
+        block = _get_block(kind, obj, args, kwargs)
+        parent = profiler._stack[-1]
+        # Overridden methods calling super() are recorded once
+        if parent.kind == kind and parent.block is block:
+            return function(obj, *args, **kwargs)
+
+        record = ProfileRecord(getattr(block, "name", str(block)), kind, block)
+        parent.children.append(record)
+        profiler._stack.append(record)
+        start = time.perf_counter()
+        try:
+            result = function(obj, *args, **kwargs)
+        except Exception:
+            record.success = False
+            raise
+        finally:
+            record.time = time.perf_counter() - start
+            profiler._stack.pop()
+            record.block = None
+
+        if kind == "solve":
+            try:
+                record.success = check_optimal_termination(result)
+            except Exception:
+                record.success = None
+            stats = parse_ipopt_output(getattr(obj, "_log", None))
+            record.iterations = stats["iterations"]
+            record.evaluation_time = stats["evaluation_time"]
+        else:
+            record.success = True
+        return result
+
+    profiled._profiler_original = function
+    return profiled
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+class InitializationProfiler:
+    """
+    Context manager recording the time spent initializing and solving each
+    block of a flowsheet.
+
+    While active, calls to ``initialize`` of unit models (including
+    ``InitializationMixin``, and hence ``initialize_build``), of property
+    StateBlocks and of Initializer objects are recorded, along with every
+    solve made through a Pyomo solver. For each call the wall time and success
+    is recorded, and for IPOPT solves the iteration count and time in function
+    evaluations. Calls made within another call are recorded as its children,
+    giving a hierarchical profile of the flowsheet.
+
+    The methods are instrumented on entering the context and restored on
+    leaving it, so there is no overhead when no profiler is active. Classes
+    defined after entering the context are not instrumented.
+
+    Example:
+        with InitializationProfiler() as profiler:
+            initialize_system(m)
+        print(profiler.report())
+    """
+
+    def __init__(self):
+        self.root = ProfileRecord("profile", "profile")
+        self._stack = [self.root]
+        self._patched = []
+
+    def _patch(self, cls, name, kind):
+        function = cls.__dict__.get(name, None)
+        if function is None or hasattr(function, "_profiler_original"):
+            return
+        self._patched.append((cls, name, function))
+        setattr(cls, name, _instrument(function, kind))
+
+    def __enter__(self):
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError("An InitializationProfiler is already active.")
+
+        self._patch(InitializationMixin, "initialize", "initialize")
+        for base in (UnitModelBlockData, StateBlock):
+            for cls in _subclasses(base):
+                self._patch(cls, "initialize", "initialize")
+        for cls in _subclasses(InitializerBase):
+            self._patch(cls, "initialize", "initializer")
+        for cls in _subclasses(OptSolver):
+            self._patch(cls, "solve", "solve")
+
+        _active_profiler = self
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_profiler
+        self.root.time += time.perf_counter() - self._start
+        _active_profiler = None
+        for cls, name, function in reversed(self._patched):
+            setattr(cls, name, function)
+        self._patched = []
+
+    def to_dict(self):
+        """
+        Get the profile as a dict.
+
+        Returns:
+            dict with the name, kind ("initialize", "initializer" or "solve"),
+            wall time in seconds, success, iteration count, function
+            evaluation time and list of children of each call
+        """
+        return self.root.to_dict()
+
+    def to_json(self, filename=None, **kwargs):
+        """
+        Get the profile as JSON.
+
+        Args:
+            filename: (optional) path of a file to write the JSON to
+            kwargs: passed to json.dump
+
+        Returns:
+            JSON string
+        """
+        kwargs.setdefault("indent", 2)
+        data = json.dumps(self.to_dict(), **kwargs)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(data)
+        return data
+
+    def report(self, min_time=0.0):
+        """
+        Get a report of the profile, with calls indented under the call they
+        were made in.
+
+        Args:
+            min_time: (optional) calls taking less time than this are omitted
+
+        Returns:
+            report as a string
+        """
+        lines = [
+            f"{'Block':<60}{'Kind':>12}{'Time [s]':>10}{'Self [s]':>10}"
+            f"{'Iters':>7}{'Eval [s]':>10}  Status"
+        ]
+
+        def add(record, depth):
+            if record.time < min_time:
+                return
+            status = {True: "ok", False: "FAILED", None: ""}[record.success]
+            eval_time = record.total_evaluation_time
+            lines.append(
+                f"{'  ' * depth + record.name:<60}{record.kind:>12}"
+                f"{record.time:>10.3f}{record.self_time:>10.3f}"
+                f"{record.total_iterations:>7d}"
+                f"{(f'{eval_time:.3f}' if eval_time else '-'):>10}  {status}"
+            )
+            for child in record.children:
+                add(child, depth + 1)
+
+        for record in self.root.children:
+            add(record, 0)
+        lines.append(
+            f"Total time {self.root.time:.3f} s, "
+            f"{self.root.total_iterations} solver iterations"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,77 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains helpers for building property correlations as compact
+expressions with dimensionless coefficients.
+"""
+
+from numbers import Number
+
+from pyomo.environ import units as pyunits
+
+
+def correlation_coefficients(*parameters, scale=1):
+    """
+    Get the parameters of a correlation as dimensionless coefficients, so they
+    can be combined with dimensionless variables in Horner form. The
+    coefficients reference the parameters, so later changes to the parameters
+    (e.g. in parameter estimation) are reflected in the correlation.
+
+    Args:
+        parameters: Pyomo components (e.g. fixed Vars or Params) holding the
+            coefficients of a correlation
+        scale: (optional) factor the parameters are multiplied by
+
+    Returns:
+        list of expressions equal to the values of the parameters
+    """
+    coefficients = []
+    for p in parameters:
+        units = pyunits.get_units(p)
+        c = p if units is None else p / units
+        coefficients.append(c if scale == 1 else scale * c)
+    return coefficients
+
+
+def horner(x, coefficients):
+    """
+    Build the polynomial c[0] + c[1]*x + ... + c[n]*x**n in Horner form,
+    c[0] + x*(c[1] + x*(... + x*c[n])), which has fewer operations than the
+    sum of powers. Coefficients equal to zero are skipped.
+
+    Args:
+        x: variable of the polynomial, a number or Pyomo expression
+        coefficients: sequence of coefficients in order of increasing power,
+            numbers or Pyomo expressions
+
+    Returns:
+        expression for the polynomial
+    """
+    terms = [
+        (power, c)
+        for power, c in enumerate(coefficients)
+        if not (isinstance(c, Number) and c == 0)
+    ]
+    if not terms:
+        return 0
+
+    power, expr = terms[-1]
+    for next_power, c in reversed(terms[:-1]):
+        expr = c + _power(x, power - next_power) * expr
+        power = next_power
+    if power:
+        expr = _power(x, power) * expr
+    return expr
+
+
+def _power(x, n):
+    return x if n == 1 else x**n
@@ -0,0 +1,437 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a compact runtime for radial basis function (RBF)
+surrogates trained with PySMO.
+"""
+
+import json
+import os
+
+import numpy as np
+import scipy.sparse as sps
+
+from pyomo.environ import Constraint, Expression, exp, log
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# Parsed surrogates, keyed by path, with the modification time of the file
+_surrogate_cache = {}
+
+
+def _frozen(array):
+    array = np.array(array, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+class RBFSurrogate:
+    """
+    Single-output RBF surrogate with its parameters held as NumPy arrays.
+
+    The output is
+    ``y_min + (y_max - y_min) * sum_i weights[i] * phi(|xs - centres[i]|)``,
+    where ``xs = (x - x_min) / (x_max - x_min)`` are the scaled inputs and phi
+    is the basis function, as in PySMO's RadialBasisFunctions.
+    """
+
+    basis_functions = ("linear", "cubic", "gaussian", "mq", "imq", "spline")
+
+    def __init__(
+        self,
+        centres,
+        weights,
+        x_min,
+        x_max,
+        y_min,
+        y_max,
+        basis_function,
+        sigma=0.0,
+        input_labels=None,
+        output_label=None,
+        input_bounds=None,
+        x_data=None,
+    ):
+        if basis_function not in self.basis_functions:
+            raise ValueError(
+                f"Unsupported basis function {basis_function}, expected one of "
+                f"{self.basis_functions}."
+            )
+        self.centres = _frozen(centres)
+        self.weights = _frozen(weights).ravel()
+        self.x_min = _frozen(x_min).ravel()
+        self.x_max = _frozen(x_max).ravel()
+        self.y_min = float(np.ravel(y_min)[0])
+        self.y_max = float(np.ravel(y_max)[0])
+        self.basis_function = basis_function
+        self.sigma = float(sigma)
+        self.input_labels = input_labels
+        self.output_label = output_label
+        self.input_bounds = input_bounds
+        self.x_data = None if x_data is None else _frozen(x_data)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a surrogate from the dict saved by PysmoSurrogate.save_to_file.
+
+        Args:
+            data: dict with the model encoding of a single-output RBF surrogate
+
+        Returns:
+            RBFSurrogate
+        """
+        if data.get("surrogate_type", None) != "rbf":
+            raise ValueError(
+                f"Expected an RBF surrogate, not {data.get('surrogate_type', None)}."
+            )
+        if len(data["output_labels"]) != 1:
+            raise ValueError("Only surrogates with a single output are supported.")
+        output_label = data["output_labels"][0]
+        attr = data["model_encoding"][output_label]["attr"]
+        return cls(
+            centres=attr["centres"],
+            weights=attr["weights"],
+            x_min=attr["x_data_min"],
+            x_max=attr["x_data_max"],
+            y_min=attr["y_data_min"],
+            y_max=attr["y_data_max"],
+            basis_function=attr["basis_function"],
+            sigma=attr["sigma"],
+            input_labels=list(data["input_labels"]),
+            output_label=output_label,
+            input_bounds=data.get("input_bounds", None),
+            x_data=attr.get("x_data", None),
+        )
+
+    @property
+    def n_inputs(self):
+        return self.centres.shape[1]
+
+    @property
+    def n_centres(self):
+        return self.centres.shape[0]
+
+    def _phi(self, r):
+        sigma = self.sigma
+        if self.basis_function == "linear":
+            return r
+        elif self.basis_function == "cubic":
+            return r**3
+        elif self.basis_function == "gaussian":
+            return np.exp(-((sigma * r) ** 2))
+        elif self.basis_function == "mq":
+            return np.sqrt((sigma * r) ** 2 + 1)
+        elif self.basis_function == "imq":
+            return 1 / np.sqrt((sigma * r) ** 2 + 1)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(r > 0, r**2 * np.log(r), 0.0)
+
+    def _dphi_over_r(self, r):
+        """
+        Derivative of the basis function divided by r, taken as zero at r = 0
+        where it is singular.
+        """
+        sigma = self.sigma
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.basis_function == "linear":
+                return np.where(r > 0, 1 / r, 0.0)
+            elif self.basis_function == "cubic":
+                return 3 * r
+            elif self.basis_function == "gaussian":
+                return -2 * sigma**2 * np.exp(-((sigma * r) ** 2))
+            elif self.basis_function == "mq":
+                return sigma**2 / np.sqrt((sigma * r) ** 2 + 1)
+            elif self.basis_function == "imq":
+                return -(sigma**2) / ((sigma * r) ** 2 + 1) ** 1.5
+            else:
+                return np.where(r > 0, 2 * np.log(r) + 1, 0.0)
+
+    def _scale(self, x):
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        return (x - self.x_min) / (self.x_max - self.x_min)
+
+    def _differences(self, x):
+        # (points, centres, inputs) differences of scaled inputs from centres
+        diff = self._scale(x)[:, None, :] - self.centres[None, :, :]
+        return diff, np.sqrt(np.sum(diff**2, axis=2))
+
+    def evaluate(self, x):
+        """
+        Evaluate the surrogate.
+
+        Args:
+            x: array of input values, of shape (n_inputs,) or (points, n_inputs)
+
+        Returns:
+            numpy array of outputs, of shape (points,)
+        """
+        _, r = self._differences(x)
+        return self.y_min + (self.y_max - self.y_min) * (self._phi(r) @ self.weights)
+
+    def gradient(self, x):
+        """
+        Evaluate the derivatives of the output with respect to the inputs.
+
+        Args:
+            x: array of input values, of shape (n_inputs,) or (points, n_inputs)
+
+        Returns:
+            numpy array of derivatives, of shape (points, n_inputs)
+        """
+        diff, r = self._differences(x)
+        coeff = self._dphi_over_r(r) * self.weights
+        return (
+            (self.y_max - self.y_min)
+            * np.einsum("pc,pci->pi", coeff, diff)
+            / (self.x_max - self.x_min)
+        )
+
+    def reduce(self, n_centres, n_fit_points=1000):
+        """
+        Get a surrogate with fewer centres approximating this one.
+
+        Centres are selected by farthest point sampling of the existing
+        centres, and the weights are refitted by least squares to the outputs
+        of this surrogate at its training points and a uniform grid over the
+        scaled input space. The maximum error at these points is logged; check
+        it is acceptable, as surrogates of sharp features need many centres.
+
+        Args:
+            n_centres: number of centres to keep
+            n_fit_points: (optional) approximate number of grid points to fit
+                the weights at (default 1000)
+
+        Returns:
+            RBFSurrogate with n_centres centres
+        """
+        if n_centres >= self.n_centres:
+            return self
+        if n_centres < 1:
+            raise ValueError(f"n_centres must be a positive integer, not {n_centres}.")
+
+        # Points to fit at, in scaled inputs
+        per_dimension = max(2, int(np.ceil(n_fit_points ** (1 / self.n_inputs))))
+        grid = np.meshgrid(*[np.linspace(0, 1, per_dimension)] * self.n_inputs)
+        fit_points = np.column_stack([g.ravel() for g in grid])
+        if self.x_data is not None:
+            fit_points = np.vstack([self.x_data, fit_points])
+        points = fit_points * (self.x_max - self.x_min) + self.x_min
+
+        # Farthest point sampling, starting from the first centre
+        selected = [0]
+        distance = np.linalg.norm(self.centres - self.centres[0], axis=1)
+        for _ in range(n_centres - 1):
+            index = int(np.argmax(distance))
+            selected.append(index)
+            distance = np.minimum(
+                distance, np.linalg.norm(self.centres - self.centres[index], axis=1)
+            )
+        centres = self.centres[np.sort(selected)]
+
+        targets = (self.evaluate(points) - self.y_min) / (self.y_max - self.y_min)
+        r = np.linalg.norm(fit_points[:, None, :] - centres[None, :, :], axis=2)
+        weights = np.linalg.lstsq(self._phi(r), targets, rcond=None)[0]
+
+        reduced = RBFSurrogate(
+            centres=centres,
+            weights=weights,
+            x_min=self.x_min,
+            x_max=self.x_max,
+            y_min=self.y_min,
+            y_max=self.y_max,
+            basis_function=self.basis_function,
+            sigma=self.sigma,
+            input_labels=self.input_labels,
+            output_label=self.output_label,
+            input_bounds=self.input_bounds,
+            x_data=self.x_data,
+        )
+        error = np.max(np.abs(reduced.evaluate(points) - self.evaluate(points)))
+        _log.info(
+            f"Reduced surrogate {self.output_label} from {self.n_centres} to "
+            f"{n_centres} centres, maximum error at fitted points {error:.3e}"
+        )
+        return reduced
+
+    def expression(self, scaled_inputs):
+        """
+        Get the Pyomo expression of the surrogate in terms of scaled inputs.
+
+        Args:
+            scaled_inputs: list of Pyomo expressions of the scaled inputs
+                ``(x - x_min) / (x_max - x_min)``, ideally named Expressions so
+                that they are only written once
+
+        Returns:
+            Pyomo expression for the output
+        """
+        sigma2 = self.sigma**2
+        terms = []
+        for centre, weight in zip(self.centres, self.weights):
+            # Basis functions of the squared distance, to avoid a square root
+            s = sum((xs - c) ** 2 for xs, c in zip(scaled_inputs, centre))
+            if self.basis_function == "linear":
+                phi = s**0.5
+            elif self.basis_function == "cubic":
+                phi = s**1.5
+            elif self.basis_function == "gaussian":
+                phi = exp(-sigma2 * s)
+            elif self.basis_function == "mq":
+                phi = (sigma2 * s + 1) ** 0.5
+            elif self.basis_function == "imq":
+                phi = (sigma2 * s + 1) ** -0.5
+            else:
+                phi = 0.5 * s * log(s)
+            terms.append(float(weight) * phi)
+        return self.y_min + (self.y_max - self.y_min) * sum(terms)
+
+
+def load_rbf_surrogate(path):
+    """
+    Load an RBF surrogate saved by PysmoSurrogate.save_to_file. The file is
+    parsed once, and the same surrogate returned until the file is modified.
+
+    Args:
+        path: path of the JSON file
+
+    Returns:
+        RBFSurrogate
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    cached = _surrogate_cache.get(path, None)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        surrogate = RBFSurrogate.from_dict(json.load(f))
+    _surrogate_cache[path] = (mtime, surrogate)
+    return surrogate
+
+
+def _get_grey_box_model(surrogate):
+    """
+    Get a PyNumero grey box model of an RBF surrogate, providing its outputs
+    and analytic derivatives to solvers supporting grey box models (e.g.
+    cyipopt). PyNumero is only imported when a grey box model is requested.
+    """
+    from pyomo.contrib.pynumero.interfaces.external_grey_box import (
+        ExternalGreyBoxModel,
+    )
+
+    class RBFGreyBoxModel(ExternalGreyBoxModel):
+        def __init__(self, surrogate):
+            self.surrogate = surrogate
+            self._inputs = np.zeros(surrogate.n_inputs)
+
+        def input_names(self):
+            return [f"x{j}" for j in range(self.surrogate.n_inputs)]
+
+        def output_names(self):
+            return ["y"]
+
+        def set_input_values(self, input_values):
+            self._inputs[:] = input_values
+
+        def evaluate_outputs(self, *args, **kwargs):
+            return self.surrogate.evaluate(self._inputs)
+
+        def evaluate_jacobian_outputs(self, *args, **kwargs):
+            gradient = self.surrogate.gradient(self._inputs)[0]
+            n = len(gradient)
+            return sps.coo_matrix(
+                (gradient, (np.zeros(n), np.arange(n))), shape=(1, n)
+            )
+
+    return RBFGreyBoxModel(surrogate)
+
+
+def build_rbf_surrogate(
+    blk,
+    surrogate,
+    input_vars,
+    output_var,
+    use_grey_box=False,
+    use_surrogate_bounds=True,
+):
+    """
+    Add the constraints of an RBF surrogate relating input and output variables
+    to a block.
+
+    By default the surrogate is written as an algebraic constraint, in which
+    the scaled inputs are named Expressions shared by all the basis functions.
+    With ``use_grey_box=True`` it is instead added as a PyNumero grey box
+    model with analytic derivatives, whose size does not depend on the number
+    of centres, but which requires a solver supporting grey box models. For
+    surrogates with many centres, consider ``surrogate.reduce`` first.
+
+    Args:
+        blk: Pyomo block to add the surrogate to
+        surrogate: RBFSurrogate
+        input_vars: list of input variables, in the order of the surrogate
+            inputs
+        output_var: output variable
+        use_grey_box: (optional) whether to add a grey box model (default False)
+        use_surrogate_bounds: (optional) whether to tighten the bounds of the
+            input variables to the bounds of the surrogate (default True)
+
+    Returns:
+        None
+    """
+    if len(input_vars) != surrogate.n_inputs:
+        raise ValueError(
+            f"Surrogate {surrogate.output_label} has {surrogate.n_inputs} inputs, "
+            f"but {len(input_vars)} input variables were provided."
+        )
+
+    if use_surrogate_bounds and surrogate.input_bounds is not None:
+        for label, v in zip(surrogate.input_labels, input_vars):
+            lb, ub = surrogate.input_bounds[label]
+            v.setlb(lb if v.lb is None else max(lb, v.lb))
+            v.setub(ub if v.ub is None else min(ub, v.ub))
+
+    if use_grey_box:
+        from pyomo.contrib.pynumero.interfaces.external_grey_box import (
+            ExternalGreyBoxBlock,
+        )
+
+        blk.grey_box = ExternalGreyBoxBlock(
+            external_model=_get_grey_box_model(surrogate)
+        )
+        for j, v in enumerate(input_vars):
+            if v.value is not None:
+                blk.grey_box.inputs[f"x{j}"].set_value(v.value)
+        blk.grey_box.outputs["y"].set_value(
+            float(
+                surrogate.evaluate(
+                    [v.value if v.value is not None else 0 for v in input_vars]
+                )[0]
+            )
+        )
+        blk.input_constraint = Constraint(
+            range(surrogate.n_inputs),
+            rule=lambda b, j: b.grey_box.inputs[f"x{j}"] == input_vars[j],
+        )
+        blk.output_constraint = Constraint(expr=output_var == blk.grey_box.outputs["y"])
+        return
+
+    blk.scaled_inputs = Expression(
+        range(surrogate.n_inputs),
+        rule=lambda b, j: (input_vars[j] - float(surrogate.x_min[j]))
+        / float(surrogate.x_max[j] - surrogate.x_min[j]),
+    )
+    blk.rbf_constraint = Constraint(
+        expr=output_var
+        == surrogate.expression([blk.scaled_inputs[j] for j in blk.scaled_inputs])
+    )
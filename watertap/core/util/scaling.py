@@ -10,9 +10,16 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 """
-This module contains a utility function for the scaling of WaterTAP property model constraints.
+This module contains utility functions for the scaling of WaterTAP models.
 """
+import numpy as np
+import scipy.sparse as sps
+
 import pyomo.environ as pyo
+from pyomo.common.modeling import unique_component_name
+from pyomo.contrib.pynumero.asl import AmplInterface
+from pyomo.core.expr.calculus.diff_with_pyomo import reverse_ad
+from pyomo.core.expr.visitor import identify_variables
 import idaes.core.util.scaling as iscale
 import idaes.logger as idaeslog
 
@@ -20,12 +27,13 @@ _log = idaeslog.getLogger(__name__)
 
 
 def transform_property_constraints(self):
+    state_vars = set(self.define_state_vars())
     for p in self.params.get_metadata().properties.list_supported_properties():
         var_str = p.name
         if p.method is not None and self.is_property_constructed(var_str):
             var = getattr(self, var_str)
             # Some property models may not use `None` as the method for state variables and wouldn't have a constraint
-            if var_str in list(self.define_state_vars()):
+            if var_str in state_vars:
                 continue
             msg = (
                 f"If there was a property constraint written for the variable, {var}, that constraint was not "
@@ -55,3 +63,168 @@ def transform_property_constraints(self):
                         _log.warning(msg)
             else:
                 _log.warning(msg)
+
+
+def _get_jacobian_pynumero(blk):
+    """
+    Evaluate the Jacobian of the active constraints of blk with PyNumero.
+    """
+    from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
+
+    # PyNumero requires an objective
+    objective_name = None
+    if next(blk.component_data_objects(pyo.Objective, active=True), None) is None:
+        objective_name = unique_component_name(blk, "objective")
+        blk.add_component(objective_name, pyo.Objective(expr=0))
+    try:
+        nlp = PyomoNLP(blk)
+        jac = nlp.evaluate_jacobian().tocsr()
+        constraints = nlp.get_pyomo_constraints()
+        variables = nlp.get_pyomo_variables()
+    finally:
+        if objective_name is not None:
+            blk.del_component(objective_name)
+    return jac, constraints, variables
+
+
+def _get_jacobian_python(blk):
+    """
+    Evaluate the Jacobian of the active constraints of blk by reverse mode
+    differentiation in Python, for when PyNumero is not available.
+    """
+    constraints = list(
+        blk.component_data_objects(pyo.Constraint, active=True, descend_into=True)
+    )
+    var_index = pyo.ComponentMap()
+    variables = []
+    rows, cols, data = [], [], []
+    for i, c in enumerate(constraints):
+        derivatives = reverse_ad(c.body)
+        for v in identify_variables(c.body, include_fixed=False):
+            j = var_index.get(v, None)
+            if j is None:
+                j = var_index[v] = len(variables)
+                variables.append(v)
+            rows.append(i)
+            cols.append(j)
+            data.append(derivatives[v])
+    jac = sps.csr_matrix(
+        (np.array(data, dtype=float), (rows, cols)),
+        shape=(len(constraints), len(variables)),
+    )
+    return jac, constraints, variables
+
+
+def get_jacobian(blk):
+    """
+    Evaluate the Jacobian of the active constraints of a block with respect to
+    its unfixed variables at the current point, with PyNumero if available.
+
+    Args:
+        blk: block whose Jacobian to evaluate
+
+    Returns:
+        tuple of the Jacobian as a scipy CSR matrix, and the lists of
+        constraints and variables of its rows and columns
+    """
+    if AmplInterface.available():
+        return _get_jacobian_pynumero(blk)
+    return _get_jacobian_python(blk)
+
+
+def calculate_jacobian_scaling_factors(
+    blk,
+    scale_variables=True,
+    scale_constraints=True,
+    overwrite=False,
+    max_iter=20,
+    tolerance=0.1,
+    min_scale=1e-8,
+    max_scale=1e8,
+):
+    """
+    Calculate scaling factors for the unfixed variables and active constraints
+    of a block by equilibrating its Jacobian at the current point.
+
+    The Jacobian is evaluated once (with PyNumero, if available) and row and
+    column scaling factors are found by Ruiz equilibration: the rows and
+    columns of the scaled Jacobian are repeatedly divided by the square root
+    of their largest absolute entry, until every row and column has largest
+    entry close to one. The resulting factors are set as the IDAES scaling
+    factors of the constraints and variables, which are used by solvers
+    supporting user scaling (e.g. ipopt-watertap).
+
+    The model should be initialized, as scaling factors are calculated from
+    the derivatives at the current values of the variables.
+
+    Args:
+        blk: block to scale
+        scale_variables: whether to set scaling factors of variables
+        scale_constraints: whether to set scaling factors of constraints
+        overwrite: whether to replace existing scaling factors; if False,
+            components which already have a scaling factor keep it, and it is
+            accounted for when scaling the others
+        max_iter: maximum number of equilibration iterations
+        tolerance: stop when the largest entry in every nonzero row and column
+            is within this relative tolerance of one
+        min_scale: minimum scaling factor to set
+        max_scale: maximum scaling factor to set
+
+    Returns:
+        tuple of numpy arrays of the constraint and variable scaling factors,
+        in the order of the constraints and variables in the Jacobian
+    """
+    jac, constraints, variables = get_jacobian(blk)
+
+    # In IDAES, scaled variables are sf * v, so the Jacobian with respect to
+    # scaled variables has columns divided by the variable scaling factor
+    row_scale = np.ones(len(constraints))
+    col_scale = np.ones(len(variables))
+    free_rows = np.full(len(constraints), scale_constraints)
+    free_cols = np.full(len(variables), scale_variables)
+    if not overwrite:
+        for i, c in enumerate(constraints):
+            sf = iscale.get_scaling_factor(c)
+            if sf is not None:
+                row_scale[i] = sf
+                free_rows[i] = False
+        for j, v in enumerate(variables):
+            sf = iscale.get_scaling_factor(v)
+            if sf is not None:
+                col_scale[j] = 1 / sf
+                free_cols[j] = False
+
+    abs_jac = abs(jac).tocsr()
+    abs_jac.eliminate_zeros()
+    for _ in range(max_iter):
+        scaled = sps.diags(row_scale) @ abs_jac @ sps.diags(col_scale)
+        row_max = scaled.max(axis=1).toarray().ravel()
+        col_max = scaled.max(axis=0).toarray().ravel()
+
+        update_rows = free_rows & (row_max > 0)
+        update_cols = free_cols & (col_max > 0)
+        error = max(
+            np.max(np.abs(np.log(row_max[update_rows])), initial=0),
+            np.max(np.abs(np.log(col_max[update_cols])), initial=0),
+        )
+        if error <= np.log1p(tolerance):
+            break
+
+        row_scale[update_rows] /= np.sqrt(row_max[update_rows])
+        scaled = sps.diags(row_scale) @ abs_jac @ sps.diags(col_scale)
+        col_max = scaled.max(axis=0).toarray().ravel()
+        col_scale[update_cols] /= np.sqrt(col_max[update_cols])
+
+    constraint_sf = np.clip(row_scale, min_scale, max_scale)
+    variable_sf = np.clip(1 / col_scale, min_scale, max_scale)
+
+    for i in np.flatnonzero(free_rows):
+        iscale.set_scaling_factor(constraints[i], float(constraint_sf[i]))
+    for j in np.flatnonzero(free_cols):
+        iscale.set_scaling_factor(variables[j], float(variable_sf[j]))
+
+    _log.debug(
+        f"Calculated Jacobian scaling factors for {int(free_rows.sum())} "
+        f"constraints and {int(free_cols.sum())} variables of {blk.name}"
+    )
+    return constraint_sf, variable_sf
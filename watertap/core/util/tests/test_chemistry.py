@@ -16,8 +16,10 @@ from pyomo.environ import units as pyunits, value
 from pyomo.util.check_units import assert_units_equivalent
 
 from watertap.core.util.chemistry import (
+    get_atomic_masses,
     get_charge,
     get_molar_mass,
+    get_molar_masses,
     get_molar_mass_quantity,
     get_periodic_table,
 )
@@ -70,6 +72,31 @@ def test_get_mw():
         assert get_molar_mass(solute_name) == mw_value
 
 
+@pytest.mark.unit
+def test_get_mws():
+    names = ["NaCl", "Na_+", "Cl_-", "Ca_2+", "SO4_2-"]
+    molar_masses = get_molar_masses(names)
+    assert list(molar_masses) == names
+    for solute_name in names:
+        assert molar_masses[solute_name] == get_molar_mass(solute_name)
+
+    with pytest.raises(
+        IOError, match="Molecular weight data could not be found for foo."
+    ):
+        get_molar_masses(["NaCl", "foo"])
+
+
+@pytest.mark.unit
+def test_get_mw_cached():
+    get_molar_mass.cache_clear()
+    get_molar_mass("MgCl2")
+    get_molar_mass("MgCl2")
+    info = get_molar_mass.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert get_atomic_masses() is get_atomic_masses()
+
+
 @pytest.mark.unit
 def test_get_mw_exception():
     with pytest.raises(
@@ -114,3 +141,11 @@ def test_periodic_table_headers(periodic_table):
     size = {"cols": 28, "rows": 118}
     assert len(periodic_table.columns) == size["cols"]
     assert len(periodic_table.values) == size["rows"]
+
+
+@pytest.mark.unit
+def test_atomic_masses(periodic_table):
+    atomic_masses = get_atomic_masses()
+    assert len(atomic_masses) == 118
+    for symbol, mass in zip(periodic_table["Symbol"], periodic_table["AtomicMass"]):
+        assert atomic_masses[symbol] == mass
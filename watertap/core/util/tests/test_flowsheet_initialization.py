@@ -0,0 +1,184 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import os
+
+import pytest
+
+from pyomo.environ import ConcreteModel, Param, TransformationFactory, Var
+from pyomo.network import Arc, Port
+from idaes.core import ProcessBlockData, declare_process_block_class
+
+from watertap.core.util.flowsheet_initialization import FlowsheetInitializer
+
+
+@declare_process_block_class("Gain")
+class GainData(ProcessBlockData):
+    """
+    Toy unit whose initialization sets outlet = gain * sum(inlets).
+    """
+
+    def build(self):
+        super().build()
+        self.gain = Param(initialize=1.0, mutable=True)
+        self.flow_in1 = Var(initialize=0)
+        self.flow_in2 = Var(initialize=0)
+        self.flow_out = Var(initialize=0)
+        self.pid = Var(initialize=0)
+        self.inlet1 = Port(initialize={"flow": self.flow_in1})
+        self.inlet2 = Port(initialize={"flow": self.flow_in2})
+        self.outlet = Port(initialize={"flow": self.flow_out})
+
+    def initialize(self):
+        self.flow_out.value = self.gain.value * (
+            self.flow_in1.value + self.flow_in2.value
+        )
+        self.pid.value = os.getpid()
+
+
+def build_recycle():
+    # feed -> mixer -> split -> product, with split -> mixer recycle
+    m = ConcreteModel()
+    m.feed = Gain()
+    m.feed.flow_in1.fix(1.0)
+    m.mixer = Gain()
+    m.split = Gain()
+    m.split.gain = 0.5
+    m.product = Gain()
+    m.feed_to_mixer = Arc(source=m.feed.outlet, destination=m.mixer.inlet1)
+    m.mixer_to_split = Arc(source=m.mixer.outlet, destination=m.split.inlet1)
+    m.split_to_product = Arc(source=m.split.outlet, destination=m.product.inlet1)
+    m.recycle = Arc(source=m.split.outlet, destination=m.mixer.inlet2)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    return m
+
+
+def build_branches(recycle=False):
+    # feed -> (a, b) in parallel -> product, optionally with product -> feed
+    # recycle
+    m = ConcreteModel()
+    m.feed = Gain()
+    m.feed.flow_in1.fix(1.0)
+    m.a = Gain()
+    m.a.gain = 2.0
+    m.b = Gain()
+    m.b.gain = 3.0
+    m.product = Gain()
+    m.feed_to_a = Arc(source=m.feed.outlet, destination=m.a.inlet1)
+    m.feed_to_b = Arc(source=m.feed.outlet, destination=m.b.inlet1)
+    m.a_to_product = Arc(source=m.a.outlet, destination=m.product.inlet1)
+    m.b_to_product = Arc(source=m.b.outlet, destination=m.product.inlet2)
+    if recycle:
+        m.product.gain = 0.1
+        m.recycle = Arc(source=m.product.outlet, destination=m.feed.inlet2)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    return m
+
+
+def initialize_and_fix(unit):
+    unit.initialize()
+    unit.flow_out.fix()
+
+
+@pytest.mark.unit
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="max_iter must be a positive integer"):
+        FlowsheetInitializer(max_iter=0)
+    with pytest.raises(ValueError, match="processes must be a positive integer"):
+        FlowsheetInitializer(processes=0)
+
+
+@pytest.mark.unit
+def test_calculation_order():
+    m = build_branches()
+    tears, order = FlowsheetInitializer().get_calculation_order(m)
+
+    assert tears == []
+    assert [sorted(u.name for u in level) for level in order] == [
+        ["feed"],
+        ["a", "b"],
+        ["product"],
+    ]
+
+
+@pytest.mark.unit
+def test_recycle_converges():
+    m = build_recycle()
+    result = FlowsheetInitializer(max_iter=100, tolerance=1e-8).initialize(m)
+
+    assert result["converged"]
+    assert result["residual"] <= 1e-8
+    # mixer = feed + 0.5 * mixer
+    assert m.mixer.flow_out.value == pytest.approx(2.0, rel=1e-7)
+    assert m.product.flow_out.value == pytest.approx(1.0, rel=1e-7)
+
+
+@pytest.mark.unit
+def test_recycle_tear_guess():
+    m = build_recycle()
+    initializer = FlowsheetInitializer(
+        tear_set=[m.recycle],
+        tear_guesses={m.mixer.inlet2: {"flow": 1.0}},
+        tolerance=1e-8,
+    )
+    result = initializer.initialize(m)
+
+    # The exact guess converges after a single sweep
+    assert result["converged"]
+    assert result["iterations"] == 1
+    assert m.mixer.flow_out.value == pytest.approx(2.0, rel=1e-12)
+
+
+@pytest.mark.unit
+def test_not_converged():
+    m = build_recycle()
+    result = FlowsheetInitializer(max_iter=2).initialize(m)
+
+    assert not result["converged"]
+    assert result["iterations"] == 2
+
+
+@pytest.mark.component
+def test_processes():
+    m = build_branches()
+    result = FlowsheetInitializer(processes=2).initialize(m)
+
+    assert result["converged"]
+    assert m.a.flow_out.value == 2.0
+    assert m.b.flow_out.value == 3.0
+    assert m.product.flow_out.value == 5.0
+    # independent units are initialized in worker processes
+    assert m.a.pid.value != os.getpid()
+    assert m.b.pid.value != os.getpid()
+    assert m.feed.pid.value == os.getpid()
+
+
+@pytest.mark.component
+def test_processes_recycle():
+    m = build_branches(recycle=True)
+    initializer = FlowsheetInitializer(
+        unit_initialize=initialize_and_fix,
+        tear_set=[m.recycle],
+        max_iter=100,
+        tolerance=1e-8,
+        processes=2,
+    )
+    result = initializer.initialize(m)
+
+    # feed = 1 + 0.1 * (2 + 3) * feed, which only converges if the workers
+    # start each sweep from the current values
+    assert result["converged"]
+    assert m.feed.flow_out.value == pytest.approx(2.0, rel=1e-7)
+    assert m.product.flow_out.value == pytest.approx(1.0, rel=1e-7)
+    assert m.a.pid.value != os.getpid()
+    # fixed flags are returned from the workers
+    assert m.a.flow_out.fixed and m.b.flow_out.fixed
@@ -12,7 +12,7 @@
 
 import pytest
 
-from pyomo.environ import ConcreteModel, Var, Constraint, ConstraintList
+from pyomo.environ import Block, ConcreteModel, Var, Constraint, ConstraintList
 
 from watertap.core.solvers import get_solver
 from idaes.core.util.exceptions import InitializationError
@@ -179,3 +179,66 @@ class TestIntervalImproveInitial:
         assert m.y.ub == None
         assert m.z.lb == None
         assert m.z.ub == None
+
+
+class TestIntervalInitializerSubBlocks:
+    @pytest.fixture
+    def m(self):
+        m = ConcreteModel()
+        m.b1 = Block()
+        m.b1.x = Var(bounds=(0, 10), initialize=20)
+        m.b1.y = Var(initialize=5)
+        m.b1.c = Constraint(expr=m.b1.y == 2 * m.b1.x)
+        m.b2 = Block()
+        m.b2.x = Var(bounds=(1, 2))
+        m.b2.y = Var(initialize=-5)
+        m.b2.c = Constraint(expr=m.b2.y == m.b2.x + 1)
+        m.z = Var(initialize=100)
+        m.c = Constraint(expr=m.z == m.b1.y + m.b2.y)
+
+        return m
+
+    @pytest.mark.unit
+    def test_timing(self, m):
+        timing = interval_initializer(m)
+
+        assert set(timing) == {"gather", "fbbt", "project", "restore"}
+        assert all(t >= 0 for t in timing.values())
+
+    @pytest.mark.unit
+    def test_interval_initializer(self, m):
+        interval_initializer(m)
+
+        assert m.b1.x.value == pytest.approx(10, abs=1e-6)
+        assert m.b1.y.value == pytest.approx(5, abs=1e-6)
+        assert m.b2.x.value == pytest.approx(1, abs=1e-6)
+        assert m.b2.y.value == pytest.approx(2, abs=1e-6)
+        assert m.z.value == pytest.approx(23, abs=1e-6)
+
+        # Original bounds are restored
+        assert m.b1.x.bounds == (0, 10)
+        assert m.b1.y.bounds == (None, None)
+        assert m.z.bounds == (None, None)
+
+    @pytest.mark.unit
+    def test_repeated_calls(self):
+        m = ConcreteModel()
+        m.b1 = Block()
+        m.b1.a = Var(initialize=1)
+        m.b1.a.fix()
+        m.b1.y = Var()
+        m.b1.c = Constraint(expr=m.b1.y == m.b1.a)
+        m.b2 = Block()
+        m.b2.w = Var()
+        m.z = Var()
+        m.b2.c = Constraint(expr=m.b2.w == 2 * m.z)
+        m.c = Constraint(expr=m.z == m.b1.y)
+
+        interval_initializer(m)
+        assert m.b2.w.value == pytest.approx(2, abs=1e-6)
+
+        # Bounds derived from the old value must not leak into the next call
+        m.b1.a.fix(3)
+        interval_initializer(m)
+        assert m.z.value == pytest.approx(3, abs=1e-6)
+        assert m.b2.w.value == pytest.approx(6, abs=1e-6)
@@ -0,0 +1,80 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import pickle
+
+import pytest
+
+from pyomo.environ import ConcreteModel, Var
+
+from watertap.core.util.model_cache import ModelTemplateCache, cache_model_template
+
+
+@cache_model_template(maxsize=2)
+def build(n, options=None):
+    m = ConcreteModel()
+    m.x = Var(range(n), initialize=0)
+    # stands in for an expensive initialization
+    for i in range(n):
+        m.x[i].set_value(i)
+    m.options = options
+    return m
+
+
+@pytest.mark.unit
+def test_invalid_maxsize():
+    with pytest.raises(ValueError, match="maxsize must be a positive integer"):
+        ModelTemplateCache(build.build_function, maxsize=0)
+
+
+@pytest.mark.unit
+def test_copies_are_independent():
+    build.clear()
+    m1 = build(3)
+    m2 = build(3)
+    assert build.misses == 1
+    assert build.hits == 1
+    assert m1 is not m2
+
+    m1.x[2].set_value(10)
+    assert m2.x[2].value == 2
+    assert build(3).x[2].value == 2
+
+
+@pytest.mark.unit
+def test_keys():
+    build.clear()
+    hits, misses = build.hits, build.misses
+    build(2, options={"a": [1]})
+    build(2, options={"a": [1]})
+    build(n=2, options={"a": [2]})
+    assert build.hits - hits == 1
+    assert build.misses - misses == 2
+    assert len(build) == 2
+
+    # least recently used template is discarded
+    build(4)
+    assert len(build) == 2
+    build(2, options={"a": [1]})
+    assert build.misses - misses == 4
+
+
+@pytest.mark.unit
+def test_pickle():
+    build(3)
+    assert pickle.loads(pickle.dumps(build)) is build
+
+    cache = ModelTemplateCache(ConcreteModel)
+    cache()
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy is not cache
+    assert len(copy) == 0
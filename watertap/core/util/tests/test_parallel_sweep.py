@@ -0,0 +1,136 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from pyomo.environ import ConcreteModel, Param, Var
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+
+from watertap.core.util.parallel_sweep import run_parallel_sweep
+
+
+def build():
+    m = ConcreteModel()
+    m.a = Var(initialize=1)
+    m.a.fix()
+    m.k = Param(initialize=2, mutable=True)
+    m.x = Var(initialize=0)
+    m.pid = Var(initialize=0)
+    return m
+
+
+def initialize(m):
+    m.x.set_value(-1)
+
+
+def solve(m):
+    if m.a.value < 0:
+        m.x.set_value(1e10)
+        raise RuntimeError("negative a")
+    # the solution depends on the starting point being the initialized one
+    assert m.x.value != 1e10
+    m.x.set_value(m.k.value * m.a.value)
+    m.pid.set_value(os.getpid())
+    results = SolverResults()
+    results.solver.status = SolverStatus.ok
+    results.solver.termination_condition = TerminationCondition.optimal
+    return results
+
+
+def get_pid(m):
+    return m.pid.value
+
+
+def get_inverse_k(m):
+    return 1 / m.k.value
+
+
+@pytest.mark.unit
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="processes must be a positive integer"):
+        run_parallel_sweep(build, {"a": [1]}, solve, processes=0)
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+        run_parallel_sweep(build, {"a": [1]}, solve, chunk_size=0)
+    with pytest.raises(ValueError, match="All sample columns must have the same"):
+        run_parallel_sweep(build, {"a": [1], "k": [1, 2]}, solve)
+
+
+@pytest.mark.unit
+def test_serial(tmp_path):
+    results_file = tmp_path / "results.csv"
+    results = run_parallel_sweep(
+        build,
+        {"a": [1, -1, 3], "k": [2, 2, 4]},
+        solve,
+        initialize_function=initialize,
+        outputs={"x": "x", "pid": get_pid},
+        results_file=str(results_file),
+    )
+
+    assert list(results["solve_successful"]) == [True, False, True]
+    assert results["x"][0] == 2
+    assert np.isnan(results["x"][1])
+    assert results["x"][2] == 12
+    assert list(results["pid"][[0, 2]]) == [os.getpid()] * 2
+    assert np.all(results["solve_time"] >= 0)
+
+    with open(results_file) as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["sample", "a", "k", "x", "pid", "solve_successful", "solve_time"]
+    assert [row[0] for row in rows[1:]] == ["0", "1", "2"]
+    assert rows[3][3] == "12.0"
+
+
+@pytest.mark.unit
+def test_output_failure():
+    results = run_parallel_sweep(
+        build,
+        {"k": [2, 0, 4]},
+        solve,
+        initialize_function=initialize,
+        outputs={"x": "x", "inverse_k": get_inverse_k},
+    )
+
+    # an output raising marks only its sample as failed
+    assert list(results["solve_successful"]) == [True, False, True]
+    assert np.isnan(results["x"][1]) and np.isnan(results["inverse_k"][1])
+    assert results["inverse_k"][2] == 0.25
+
+    with pytest.raises(KeyError, match="Could not find component y"):
+        run_parallel_sweep(build, {"k": [2]}, solve, outputs={"y": "y"})
+
+
+@pytest.mark.component
+def test_processes(tmp_path):
+    results_file = tmp_path / "results.csv"
+    a = np.linspace(-1, 1, 21)
+    results = run_parallel_sweep(
+        build,
+        {"a": a},
+        solve,
+        outputs={"x": "x", "pid": get_pid},
+        results_file=str(results_file),
+        processes=2,
+        chunk_size=3,
+    )
+
+    assert list(results["solve_successful"]) == list(a >= 0)
+    assert np.allclose(results["x"][a >= 0], 2 * a[a >= 0])
+    assert os.getpid() not in results["pid"]
+
+    with open(results_file) as f:
+        rows = list(csv.reader(f))
+    assert sorted(int(row[0]) for row in rows[1:]) == list(range(21))
@@ -0,0 +1,98 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import numpy as np
+import pytest
+
+from pyomo.environ import ConcreteModel, Constraint, Param, Var, exp, log, value
+import idaes.core.util.scaling as iscale
+
+from watertap.core.util.presolve import presolve_block, _SquareSystem
+
+
+def build_model():
+    # Monod kinetics of a CSTR with a product in equilibrium with the substrate
+    m = ConcreteModel()
+    m.flow = Param(initialize=0.5, mutable=True)
+    m.feed = Var(initialize=10)
+    m.feed.fix()
+    m.substrate = Var(initialize=1, bounds=(0, None))
+    m.biomass = Var(initialize=1, bounds=(0, None))
+    m.rate = Var(initialize=1)
+    m.log_product = Var(initialize=0)
+    m.eq_substrate = Constraint(expr=0 == m.flow * (m.feed - m.substrate) - 10 * m.rate)
+    m.eq_biomass = Constraint(expr=0 == -m.flow * m.biomass + 5 * m.rate)
+    m.eq_rate = Constraint(
+        expr=m.rate == 2 * m.substrate / (0.5 + m.substrate) * m.biomass / 10
+    )
+    m.eq_product = Constraint(expr=m.log_product == log(m.substrate) + 1)
+    return m
+
+
+@pytest.mark.unit
+def test_presolve_block():
+    m = build_model()
+    m.biomass.value = 3
+    iscale.set_scaling_factor(m.eq_rate, 10)
+    assert presolve_block(m)
+
+    for con in (m.eq_substrate, m.eq_biomass, m.eq_rate, m.eq_product):
+        assert value(con.body - con.upper) == pytest.approx(0, abs=1e-8)
+    # the steady state with a biomass, not the washout
+    assert value(m.substrate) == pytest.approx(0.5)
+    assert value(m.biomass) == pytest.approx(4.75)
+
+    # the parameters are read from the model
+    m.flow = 0.25
+    assert presolve_block(m)
+    assert value(m.substrate) == pytest.approx(1 / 6)
+
+
+@pytest.mark.unit
+def test_presolve_block_failure():
+    m = ConcreteModel()
+    m.x = Var(initialize=1, bounds=(0, None))
+    m.eq = Constraint(expr=exp(m.x) == 0.5)
+
+    assert not presolve_block(m)
+    # the values are left unchanged
+    assert m.x.value == 1
+
+
+@pytest.mark.unit
+def test_presolve_block_not_square():
+    m = build_model()
+    m.feed.unfix()
+    with pytest.raises(
+        ValueError,
+        match="The system of equations of unknown is not square: 4 equality "
+        "constraints in 5 unfixed variables.",
+    ):
+        presolve_block(m)
+
+
+@pytest.mark.unit
+def test_jacobian():
+    m = build_model()
+    system = _SquareSystem(m)
+    assert system.function.analytic
+    jac = system.jacobian(system.initial_point())
+
+    # the absolute value is not analytic, so forward differences are used
+    m.z = Var(initialize=2)
+    m.eq_z = Constraint(expr=abs(m.z) == m.biomass)
+    system = _SquareSystem(m)
+    assert not system.function.analytic
+    jac_fd = system.jacobian(system.initial_point())
+
+    np.testing.assert_allclose(jac_fd[:4, :4], jac, rtol=1e-6, atol=1e-8)
+    assert jac_fd[4, 4] == pytest.approx(1)
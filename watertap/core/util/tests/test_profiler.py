@@ -0,0 +1,160 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import json
+
+import pytest
+
+from pyomo.environ import ConcreteModel, Var
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from pyomo.opt.base.solvers import OptSolver
+from idaes.core import FlowsheetBlock, UnitModelBlockData, declare_process_block_class
+from idaes.core.util.exceptions import InitializationError
+
+from watertap.core.initialization_mixin import InitializationMixin
+from watertap.core.util.profiler import InitializationProfiler, parse_ipopt_output
+
+IPOPT_313_OUTPUT = """
+Number of Iterations....: 12
+
+Total CPU secs in IPOPT (w/o function evaluations)   =      0.021
+Total CPU secs in NLP function evaluations           =      0.004
+
+EXIT: Optimal Solution Found.
+"""
+
+IPOPT_314_OUTPUT = """
+Number of Iterations....: 7
+
+Number of objective function evaluations             = 8
+Total seconds in IPOPT                               = 0.015
+
+Timing Statistics:
+
+OverallAlgorithm....................:      0.015 (sys)      0.016 (wall)
+ Function Evaluations...............:      0.002 (sys)      0.003 (wall)
+
+EXIT: Optimal Solution Found.
+"""
+
+
+class FakeSolver(OptSolver):
+    def __init__(self, output=IPOPT_313_OUTPUT, optimal=True):
+        self.output = output
+        self.optimal = optimal
+
+    def solve(self, model, **kwargs):
+        self._log = self.output
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = (
+            TerminationCondition.optimal
+            if self.optimal
+            else TerminationCondition.infeasible
+        )
+        return results
+
+
+@declare_process_block_class("ToyUnit")
+class ToyUnitData(InitializationMixin, UnitModelBlockData):
+    def build(self):
+        super().build()
+        self.x = Var(initialize=0)
+
+    def initialize_build(self, solver=None, fail=False):
+        FakeSolver().solve(self)
+        FakeSolver(output=IPOPT_314_OUTPUT).solve(self)
+        if fail:
+            raise InitializationError("toy unit failed to initialize")
+
+
+def build():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.unit1 = ToyUnit()
+    m.fs.unit2 = ToyUnit()
+    return m
+
+
+@pytest.mark.unit
+def test_parse_ipopt_output():
+    assert parse_ipopt_output(IPOPT_313_OUTPUT) == {
+        "iterations": 12,
+        "solver_time": 0.021,
+        "evaluation_time": 0.004,
+    }
+    assert parse_ipopt_output(IPOPT_314_OUTPUT) == {
+        "iterations": 7,
+        "solver_time": 0.015,
+        "evaluation_time": 0.003,
+    }
+    assert parse_ipopt_output(None) == {
+        "iterations": None,
+        "solver_time": None,
+        "evaluation_time": None,
+    }
+
+
+@pytest.mark.unit
+def test_profile():
+    m = build()
+    with InitializationProfiler() as profiler:
+        m.fs.unit1.initialize()
+        FakeSolver(optimal=False).solve(m)
+        with pytest.raises(InitializationError):
+            m.fs.unit2.initialize(fail=True)
+
+    records = profiler.root.children
+    assert [(r.name, r.kind, r.success) for r in records] == [
+        ("fs.unit1", "initialize", True),
+        ("unknown", "solve", False),
+        ("fs.unit2", "initialize", False),
+    ]
+    # InitializationMixin.initialize and UnitModelBlockData.initialize are
+    # recorded once
+    unit1 = records[0]
+    assert [(r.name, r.kind, r.iterations) for r in unit1.children] == [
+        ("fs.unit1", "solve", 12),
+        ("fs.unit1", "solve", 7),
+    ]
+    assert unit1.total_iterations == 19
+    assert unit1.total_evaluation_time == pytest.approx(0.007)
+    assert unit1.time >= unit1.self_time >= 0
+    assert profiler.root.total_iterations == 50
+    assert all(r.block is None for r in records)
+
+    data = json.loads(profiler.to_json())
+    assert data["children"][0]["children"][1]["evaluation_time"] == 0.003
+
+    report = profiler.report()
+    assert "  fs.unit1" in report
+    assert "FAILED" in report
+    assert "50 solver iterations" in report
+
+
+@pytest.mark.unit
+def test_restored():
+    initialize = UnitModelBlockData.__dict__["initialize"]
+    solve = FakeSolver.__dict__["solve"]
+    profiler = InitializationProfiler()
+    with profiler:
+        assert UnitModelBlockData.__dict__["initialize"] is not initialize
+        with pytest.raises(RuntimeError, match="already active"):
+            with InitializationProfiler():
+                pass
+    assert UnitModelBlockData.__dict__["initialize"] is initialize
+    assert FakeSolver.__dict__["solve"] is solve
+
+    # nothing is recorded outside the context
+    m = build()
+    m.fs.unit1.initialize()
+    assert profiler.root.children == []
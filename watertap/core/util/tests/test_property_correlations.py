@@ -0,0 +1,71 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+import pytest
+
+from pyomo.environ import ConcreteModel, Var, units as pyunits, value
+from pyomo.util.check_units import assert_units_equivalent
+from pyomo.core.expr.visitor import identify_variables
+
+from watertap.core.util.property_correlations import (
+    correlation_coefficients,
+    horner,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "coefficients",
+    [[2.0], [1.0, -3.0], [0.5, 0, 0, 4.0], [0, 0, 2.0], [1.5, 2.0, 0, -0.25, 0]],
+)
+def test_horner(coefficients):
+    m = ConcreteModel()
+    m.x = Var(initialize=1.7)
+    expr = horner(m.x, coefficients)
+    expected = sum(c * 1.7**i for i, c in enumerate(coefficients))
+    assert value(expr) == pytest.approx(expected, rel=1e-14)
+    assert horner(1.7, coefficients) == pytest.approx(expected, rel=1e-14)
+
+
+@pytest.mark.unit
+def test_horner_zero():
+    assert horner(2.0, []) == 0
+    assert horner(2.0, [0, 0]) == 0
+
+
+@pytest.mark.unit
+def test_horner_expression_coefficients():
+    m = ConcreteModel()
+    m.x = Var(initialize=2.0)
+    m.y = Var(initialize=3.0)
+    expr = horner(m.x, [m.y, 0, m.y**2])
+    assert value(expr) == pytest.approx(3.0 + 9.0 * 4.0)
+    assert {v.name for v in identify_variables(expr)} == {"x", "y"}
+
+
+@pytest.mark.unit
+def test_correlation_coefficients():
+    m = ConcreteModel()
+    m.a = Var(initialize=2.0)
+    m.b = Var(initialize=-0.5)
+    m.c = Var(initialize=4.0, units=pyunits.kg / pyunits.m**3)
+    assert [value(c) for c in correlation_coefficients(m.a, m.b, m.c)] == [
+        2.0,
+        -0.5,
+        4.0,
+    ]
+    coefficients = correlation_coefficients(m.a, m.b, m.c, scale=10)
+    assert [value(c) for c in coefficients] == [20.0, -5.0, 40.0]
+    assert_units_equivalent(coefficients[2], pyunits.dimensionless)
+
+    # coefficients follow later changes to the parameters
+    m.c.set_value(5.0)
+    assert value(coefficients[2]) == 50.0
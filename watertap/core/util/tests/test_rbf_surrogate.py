@@ -0,0 +1,145 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import os
+
+import numpy as np
+import pytest
+
+from pyomo.environ import ConcreteModel, Var, value
+from idaes.core.surrogate.pysmo_surrogate import PysmoSurrogate
+
+from watertap.core.util.rbf_surrogate import (
+    RBFSurrogate,
+    build_rbf_surrogate,
+    load_rbf_surrogate,
+)
+from watertap.unit_models.surrogate_crystallizer import (
+    _DEFAULT_SURROGATE_PATH,
+    load_default_surrogate,
+)
+
+pd = pytest.importorskip("pandas", reason="pandas not available")
+
+names = ["Vapor_Pressure", "Calcite_g", "Anhydrite_g", "Glauberite_g", "Halite_g"]
+
+points = np.array([[303.15, 30.0], [313.15, 60.0], [350.0, 90.0], [372.15, 98.0]])
+
+
+@pytest.mark.unit
+def test_load_cached():
+    surrogate = load_default_surrogate("Halite_g")
+    assert load_default_surrogate("Halite_g") is surrogate
+    path = os.path.join(_DEFAULT_SURROGATE_PATH, "Halite_g.json")
+    assert load_rbf_surrogate(path) is surrogate
+    assert surrogate.input_labels == ["Temperature", "Evaporation percent"]
+    assert surrogate.output_label == "Halite_g"
+    assert surrogate.n_centres == 75
+    assert not surrogate.weights.flags.writeable
+
+
+@pytest.mark.unit
+def test_invalid():
+    with pytest.raises(ValueError, match="Unsupported basis function"):
+        RBFSurrogate([[0]], [1], [0], [1], [0], [1], "quartic")
+    with pytest.raises(ValueError, match="Expected an RBF surrogate"):
+        RBFSurrogate.from_dict({"surrogate_type": "poly"})
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("name", names)
+def test_evaluate(name):
+    surrogate = load_default_surrogate(name)
+    pysmo = PysmoSurrogate.load_from_file(
+        os.path.join(_DEFAULT_SURROGATE_PATH, f"{name}.json")
+    )
+    expected = pysmo.evaluate_surrogate(
+        pd.DataFrame(points, columns=pysmo.input_labels())
+    ).values.ravel()
+    assert surrogate.evaluate(points) == pytest.approx(
+        expected, rel=1e-10, abs=1e-9 * (surrogate.y_max - surrogate.y_min)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("basis_function", RBFSurrogate.basis_functions)
+def test_gradient(basis_function):
+    rng = np.random.default_rng(1)
+    surrogate = RBFSurrogate(
+        centres=rng.uniform(size=(5, 2)),
+        weights=rng.normal(size=5),
+        x_min=[300, 0],
+        x_max=[400, 100],
+        y_min=-2,
+        y_max=3,
+        basis_function=basis_function,
+        sigma=1.5,
+    )
+    x = np.array([[320, 30], [390, 80]], dtype=float)
+    gradient = surrogate.gradient(x)
+    for j, step in enumerate([1e-4, 1e-4]):
+        dx = np.zeros(2)
+        dx[j] = step
+        fd = (surrogate.evaluate(x + dx) - surrogate.evaluate(x - dx)) / (2 * step)
+        assert gradient[:, j] == pytest.approx(fd, rel=1e-5, abs=1e-9)
+
+
+@pytest.mark.unit
+def test_reduce():
+    surrogate = load_default_surrogate("Calcite_g")
+    assert surrogate.reduce(100) is surrogate
+    with pytest.raises(ValueError, match="n_centres must be a positive integer"):
+        surrogate.reduce(0)
+
+    reduced = surrogate.reduce(60)
+    assert reduced.n_centres == 60
+    error = np.abs(reduced.evaluate(points) - surrogate.evaluate(points))
+    assert np.all(error <= 0.01 * (surrogate.y_max - surrogate.y_min))
+
+
+@pytest.mark.unit
+def test_build_expression():
+    surrogate = load_default_surrogate("Halite_g")
+    m = ConcreteModel()
+    m.T = Var(initialize=313.15)
+    m.E = Var(initialize=60)
+    m.y = Var()
+    build_rbf_surrogate(m, surrogate, [m.T, m.E], m.y)
+
+    assert m.T.bounds == (303.15, 372.15)
+    assert m.E.bounds == (30, 98)
+    m.y.set_value(0)
+    assert -value(m.rbf_constraint.body) == pytest.approx(
+        surrogate.evaluate([313.15, 60])[0], rel=1e-12
+    )
+
+
+@pytest.mark.unit
+def test_build_grey_box():
+    surrogate = load_default_surrogate("Halite_g")
+    m = ConcreteModel()
+    m.T = Var(initialize=313.15)
+    m.E = Var(initialize=60)
+    m.y = Var()
+    build_rbf_surrogate(
+        m, surrogate, [m.T, m.E], m.y, use_grey_box=True, use_surrogate_bounds=False
+    )
+    assert m.T.bounds == (None, None)
+    assert m.grey_box.outputs["y"].value == pytest.approx(
+        surrogate.evaluate([313.15, 60])[0]
+    )
+
+    model = m.grey_box.get_external_model()
+    model.set_input_values(np.array([313.15, 60]))
+    assert model.evaluate_outputs() == pytest.approx(surrogate.evaluate([313.15, 60]))
+    jac = model.evaluate_jacobian_outputs().toarray()
+    assert jac == pytest.approx(surrogate.gradient([313.15, 60]))
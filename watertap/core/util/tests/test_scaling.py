@@ -10,10 +10,12 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+import numpy as np
 import pytest
 import pyomo.environ as pyo
 
 from pyomo.environ import ConcreteModel
+from pyomo.contrib.pynumero.asl import AmplInterface
 
 from idaes.core import FlowsheetBlock
 from idaes.core.util.scaling import (
@@ -22,6 +24,11 @@ from idaes.core.util.scaling import (
 )
 import idaes.core.util.scaling as iscale
 from watertap.core.solvers import get_solver
+from watertap.core.util.scaling import (
+    calculate_jacobian_scaling_factors,
+    _get_jacobian_pynumero,
+    _get_jacobian_python,
+)
 
 import watertap.property_models.NaCl_prop_pack as props
 
@@ -145,3 +152,68 @@ class TestScaling:
             "If there was a property constraint written for the variable"
             not in caplog.text
         )
+
+
+class TestJacobianScaling:
+    @staticmethod
+    def build():
+        m = ConcreteModel()
+        m.x = pyo.Var(initialize=1e3)
+        m.y = pyo.Var(initialize=1e-4)
+        m.z = pyo.Var(initialize=2)
+        m.z.fix()
+        m.c1 = pyo.Constraint(expr=1e5 * m.x + 3e9 * m.y == m.z)
+        m.c2 = pyo.Constraint(expr=m.x * m.y == 0.1)
+        return m
+
+    @staticmethod
+    def scaled_jacobian(m):
+        jac, constraints, variables = _get_jacobian_python(m)
+        row = np.array([iscale.get_scaling_factor(c, default=1) for c in constraints])
+        col = np.array([iscale.get_scaling_factor(v, default=1) for v in variables])
+        return abs(jac.toarray()) * row[:, None] / col[None, :]
+
+    @pytest.mark.unit
+    def test_equilibrate(self):
+        m = self.build()
+        assert self.scaled_jacobian(m).max() / self.scaled_jacobian(m).min() > 1e8
+
+        calculate_jacobian_scaling_factors(m, tolerance=1e-3, max_iter=100)
+        jac = self.scaled_jacobian(m)
+        assert jac.max(axis=0) == pytest.approx(1, rel=1e-2)
+        assert jac.max(axis=1) == pytest.approx(1, rel=1e-2)
+        assert iscale.get_scaling_factor(m.z) is None
+
+    @pytest.mark.unit
+    def test_existing_factors(self):
+        m = self.build()
+        iscale.set_scaling_factor(m.x, 10)
+        calculate_jacobian_scaling_factors(m, scale_constraints=False)
+        assert iscale.get_scaling_factor(m.x) == 10
+        assert iscale.get_scaling_factor(m.y) is not None
+        assert iscale.get_scaling_factor(m.c1) is None
+
+        calculate_jacobian_scaling_factors(m, overwrite=True)
+        assert iscale.get_scaling_factor(m.x) != 10
+        assert iscale.get_scaling_factor(m.c1) is not None
+
+    @pytest.mark.unit
+    def test_limits(self):
+        m = self.build()
+        constraint_sf, variable_sf = calculate_jacobian_scaling_factors(
+            m, min_scale=1e-2, max_scale=1e2
+        )
+        assert np.all(constraint_sf >= 1e-2) and np.all(constraint_sf <= 1e2)
+        assert np.all(variable_sf >= 1e-2) and np.all(variable_sf <= 1e2)
+
+    @pytest.mark.component
+    @pytest.mark.skipif(not AmplInterface.available(), reason="PyNumero not available")
+    def test_pynumero_jacobian(self):
+        m = self.build()
+        jac, constraints, variables = _get_jacobian_pynumero(m)
+        expected, expected_constraints, expected_variables = _get_jacobian_python(m)
+        position = {id(v): i for i, v in enumerate(expected_variables)}
+        order = [position[id(v)] for v in variables]
+        assert [c.name for c in constraints] == [c.name for c in expected_constraints]
+        assert jac.toarray() == pytest.approx(expected.toarray()[:, order])
+        assert m.component("objective") is None
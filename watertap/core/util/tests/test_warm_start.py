@@ -0,0 +1,134 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import pytest
+
+from pyomo.environ import ConcreteModel, Constraint, Var
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from parameter_sweep import LinearSample
+
+from watertap.core.util.warm_start import WarmStartCache, add_warm_start_suffixes
+
+
+def build_model():
+    m = ConcreteModel()
+    m.a = Var(initialize=1)
+    m.a.fix()
+    m.b = Var(initialize=1)
+    m.b.fix()
+    m.x = Var(initialize=0)
+    m.y = Var(initialize=0)
+    m.c1 = Constraint(expr=m.x == m.a + m.b)
+    m.c2 = Constraint(expr=m.y == m.a * m.b)
+    return m
+
+
+def fake_solve(m, optimal=True):
+    # "solve" the model, recording where it was started from
+    m.start = (m.x.value, m.y.value)
+    results = SolverResults()
+    results.solver.status = SolverStatus.ok
+    if optimal:
+        m.x.set_value(m.a.value + m.b.value)
+        m.y.set_value(m.a.value * m.b.value)
+        results.solver.termination_condition = TerminationCondition.optimal
+        if m.component("dual") is not None:
+            m.dual[m.c1] = m.a.value
+            m.ipopt_zL_out[m.x] = m.b.value
+    else:
+        m.x.set_value(-999)
+        m.y.set_value(-999)
+        results.solver.termination_condition = TerminationCondition.infeasible
+    return results
+
+
+@pytest.mark.unit
+def test_load_nearest():
+    m = build_model()
+    cache = WarmStartCache(m, {"a": m.a, "b": m.b}, scale={"a": 1, "b": 10})
+
+    assert cache.load_nearest() is None
+
+    for a, b in [(1, 10), (2, 10), (1, 20)]:
+        m.a.fix(a)
+        m.b.fix(b)
+        fake_solve(m)
+        cache.store()
+    assert len(cache) == 3
+
+    m.x.set_value(0)
+    m.y.set_value(0)
+    m.a.fix(1.9)
+    m.b.fix(11)
+    assert cache.load_nearest() == pytest.approx(((0.1) ** 2 + 0.1**2) ** 0.5)
+    assert m.x.value == 12
+    assert m.y.value == 20
+    # fixed variables are not changed
+    assert m.a.value == 1.9
+    assert m.b.value == 11
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.unit
+def test_query_tree():
+    m = build_model()
+    cache = WarmStartCache(m, {"a": LinearSample(m.a, 0, 100, 101)})
+
+    for a in range(100):
+        m.a.fix(a)
+        cache.store()
+        assert cache.query([a + 0.2])[0] == a
+    assert cache._tree_size > 0
+    assert cache.query([42.6]) == (43, pytest.approx(0.004))
+
+
+@pytest.mark.unit
+def test_wrap():
+    m = build_model()
+    add_warm_start_suffixes(m)
+    cache = WarmStartCache(m, {"a": m.a})
+    solve = cache.wrap(fake_solve)
+
+    m.a.fix(2)
+    solve(m)
+    assert m.start == (0, 0)
+    assert len(cache) == 1
+
+    # failed solves are not stored
+    m.a.fix(3)
+    solve(m, optimal=False)
+    assert m.start == (3, 2)
+    assert len(cache) == 1
+
+    # the next sample starts from the stored solution, not the failed one
+    m.a.fix(4)
+    solve(m)
+    assert m.start == (3, 2)
+    assert m.dual[m.c1] == 4
+    assert m.ipopt_zL_in[m.x] == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.unit
+def test_rebuilt_model():
+    m = build_model()
+    cache = WarmStartCache(m, {"a": m.a})
+    m.a.fix(5)
+    fake_solve(m)
+    cache.store()
+
+    m2 = build_model()
+    m2.a.fix(5)
+    cache.load_nearest(m2)
+    assert m2.x.value == 6
+    assert m2.y.value == 5
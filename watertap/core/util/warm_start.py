@@ -0,0 +1,285 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a store of converged solutions used to warm-start repeated
+solves of a flowsheet, e.g. in a parameter sweep.
+"""
+
+import functools
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from pyomo.environ import check_optimal_termination, Constraint, Suffix, Var, value
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# Suffixes read after a solve, and the suffixes their values are loaded into
+_SUFFIXES = {
+    "dual": "dual",
+    "ipopt_zL_out": "ipopt_zL_in",
+    "ipopt_zU_out": "ipopt_zU_in",
+}
+
+
+def add_warm_start_suffixes(model):
+    """
+    Add the Suffixes used by IPOPT to import and export duals and bound
+    multipliers, if not already present. IPOPT only uses the exported values
+    if the solver option ``warm_start_init_point`` is set to ``"yes"``.
+
+    Args:
+        model: Pyomo model
+
+    Returns:
+        None
+    """
+    directions = {
+        "dual": Suffix.IMPORT_EXPORT,
+        "ipopt_zL_out": Suffix.IMPORT,
+        "ipopt_zU_out": Suffix.IMPORT,
+        "ipopt_zL_in": Suffix.EXPORT,
+        "ipopt_zU_in": Suffix.EXPORT,
+    }
+    for name, direction in directions.items():
+        if model.component(name) is None:
+            model.add_component(name, Suffix(direction=direction))
+
+
+def _get_scale(sample):
+    """
+    Get the range used to normalize a sweep parameter from its sample object.
+    """
+    if hasattr(sample, "lower_limit") and hasattr(sample, "upper_limit"):
+        scale = abs(sample.upper_limit - sample.lower_limit)
+    elif hasattr(sample, "values"):
+        scale = np.ptp(np.asarray(sample.values, dtype=float))
+    elif hasattr(sample, "sd"):
+        scale = sample.sd
+    else:
+        scale = 0.0
+    return scale
+
+
+class WarmStartCache:
+    """
+    Store of converged solutions of a model, indexed by the values of the
+    sweep parameters they were solved at.
+
+    After each successful solve the values of all variables, and any duals and
+    bound multipliers imported by the solver (see ``add_warm_start_suffixes``),
+    are stored. Before a solve, the stored solution nearest to the current
+    sweep parameters (by Euclidean distance of the normalized parameters,
+    found with a KD-tree) is loaded into the unfixed variables of the model.
+    """
+
+    def __init__(self, model, sweep_params, scale=None):
+        """
+        Args:
+            model: Pyomo model being solved
+            sweep_params: dict mapping names to sweep parameters, either as
+                parameter_sweep sample objects or Pyomo components
+            scale: (optional) dict mapping names of sweep parameters to the
+                ranges used to normalize them. By default this is taken from
+                the limits or values of sample objects, or else the magnitude
+                of the first value stored.
+        """
+        if scale is None:
+            scale = {}
+        self._param_names = []
+        self._scale = []
+        for name, param in sweep_params.items():
+            if hasattr(param, "pyomo_object"):
+                component = param.pyomo_object
+                default_scale = _get_scale(param)
+            else:
+                component = param
+                default_scale = 0.0
+            self._param_names.append(component.name)
+            self._scale.append(scale.get(name, default_scale))
+        self._scale = np.array(self._scale, dtype=float)
+
+        self._model = None
+        self._bind(model)
+
+        self._coordinates = []
+        self._snapshots = []
+        self._tree = None
+        self._tree_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def _bind(self, model):
+        """
+        Collect the components of model that are stored and loaded. Models
+        rebuilt by the same function have the same components in the same
+        order, so snapshots can be loaded into a rebuilt model.
+        """
+        if model is self._model:
+            return
+        self._model = model
+        self._params = [model.find_component(name) for name in self._param_names]
+        self._variables = list(model.component_data_objects(Var, descend_into=True))
+        self._constraints = list(
+            model.component_data_objects(Constraint, active=True, descend_into=True)
+        )
+
+    def get_coordinates(self):
+        """
+        Get the current values of the sweep parameters.
+
+        Returns:
+            numpy array of sweep parameter values
+        """
+        return np.array([value(p) for p in self._params], dtype=float)
+
+    def store(self, model=None):
+        """
+        Store the current solution of the model at the current sweep
+        parameters.
+
+        Args:
+            model: (optional) model to store, if not the model this cache was
+                created with (e.g. after the model was rebuilt)
+
+        Returns:
+            None
+        """
+        if model is not None:
+            self._bind(model)
+        coordinates = self.get_coordinates()
+        if not np.all(np.isfinite(coordinates)):
+            return
+
+        # Default scaling by the magnitude of the first point stored
+        unscaled = ~(self._scale > 0)
+        if np.any(unscaled):
+            self._scale[unscaled] = np.maximum(np.abs(coordinates[unscaled]), 1.0)
+
+        snapshot = {
+            "values": np.array([v.value for v in self._variables], dtype=float),
+        }
+        for name in _SUFFIXES:
+            suffix = self._model.component(name)
+            if suffix is not None and len(suffix) > 0:
+                components = self._constraints if name == "dual" else self._variables
+                snapshot[name] = np.array(
+                    [suffix.get(c, np.nan) for c in components], dtype=float
+                )
+
+        self._coordinates.append(coordinates / self._scale)
+        self._snapshots.append(snapshot)
+
+    def query(self, coordinates=None):
+        """
+        Find the stored solution nearest to the given sweep parameters.
+
+        Args:
+            coordinates: (optional) values of the sweep parameters (default:
+                the current values in the model)
+
+        Returns:
+            tuple of (index, distance) of the nearest stored solution, or
+            None if nothing has been stored
+        """
+        if not self._snapshots:
+            return None
+        if coordinates is None:
+            coordinates = self.get_coordinates()
+        point = np.asarray(coordinates, dtype=float) / self._scale
+
+        # The tree is rebuilt once the points added since it was built
+        # outnumber those in it; newer points are searched directly
+        num_points = len(self._coordinates)
+        if num_points - self._tree_size > max(16, self._tree_size):
+            self._tree = cKDTree(np.array(self._coordinates))
+            self._tree_size = num_points
+
+        best = (None, np.inf)
+        if self._tree is not None:
+            distance, index = self._tree.query(point)
+            best = (int(index), float(distance))
+        if self._tree_size < num_points:
+            pending = np.array(self._coordinates[self._tree_size :])
+            distances = np.linalg.norm(pending - point, axis=1)
+            index = int(np.argmin(distances))
+            if distances[index] < best[1]:
+                best = (self._tree_size + index, float(distances[index]))
+        return best
+
+    def load_nearest(self, model=None):
+        """
+        Load the stored solution nearest to the current sweep parameters into
+        the unfixed variables of the model, and any stored duals and bound
+        multipliers into the Suffixes exported to the solver.
+
+        Args:
+            model: (optional) model to load into, if not the model this cache
+                was created with (e.g. after the model was rebuilt)
+
+        Returns:
+            normalized distance to the solution loaded, or None if nothing has
+            been stored
+        """
+        if model is not None:
+            self._bind(model)
+        nearest = self.query()
+        if nearest is None:
+            self.misses += 1
+            return None
+        index, distance = nearest
+        snapshot = self._snapshots[index]
+        self.hits += 1
+
+        for v, val in zip(self._variables, snapshot["values"]):
+            if not v.fixed and not np.isnan(val):
+                v.set_value(float(val), skip_validation=True)
+
+        for name, target in _SUFFIXES.items():
+            suffix = self._model.component(target)
+            if suffix is None or name not in snapshot:
+                continue
+            components = self._constraints if name == "dual" else self._variables
+            for c, val in zip(components, snapshot[name]):
+                if not np.isnan(val):
+                    suffix[c] = float(val)
+
+        _log.debug(f"Loaded warm start at normalized distance {distance:.3e}")
+        return distance
+
+    def wrap(self, optimize_function):
+        """
+        Wrap a function solving the model so that each solve is warm started
+        from the nearest stored solution, and successful solves are stored.
+
+        Args:
+            optimize_function: function called as optimize_function(model,
+                *args, **kwargs) and returning solver results, e.g. the
+                optimize_function of a parameter sweep
+
+        Returns:
+            wrapped function with the same signature
+        """
+
+        @functools.wraps(optimize_function)
+        def warm_started(model, *args, **kwargs):
+            self.load_nearest(model)
+            results = optimize_function(model, *args, **kwargs)
+            if check_optimal_termination(results):
+                self.store(model)
+            return results
+
+        return warm_started
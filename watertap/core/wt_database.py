@@ -13,9 +13,59 @@
 This module contains the base class for interacting with WaterTAP data files
 with zero-order model parameter data.
 """
+import logging
 import os
+import pickle
+import threading
+
 import yaml
-from copy import deepcopy
+
+# Prefer the libyaml-based loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CLoader", yaml.Loader)
+
+_log = logging.getLogger(__name__)
+
+# Version of the compiled cache file format written by Database.preload
+_COMPILED_CACHE_VERSION = 1
+
+
+class ReadOnlyDict(dict):
+    """
+    Dict that cannot be modified after construction.
+
+    Used for parameter data returned by the Database, so that data can be shared
+    between all callers without copying it.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Database parameter data is read-only.")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+def _freeze(data):
+    """
+    Recursively convert dicts in data to ReadOnlyDicts.
+    """
+    if isinstance(data, dict):
+        return ReadOnlyDict((k, _freeze(v)) for k, v in data.items())
+    return data
 
 
 class Database:
@@ -32,8 +82,12 @@ class Database:
         an instance of a Database object linked to the provided database
     """
 
+    _shared_instances = {}
+    _shared_lock = threading.Lock()
+
     def __init__(self, dbpath=None):
         self._cached_files = {}
+        self._file_mtimes = {}
 
         if dbpath is None:
             self._dbpath = os.path.join(
@@ -75,14 +129,10 @@ class Database:
         else:
             # Else load data from required file
             try:
-                with open(os.path.join(self._dbpath, "water_sources.yaml"), "r") as f:
-                    lines = f.read()
-                    f.close()
+                source_data = self._load_file("water_sources")
             except OSError:
                 raise KeyError("Could not find water_sources.yaml in database.")
 
-            source_data = yaml.load(lines, yaml.Loader)
-
             # Store data in cache and return
             self._cached_files["water_sources"] = source_data
 
@@ -131,7 +181,7 @@ class Database:
                       provided, the default parameters are used instead.
 
         Returns:
-            dict of parameters for technology and subtype
+            read-only dict of parameters for technology and subtype
 
         Raises:
             KeyError if technology or subtype could not be found in database
@@ -139,13 +189,14 @@ class Database:
         """
         params = self._get_technology(technology)
 
-        # Get default parameter set
-        sparams = deepcopy(params["default"])
-
         if subtype is None:
-            # Return default values
-            pass
-        elif isinstance(subtype, str):
+            # Return default values, which are already read-only
+            return params["default"]
+
+        # Parameter values are read-only, so a shallow copy is sufficient
+        sparams = dict(params["default"])
+
+        if isinstance(subtype, str):
             try:
                 sparams.update(params[subtype])
             except KeyError:
@@ -161,7 +212,7 @@ class Database:
                     # Note that this will overwrite previous parameters if
                     # there is overlap, so we might need to be careful in use.
                     try:
-                        sparams.update(deepcopy(params[s]))
+                        sparams.update(params[s])
                     except KeyError:
                         raise KeyError(
                             f"Received unrecognised subtype {s} for "
@@ -173,13 +224,119 @@ class Database:
                     f"or list like."
                 )
 
-        return sparams
+        return ReadOnlyDict(sparams)
 
     def flush_cache(self):
         """
         Method to flush cached files in database object.
         """
         self._cached_files = {}
+        self._file_mtimes = {}
+
+    def preload(self, cache_file=None):
+        """
+        Method to load all files in the database folder into the cache.
+
+        Files already in the cache are only re-read if their modification time
+        has changed since they were loaded.
+
+        Args:
+            cache_file - (optional) path to a compiled (pickled) copy of the
+                         database. Entries in it are used for any file whose
+                         modification time is unchanged, and the file is
+                         rewritten if any file had to be parsed.
+
+        Returns:
+            None
+        """
+        mtimes = {}
+        for f in os.listdir(self._dbpath):
+            if f.endswith(".yaml"):
+                mtimes[f[:-5]] = os.stat(os.path.join(self._dbpath, f)).st_mtime_ns
+
+        compiled = self._read_compiled_cache(cache_file)
+
+        parsed = False
+        for name, mtime in mtimes.items():
+            if name in compiled["mtimes"] and compiled["mtimes"][name] == mtime:
+                data = compiled["data"][name]
+                self._file_mtimes[name] = mtime
+            elif self._file_mtimes.get(name) == mtime and self._is_loaded(name):
+                continue
+            else:
+                data = self._load_file(name)
+                parsed = True
+
+            if name == "component_list":
+                self._component_list = data
+            else:
+                self._cached_files[name] = data
+
+        # Drop entries for files that no longer exist
+        for name in list(self._cached_files):
+            if name not in mtimes:
+                del self._cached_files[name]
+                self._file_mtimes.pop(name, None)
+
+        if cache_file is not None and (parsed or compiled["mtimes"] != mtimes):
+            self._write_compiled_cache(cache_file, mtimes)
+
+    @classmethod
+    def shared(cls, dbpath=None):
+        """
+        Method to get a preloaded Database shared by the whole process.
+
+        Args:
+            dbpath - (optional) path to database folder containing yaml files
+
+        Returns:
+            the Database instance for dbpath, created and preloaded on first use
+        """
+        key = None if dbpath is None else os.path.realpath(dbpath)
+        with cls._shared_lock:
+            if key not in cls._shared_instances:
+                db = cls(dbpath)
+                db.preload()
+                cls._shared_instances[key] = db
+            return cls._shared_instances[key]
+
+    def _is_loaded(self, name):
+        if name == "component_list":
+            return self._component_list is not None
+        return name in self._cached_files
+
+    def _read_compiled_cache(self, cache_file):
+        compiled = {"mtimes": {}, "data": {}}
+        if cache_file is None or not os.path.isfile(cache_file):
+            return compiled
+        try:
+            with open(cache_file, "rb") as f:
+                content = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as err:
+            _log.warning(f"Ignoring unreadable database cache {cache_file}: {err}")
+            return compiled
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != _COMPILED_CACHE_VERSION
+        ):
+            return compiled
+        return content
+
+    def _write_compiled_cache(self, cache_file, mtimes):
+        data = dict(self._cached_files)
+        data["component_list"] = self._component_list
+        content = {
+            "version": _COMPILED_CACHE_VERSION,
+            "mtimes": mtimes,
+            "data": {k: v for k, v in data.items() if k in mtimes},
+        }
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as err:
+            _log.warning(f"Could not write database cache {cache_file}: {err}")
 
     @property
     def component_list(self):
@@ -197,14 +354,10 @@ class Database:
         else:
             # Else load data from required file
             try:
-                with open(os.path.join(self._dbpath, technology + ".yaml"), "r") as f:
-                    lines = f.read()
-                    f.close()
+                fdata = self._load_file(technology)
             except OSError:
                 raise KeyError(f"Could not find entry for {technology} in database.")
 
-            fdata = yaml.load(lines, yaml.Loader)
-
             # Store data in cache and return
             self._cached_files[technology] = fdata
             return fdata
@@ -218,10 +371,30 @@ class Database:
             None
         """
         try:
-            with open(os.path.join(self._dbpath, "component_list.yaml"), "r") as f:
-                lines = f.read()
-                f.close()
+            self._component_list = self._load_file("component_list")
         except OSError:
             raise KeyError("Could not find component_list.yaml in database.")
 
-        self._component_list = yaml.load(lines, yaml.Loader)
+    def _load_file(self, name):
+        """
+        Parse a yaml file in the database folder and record its modification
+        time.
+
+        Args:
+            name - name of file, without the .yaml extension
+
+        Returns:
+            dict of file contents, with read-only values
+
+        Raises:
+            OSError if file could not be read
+        """
+        fpath = os.path.join(self._dbpath, name + ".yaml")
+        with open(fpath, "r") as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            fdata = yaml.load(f.read(), _YamlLoader)
+
+        self._file_mtimes[name] = mtime
+
+        # Keep the top level mutable so entries can be added or replaced
+        return {k: _freeze(v) for k, v in fdata.items()}
@@ -13,6 +13,8 @@
 This module contains the base class for all zero order unit models.
 """
 
+from functools import lru_cache
+
 from idaes.core import UnitModelBlockData, useDefault, declare_process_block_class
 from idaes.core.util.config import is_physical_parameter_block
 import idaes.logger as idaeslog
@@ -30,6 +32,31 @@ __author__ = "Andrew Lee, Adam Atia"
 _log = idaeslog.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_units(units):
+    """
+    Resolve a units string from the database to a Pyomo units object.
+    """
+    return getattr(pyo.units, units)
+
+
+# Conversion factors between units, keyed by the string form of the units
+_conversion_factors = {}
+
+
+def _get_conversion(from_units, to_units):
+    """
+    Get the factor converting values in from_units to to_units.
+    """
+    key = (str(from_units), str(to_units))
+    try:
+        return _conversion_factors[key]
+    except KeyError:
+        factor = pyo.value(pyo.units.convert(1 * from_units, to_units=to_units))
+        _conversion_factors[key] = factor
+        return factor
+
+
 @declare_process_block_class("ZeroOrderBase")
 class ZeroOrderBaseData(UnitModelBlockData):
     """
@@ -219,7 +246,7 @@ class ZeroOrderBaseData(UnitModelBlockData):
             self.set_recovery_and_removal(pdict, use_default_removal)
 
         for v in self._fixed_perf_vars:
-            self.set_param_from_data(v, pdict)
+            self.set_params_from_data(v, pdict)
 
     def set_recovery_and_removal(self, data, use_default_removal=False):
         """
@@ -236,20 +263,19 @@ class ZeroOrderBaseData(UnitModelBlockData):
             None
         """
         try:
-            self.set_param_from_data(self.recovery_frac_mass_H2O, data)
+            self.set_params_from_data(self.recovery_frac_mass_H2O, data)
         except KeyError:
             if self.recovery_frac_mass_H2O[:].fixed:
                 pass
             else:
                 raise
 
-        for t, j in self.removal_frac_mass_comp:
-            self.set_param_from_data(
-                self.removal_frac_mass_comp[t, j],
-                data,
-                index=j,
-                use_default_removal=use_default_removal,
-            )
+        self.set_params_from_data(
+            self.removal_frac_mass_comp,
+            data,
+            index_position=-1,
+            use_default_removal=use_default_removal,
+        )
 
     def set_param_from_data(
         self, parameter, data, index=None, use_default_removal=False
@@ -273,9 +299,79 @@ class ZeroOrderBaseData(UnitModelBlockData):
             KeyError if values cannot be found for parameter in data dict
 
         """
+        pname = parameter.parent_component().local_name
+        val, units = self._get_param_data(pname, data, index, use_default_removal)
+
+        parameter.fix(val * units)
+        _log.info_high(f"{parameter.name} fixed to value {val} {str(units)}")
+
+    def set_params_from_data(
+        self, parameter, data, index_position=None, use_default_removal=False
+    ):
+        """
+        Bulk method for fixing all elements of a parameter to values from a
+        dict of data returned from a database.
+
+        Each database entry is looked up and converted to the units of the
+        parameter only once, and the resulting values are then set on all
+        elements of the parameter in a single pass.
 
+        Args:
+            parameter - a Pyomo Var to be fixed to values from database
+            data - dict of parameter values from database
+            index_position - (optional) position within the indices of
+                             parameter of the index used to look up values in
+                             the database (e.g. -1 for removal_frac_mass_comp
+                             indexed by time and component). If None, the
+                             same value is used for all elements.
+            use_default_removal - (optional) indicate whether to use defined
+                                  default removal fraction if no specific value
+                                  defined in database
+
+        Returns:
+            None
+
+        Raises:
+            KeyError if values cannot be found for parameter in data dict
+
+        """
         pname = parameter.parent_component().local_name
+        to_units = pyo.units.get_units(parameter)
+
+        converted = {}
+        values = {}
+        for idx in parameter.index_set():
+            key = None if index_position is None else idx[index_position]
+
+            try:
+                values[idx] = converted[key]
+                continue
+            except KeyError:
+                pass
+
+            val, units = self._get_param_data(pname, data, key, use_default_removal)
+            converted[key] = val * _get_conversion(units, to_units)
+            values[idx] = converted[key]
+
+            if key is None:
+                _log.info_high(f"{parameter.name} fixed to value {val} {str(units)}")
+            else:
+                _log.info_high(
+                    f"{parameter.name} (index: {key}) fixed to value {val} "
+                    f"{str(units)}"
+                )
 
+        if parameter.is_indexed():
+            parameter.set_values(values)
+            parameter.fix()
+        else:
+            parameter.fix(values[None])
+
+    def _get_param_data(self, pname, data, index, use_default_removal):
+        """
+        Get the value and units for a parameter from a dict of data returned
+        from a database.
+        """
         try:
             pdata = data[pname]
         except KeyError:
@@ -314,15 +410,14 @@ class ZeroOrderBaseData(UnitModelBlockData):
                 f"{index}) in database."
             )
         try:
-            units = getattr(pyo.units, pdata["units"])
+            units = _get_units(pdata["units"])
         except KeyError:
             raise KeyError(
                 f"{self.name} - no units provided for {pname} (index: "
                 f"{index}) in database."
             )
 
-        parameter.fix(val * units)
-        _log.info_high(f"{parameter.name} fixed to value {val} {str(units)}")
+        return val, units
 
     def get_inlet_flow(self, t):
         return self._get_Q(t)
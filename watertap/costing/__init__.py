@@ -12,7 +12,12 @@
 
 from .watertap_costing_package import WaterTAPCosting, WaterTAPCostingDetailed
 from .zero_order_costing import ZeroOrderCosting
-from .multiple_choice_costing_block import MultiUnitModelCostingBlock
+from .multiple_choice_costing_block import (
+    MultiUnitModelCostingBlock,
+    screen_costing_blocks,
+)
+from .lcow_evaluator import LCOWEvaluator
+from .costing_scenarios import CostingScenarioEvaluator
 
 from .util import (
     register_costing_parameter_block,
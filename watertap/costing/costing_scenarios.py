@@ -0,0 +1,352 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains an evaluator of the costs of a solved flowsheet for
+scenarios of economic parameters, without re-solving the flowsheet.
+"""
+
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.linalg import splu
+
+import pyomo.environ as pyo
+from pyomo.core.expr.visitor import identify_mutable_parameters, identify_variables
+import idaes.logger as idaeslog
+
+from watertap.core.util.expression_compiler import compile_expressions
+from watertap.core.util.scaling import get_jacobian
+from watertap.costing.lcow_evaluator import LCOWEvaluator
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _is_active(val, bound, tolerance):
+    return bound is not None and abs(val - bound) <= tolerance * max(1.0, abs(bound))
+
+
+class CostingScenarioEvaluator(LCOWEvaluator):
+    """
+    Evaluator of the LCOW of a solved flowsheet, and its breakdowns, for
+    scenarios of economic parameters (e.g. ``electricity_cost``, the costs of
+    registered flows, ``plant_lifetime``, ``wacc``, ``utilization_factor`` or
+    ``TIC``) with the process solution held fixed.
+
+    The costing block and the unit model costing blocks are compiled into a
+    vectorized function of the process variables and economic parameters (see
+    ``LCOWEvaluator``), so thousands of scenarios are evaluated at once.
+
+    Holding the process fixed is exact when the process does not depend on the
+    economic parameters. When the flowsheet was optimized with an objective
+    depending on them, the optimum shifts with the parameters; the costs
+    evaluated are then those of the nominal design, which is still feasible,
+    and are exact to first order in the change of the parameters. To flag
+    scenarios needing a re-solve, the first-order optimality conditions of the
+    nominal solution are checked for each scenario: the gradient of the
+    objective with respect to the unfixed variables is projected onto the
+    null space of the active constraints and bounds, from a sparse KKT system
+    factorized once, giving
+
+    * ``stationarity``: the norm of the projected gradient of the objective
+      with respect to the logarithm of the variables, relative to the
+      objective; nonzero if the optimum moves,
+    * ``active_set_changed``: True where the multiplier of an active bound or
+      inequality has the wrong sign, so the bound would become inactive.
+
+    A scenario also needs a re-solve if it changes a parameter used by a
+    constraint of the process.
+    """
+
+    def __init__(
+        self,
+        costing_block,
+        name="LCOW",
+        outputs=None,
+        objective=None,
+        active_tolerance=1e-6,
+    ):
+        """
+        Args:
+            costing_block: WaterTAP costing block on which ``add_LCOW`` was
+                called
+            name: (optional) name given to ``add_LCOW`` (default: "LCOW")
+            outputs: (optional) list of additional Expressions or Vars to
+                evaluate
+            objective: (optional) Objective the flowsheet was optimized for
+                (default: the active Objective of the model, if there is
+                exactly one)
+            active_tolerance: (optional) relative tolerance within which
+                bounds and inequalities are considered active (default: 1e-6)
+        """
+        super().__init__(
+            costing_block, name=name, outputs=outputs, inline_unit_costing=True
+        )
+        model = costing_block.model()
+        process_constraints = [
+            con
+            for con in model.component_data_objects(
+                pyo.Constraint, active=True, descend_into=True
+            )
+            if id(con) not in self._defining_constraints
+        ]
+
+        self._process_inputs = set()
+        for con in process_constraints:
+            for expr in (con.body, con.lower, con.upper):
+                if expr is None:
+                    continue
+                for obj in identify_variables(expr, include_fixed=True):
+                    self._process_inputs.add(id(obj))
+                for obj in identify_mutable_parameters(expr):
+                    self._process_inputs.add(id(obj))
+
+        if objective is None:
+            objectives = list(model.component_data_objects(pyo.Objective, active=True))
+            objective = objectives[0] if len(objectives) == 1 else None
+        self._objective_function = None
+        if objective is not None:
+            try:
+                self._setup_sensitivity(model, objective, active_tolerance)
+            except TypeError as err:
+                _log.warning(
+                    f"Optimality of scenarios will not be checked, as the "
+                    f"objective could not be compiled: {err}"
+                )
+                self._objective_function = None
+
+    def _setup_sensitivity(self, model, objective, active_tolerance):
+        self._objective_function, self._objective_inputs = compile_expressions(
+            [objective.expr], self._definitions
+        )
+        self._sense = 1.0 if objective.sense == pyo.minimize else -1.0
+        # Unfixed variables the objective depends on
+        self._decisions = [
+            i
+            for i, obj in enumerate(self._objective_inputs)
+            if obj.is_variable_type() and not obj.fixed
+        ]
+
+        jac, constraints, variables = get_jacobian(model)
+        jac = jac.tocsr()
+        columns = [j for j, v in enumerate(variables) if id(v) not in self._definitions]
+        variables = [variables[j] for j in columns]
+        col_index = {id(v): j for j, v in enumerate(variables)}
+        for i in self._decisions:
+            v = self._objective_inputs[i]
+            if id(v) not in col_index:
+                col_index[id(v)] = len(variables)
+                variables.append(v)
+        num_vars = len(variables)
+
+        # Active constraints, and the sign of the multiplier expected at an
+        # optimum for active inequalities (0 for equalities)
+        rows = []
+        signs = []
+        for i, con in enumerate(constraints):
+            if id(con) in self._defining_constraints:
+                continue
+            if con.equality:
+                sign = 0.0
+            else:
+                val = pyo.value(con.body)
+                if _is_active(val, pyo.value(con.lower), active_tolerance):
+                    sign = 1.0
+                elif _is_active(val, pyo.value(con.upper), active_tolerance):
+                    sign = -1.0
+                else:
+                    continue
+            rows.append(i)
+            signs.append(sign)
+        jac = jac[rows, :][:, columns]
+        jac = sps.hstack(
+            [jac, sps.csr_matrix((len(rows), num_vars - len(columns)))]
+        ).tocsr()
+
+        bound_rows = []
+        for j, v in enumerate(variables):
+            if _is_active(v.value, v.lb, active_tolerance):
+                bound_rows.append(j)
+                signs.append(1.0)
+            elif _is_active(v.value, v.ub, active_tolerance):
+                bound_rows.append(j)
+                signs.append(-1.0)
+        bounds = sps.csr_matrix(
+            (np.ones(len(bound_rows)), (np.arange(len(bound_rows)), bound_rows)),
+            shape=(len(bound_rows), num_vars),
+        )
+
+        # Projection in terms of the logarithm of the variables, with rows of
+        # unit norm
+        scale = np.array([abs(v.value or 0.0) for v in variables])
+        scale[scale < 1e-8] = 1.0
+        active = sps.vstack([jac, bounds]).tocsr() @ sps.diags(scale)
+        norms = np.sqrt(np.asarray(active.multiply(active).sum(axis=1)).ravel())
+        nonzero = norms > 0
+        active = sps.diags(1 / norms[nonzero]) @ active[nonzero]
+        signs = np.array(signs)[nonzero]
+        num_rows = active.shape[0]
+
+        # The solution of [[I, A^T], [A, -delta I]] [r; nu] = [g; 0] gives the
+        # projection r of the gradient g onto the null space of the active
+        # constraints A, and their multipliers nu; it is linear in g, so it is
+        # solved once for each decision variable
+        kkt = sps.bmat(
+            [
+                [sps.identity(num_vars), active.T],
+                [active, -1e-10 * sps.identity(num_rows)],
+            ],
+            format="csc",
+        )
+        rhs = np.zeros((num_vars + num_rows, len(self._decisions)))
+        for k, i in enumerate(self._decisions):
+            rhs[col_index[id(self._objective_inputs[i])], k] = 1.0
+        if num_vars + num_rows > 0 and self._decisions:
+            solution = splu(kkt).solve(rhs)
+        else:
+            solution = rhs
+        projection = solution[:num_vars]
+        self._projection_norm = projection.T @ projection
+        inequalities = signs != 0
+        self._multipliers = (
+            signs[inequalities, None] * solution[num_vars:][inequalities]
+        )
+        self._decision_scale = np.array(
+            [scale[col_index[id(self._objective_inputs[i])]] for i in self._decisions]
+        )
+
+        self._nominal = self._check_optimality(None, ())
+
+    def _check_optimality(self, values, shape):
+        """
+        Get the relative stationarity, and the smallest relative multiplier
+        of the active inequalities, of the nominal solution for each scenario.
+        """
+        x = self._get_input_values(self._objective_inputs, values)
+        x = [np.broadcast_to(val, shape) for val in x]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            objective = np.asarray(self._objective_function(x)[0], dtype=float)
+            gradient = np.zeros((len(self._decisions),) + shape)
+            for k, i in enumerate(self._decisions):
+                gradient[k] = self._derivative(x, i)
+        gradient *= self._sense * self._decision_scale.reshape(
+            (-1,) + (1,) * len(shape)
+        )
+        gradient = gradient.reshape(len(self._decisions), -1)
+
+        size = max(1.0, np.prod(shape, dtype=int))
+        denominator = np.maximum(np.abs(objective).reshape(-1), 1e-12)
+        stationarity = np.sqrt(
+            np.maximum(
+                np.einsum("is,ij,js->s", gradient, self._projection_norm, gradient),
+                0,
+            )
+        )
+        stationarity = np.broadcast_to(stationarity / denominator, (int(size),))
+        if self._multipliers.shape[0] > 0:
+            multipliers = (self._multipliers @ gradient) / denominator
+        else:
+            multipliers = np.zeros((0, int(size)))
+        return stationarity.reshape(shape), multipliers
+
+    def _derivative(self, x, i):
+        """
+        Derivative of the objective with respect to its input i, by the complex
+        step method if the objective is analytic, or else central differences.
+        """
+        val = np.asarray(x[i], dtype=float)
+        if self._objective_function.analytic:
+            step = 1e-20 * np.maximum(np.abs(val), 1.0)
+            xc = list(x)
+            xc[i] = val + 1j * step
+            return np.imag(self._objective_function(xc)[0]) / step
+        step = 1e-6 * np.maximum(np.abs(val), 1.0)
+        xp = list(x)
+        xm = list(x)
+        xp[i] = val + step
+        xm[i] = val - step
+        return (
+            np.asarray(self._objective_function(xp)[0])
+            - np.asarray(self._objective_function(xm)[0])
+        ) / (2 * step)
+
+    def evaluate(
+        self, values=None, stationarity_tolerance=1e-4, multiplier_tolerance=1e-6
+    ):
+        """
+        Evaluate the LCOW and its breakdowns for scenarios of economic
+        parameters, with the process solution held fixed, and flag scenarios
+        for which the process should be re-solved.
+
+        Args:
+            values: (optional) dict mapping input names (see ``inputs``) to
+                arrays or scalars of values of the scenarios; names of other
+                parameters of the model are only checked for changes to the
+                process
+            stationarity_tolerance: (optional) relative stationarity above
+                which the optimum is considered to have moved (default: 1e-4)
+            multiplier_tolerance: (optional) relative size of a multiplier of
+                the wrong sign above which an active bound or inequality is
+                considered to become inactive (default: 1e-6)
+
+        Returns:
+            dict mapping names of the outputs to numpy arrays of their values,
+            and "stationarity", "active_set_changed" and "resolve_needed" to
+            arrays for each scenario
+        """
+        results = super().evaluate(values)
+        shape = np.broadcast_shapes(
+            np.shape(results[self.outputs[0]]),
+            *(np.shape(val) for val in (values or {}).values()),
+        )
+        results = {
+            name: np.broadcast_to(val, shape).copy() for name, val in results.items()
+        }
+
+        # Changes to parameters of the process invalidate its solution
+        model = self.costing_block.model()
+        process_changed = np.zeros(shape, dtype=bool)
+        for key, val in (values or {}).items():
+            obj = model.find_component(key) if isinstance(key, str) else key
+            if obj is None or id(obj) not in self._process_inputs:
+                continue
+            changed = ~np.isclose(val, pyo.value(obj), rtol=1e-12, atol=0)
+            process_changed |= np.broadcast_to(changed, shape)
+
+        if self._objective_function is None:
+            stationarity = np.zeros(shape)
+            active_set_changed = np.zeros(shape, dtype=bool)
+        else:
+            stationarity, multipliers = self._check_optimality(values, shape)
+            # Only multipliers of the right sign at the nominal solution
+            nominal = self._nominal[1][:, 0] >= -multiplier_tolerance
+            active_set_changed = np.any(
+                multipliers[nominal] < -multiplier_tolerance, axis=0
+            ).reshape(shape)
+
+        results["stationarity"] = stationarity
+        results["active_set_changed"] = active_set_changed
+        results["resolve_needed"] = (
+            process_changed
+            | (stationarity > stationarity_tolerance)
+            | active_set_changed
+        )
+        return results
+
+    @property
+    def nominal_stationarity(self):
+        """
+        Relative stationarity of the solution at the current values of the
+        economic parameters, which is small if it is optimal (None if there is
+        no objective).
+        """
+        if self._objective_function is None:
+            return None
+        return float(self._nominal[0])
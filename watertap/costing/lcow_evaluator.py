@@ -0,0 +1,172 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+This module contains a vectorized evaluator of the LCOW of a flowsheet and its
+breakdowns, for post-processing the results of parameter sweeps.
+"""
+
+import numpy as np
+
+import pyomo.environ as pyo
+from pyomo.common.numeric_types import native_types
+
+from watertap.core.util.expression_compiler import compile_expressions
+
+# Suffixes of the breakdowns of the LCOW created by add_LCOW
+_BREAKDOWN_SUFFIXES = (
+    "_component_direct_capex",
+    "_component_indirect_capex",
+    "_component_fixed_opex",
+    "_component_variable_opex",
+    "_aggregate_direct_capex",
+    "_aggregate_indirect_capex",
+    "_aggregate_fixed_opex",
+    "_aggregate_variable_opex",
+)
+
+
+def _get_definitions(blocks):
+    """
+    Get the expressions defining the unfixed Vars of costing blocks through
+    their equality constraints of the form ``var == expr`` (e.g. aggregate
+    costs, total costs and the capital recovery factor).
+
+    Returns:
+        tuple of a dict mapping ids of the Vars to their definitions, and a
+        set of the ids of the defining constraints
+    """
+    definitions = {}
+    constraints = set()
+    for blk in blocks:
+        for con in blk.component_data_objects(
+            pyo.Constraint, active=True, descend_into=False
+        ):
+            if not con.equality:
+                continue
+            lhs, rhs = con.expr.args
+            if (
+                type(lhs) not in native_types
+                and lhs.is_variable_type()
+                and not lhs.fixed
+                and lhs.parent_block() is blk
+                and id(lhs) not in definitions
+            ):
+                definitions[id(lhs)] = rhs
+                constraints.add(id(con))
+    return definitions, constraints
+
+
+class LCOWEvaluator:
+    """
+    Vectorized evaluator of the LCOW of a flowsheet and its breakdowns by
+    component and unit type, e.g. for post-processing the results of a
+    parameter sweep.
+
+    On construction, the LCOW Expressions added by ``add_LCOW`` are compiled
+    once into a NumPy function of the values of the variables they depend on.
+    Variables of the costing block defined by its constraints (the aggregate
+    costs and flows, total costs and capital recovery factor) are replaced by
+    their definitions, so the inputs of the function are the unit model costs,
+    costed flows, flow rate of water and costing parameters (e.g.
+    ``utilization_factor`` or ``electricity_cost``). Given arrays of values of
+    any of these inputs, ``evaluate`` calculates all outputs for every sample
+    at once; inputs not given take their current values in the model.
+    """
+
+    def __init__(
+        self, costing_block, name="LCOW", outputs=None, inline_unit_costing=False
+    ):
+        """
+        Args:
+            costing_block: WaterTAP costing block on which ``add_LCOW`` was
+                called
+            name: (optional) name given to ``add_LCOW`` (default: "LCOW")
+            outputs: (optional) list of additional Expressions or Vars, e.g.
+                ``total_capital_cost``, to evaluate
+            inline_unit_costing: (optional) if True, the costs of unit models
+                are also replaced by their definitions in the unit model
+                costing blocks, so the inputs are the process variables and
+                cost parameters they are calculated from (default: False)
+        """
+        lcow = costing_block.component(name)
+        if lcow is None:
+            raise ValueError(
+                f"{costing_block.name} has no component {name}; call add_LCOW first."
+            )
+        components = [lcow] + [
+            costing_block.component(name + suffix) for suffix in _BREAKDOWN_SUFFIXES
+        ]
+        if outputs is not None:
+            components.extend(outputs)
+
+        self.costing_block = costing_block
+        self.outputs = []
+        expressions = []
+        for component in components:
+            if component is None:
+                continue
+            for data in component.values():
+                self.outputs.append(data.name)
+                expressions.append(data)
+
+        blocks = [costing_block]
+        if inline_unit_costing:
+            blocks.extend(costing_block._registered_unit_costing)
+        self._definitions, self._defining_constraints = _get_definitions(blocks)
+        self._function, self._inputs = compile_expressions(
+            expressions, self._definitions
+        )
+
+    @property
+    def inputs(self):
+        """
+        Names of the variables and parameters the outputs depend on.
+        """
+        return [obj.name for obj in self._inputs]
+
+    @staticmethod
+    def _get_input_values(inputs, values):
+        """
+        Get the list of input values for a compiled function from the current
+        values of its inputs, updated from a dict of values by name.
+        """
+        x = [np.nan if obj.value is None else obj.value for obj in inputs]
+        if values is not None:
+            index = {obj.name: i for i, obj in enumerate(inputs)}
+            for key, val in values.items():
+                i = index.get(key if isinstance(key, str) else key.name, None)
+                if i is not None:
+                    x[i] = np.asarray(val, dtype=float)
+        return x
+
+    def evaluate(self, values=None):
+        """
+        Evaluate the LCOW and its breakdowns.
+
+        Args:
+            values: (optional) dict mapping input names (see ``inputs``), or
+                ComponentMap mapping input components, to arrays or scalars of
+                values, e.g. the results of a parameter sweep. Keys which are
+                not inputs are ignored.
+
+        Returns:
+            dict mapping names of the outputs to numpy arrays of their values,
+            with the shape the input arrays broadcast to
+        """
+        x = self._get_input_values(self._inputs, values)
+        shape = np.broadcast_shapes(*(np.shape(val) for val in x))
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            results = self._function(x)
+        return {
+            name: np.broadcast_to(np.asarray(result, dtype=float), shape).copy()
+            for name, result in zip(self.outputs, results)
+        }
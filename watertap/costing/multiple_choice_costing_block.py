@@ -10,6 +10,10 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+import heapq
+
+import numpy as np
+
 import pyomo.environ as pyo
 from pyomo.common.config import ConfigBlock, ConfigValue
 from pyomo.util.calc_var_value import calculate_variable_from_constraint
@@ -24,6 +28,8 @@ from idaes.core.base.costing_base import (
 )
 import idaes.logger as idaeslog
 
+from watertap.costing.lcow_evaluator import LCOWEvaluator
+
 _log = idaeslog.getLogger(__name__)
 
 
@@ -194,6 +200,44 @@ class MultiUnitModelCostingBlockData(UnitModelCostingBlockData, UnitModelCosting
         self.costing_block_selector[:].set_value(0)
         self.costing_block_selector[costing_block_name].set_value(1)
 
+    @property
+    def selected_costing_block(self):
+        """
+        Name of the active costing block
+        """
+        for k, selector in self.costing_block_selector.items():
+            if pyo.value(selector):
+                return k
+        return None
+
+    def rank_costing_blocks(self, name="LCOW", evaluator=None):
+        """
+        Rank the costing blocks by the LCOW of the flowsheet when each is
+        selected, at the current state of the process and without solving.
+        The costing blocks are initialized first, the costing blocks of other
+        units keep their selection.
+
+        Args:
+            name: (optional) name given to ``add_LCOW`` on the flowsheet
+                costing block (default: "LCOW")
+            evaluator: (optional) LCOWEvaluator of the flowsheet costing
+                block, to reuse when ranking several units
+
+        Returns:
+            dict mapping names of the costing blocks to the LCOW, in order of
+            increasing LCOW
+        """
+        self.initialize()
+        if evaluator is None:
+            evaluator = LCOWEvaluator(self.costing_package, name=name)
+        names = list(self.costing_block_selector.keys())
+        values = {
+            selector.name: (np.array(names) == k).astype(float)
+            for k, selector in self.costing_block_selector.items()
+        }
+        lcow = evaluator.evaluate(values)[evaluator.outputs[0]]
+        return {names[i]: float(lcow[i]) for i in np.argsort(lcow, kind="stable")}
+
     def initialize(self, *args, **kwargs):
         """
         Initialize all costing blocks for easy switching between
@@ -209,3 +253,139 @@ class MultiUnitModelCostingBlockData(UnitModelCostingBlockData, UnitModelCosting
                     var = getattr(blk, c)
                     cons = getattr(blk, f"{c}_constraint")
                     calculate_variable_from_constraint(var, cons)
+
+
+def _best_combinations(ranked):
+    """
+    Generate the combinations of one choice per unit in order of increasing
+    sum of the costs of the choices, from lists of (cost, choice) sorted by
+    cost for each unit.
+    """
+    start = (0,) * len(ranked)
+    heap = [(sum(r[0][0] for r in ranked), start)]
+    seen = {start}
+    while heap:
+        cost, ranks = heapq.heappop(heap)
+        yield cost, tuple(r[i][1] for r, i in zip(ranked, ranks))
+        for u, r in enumerate(ranked):
+            if ranks[u] + 1 < len(r):
+                new = ranks[:u] + (ranks[u] + 1,) + ranks[u + 1 :]
+                if new not in seen:
+                    seen.add(new)
+                    new_cost = cost - r[ranks[u]][0] + r[ranks[u] + 1][0]
+                    heapq.heappush(heap, (new_cost, new))
+
+
+def screen_costing_blocks(costing_package, top_k=1, solve=None, name="LCOW"):
+    """
+    Screen the choices of costing blocks of all MultiUnitModelCostingBlocks
+    registered with a flowsheet costing block, without solving every
+    combination.
+
+    At the current state of the process, the LCOW is linear in the costs of
+    each unit, so the combinations of costing blocks are ranked from a single
+    vectorized evaluation of the LCOW with each costing block of each unit
+    selected in turn (see ``LCOWEvaluator``). The ``top_k`` best combinations
+    are evaluated exactly and, if a ``solve`` function is given, re-optimized
+    with it. The best combination is selected on return: the one with the
+    lowest solved LCOW among the optimal solves if ``solve`` is given, with
+    the values of the variables of its solution restored.
+
+    Args:
+        costing_package: flowsheet costing block on which ``add_LCOW`` was
+            called
+        top_k: (optional) number of combinations to evaluate and re-optimize
+            (default: 1)
+        solve: (optional) function called with the model to re-optimize it for
+            the selected costing blocks, returning the solver results
+        name: (optional) name given to ``add_LCOW`` (default: "LCOW")
+
+    Returns:
+        list of dicts of the ``top_k`` best combinations in order of screened
+        LCOW, with the selected costing block of each unit by name
+        ("selection"), the screened LCOW ("screened_LCOW"), and if solved, the
+        LCOW of the solution ("LCOW") and whether the solve was optimal
+        ("optimal")
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be a positive integer, not {top_k}.")
+    blocks = [
+        blk
+        for blk in costing_package._registered_unit_costing
+        if isinstance(blk, MultiUnitModelCostingBlockData)
+    ]
+    evaluator = LCOWEvaluator(costing_package, name=name)
+
+    # One evaluation of each costing block of each unit
+    samples = [(blk, k) for blk in blocks for k in blk.costing_block_selector]
+    for blk in blocks:
+        blk.initialize()
+
+    def selector_values(selections):
+        values = {}
+        for blk in blocks:
+            for k, selector in blk.costing_block_selector.items():
+                values[selector.name] = np.array(
+                    [
+                        float(selection.get(blk, blk.selected_costing_block) == k)
+                        for selection in selections
+                    ]
+                )
+        return values
+
+    lcow = evaluator.evaluate(selector_values([{blk: k} for blk, k in samples]))[
+        evaluator.outputs[0]
+    ]
+    ranked = [
+        sorted((lcow[i], k) for i, (b, k) in enumerate(samples) if b is blk)
+        for blk in blocks
+    ]
+
+    combinations = []
+    for _, choice in _best_combinations(ranked):
+        combinations.append(dict(zip(blocks, choice)))
+        if len(combinations) == top_k:
+            break
+    lcow = evaluator.evaluate(selector_values(combinations))[evaluator.outputs[0]]
+    results = [
+        {
+            "selection": {blk.name: k for blk, k in selection.items()},
+            "screened_LCOW": float(np.broadcast_to(lcow, (len(combinations),))[i]),
+        }
+        for i, selection in enumerate(combinations)
+    ]
+
+    best = 0
+    if solve is not None:
+        model = costing_package.model()
+        variables = list(model.component_data_objects(pyo.Var, descend_into=True))
+        initial = [v.value for v in variables]
+        solution = None
+        for i, selection in enumerate(combinations):
+            for v, val in zip(variables, initial):
+                v.set_value(val, skip_validation=True)
+            for blk, k in selection.items():
+                blk.select_costing_block(k)
+            res = solve(model)
+            optimal = pyo.check_optimal_termination(res)
+            results[i]["optimal"] = optimal
+            results[i]["LCOW"] = pyo.value(costing_package.component(name))
+            _log.info(
+                f"Costing blocks {results[i]['selection']}: LCOW "
+                f"{results[i]['LCOW']} (screened {results[i]['screened_LCOW']}), "
+                f"optimal: {optimal}"
+            )
+            if optimal and (
+                solution is None or results[i]["LCOW"] < results[best]["LCOW"]
+            ):
+                best = i
+                solution = [v.value for v in variables]
+        if solution is None:
+            _log.warning("No optimal solution found for the screened costing blocks.")
+            solution = initial
+        for v, val in zip(variables, solution):
+            v.set_value(val, skip_validation=True)
+
+    for blk, k in combinations[best].items():
+        blk.select_costing_block(k)
+    return results
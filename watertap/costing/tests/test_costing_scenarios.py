@@ -0,0 +1,160 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import numpy as np
+import pytest
+
+import pyomo.environ as pyo
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+import idaes.core as idc
+
+from watertap.costing import WaterTAPCosting, CostingScenarioEvaluator
+
+
+def _optimal_dose(electricity_cost, chemical_cost):
+    # Minimizes electricity_cost * (x + 4/x) [kW] + chemical_cost * 1e-4 x [kg/s]
+    return np.sqrt(4 * electricity_cost / (electricity_cost + 0.36 * chemical_cost))
+
+
+def build(dose_lb):
+    """
+    Toy flowsheet where the dose of a chemical trades off against electricity,
+    solved analytically for the optimal dose.
+    """
+    m = pyo.ConcreteModel()
+    m.fs = idc.FlowsheetBlock(dynamic=False)
+    m.fs.costing = WaterTAPCosting()
+
+    m.fs.dose = pyo.Var(initialize=1, bounds=(dose_lb, None))
+    m.fs.power_coefficient = pyo.Param(initialize=1, mutable=True, units=pyo.units.kW)
+    m.fs.power = pyo.Var(initialize=1, units=pyo.units.kW)
+    m.fs.chemical = pyo.Var(initialize=1, units=pyo.units.kg / pyo.units.s)
+    m.fs.product = pyo.Var(initialize=1, units=pyo.units.m**3 / pyo.units.s)
+    m.fs.product.fix()
+    m.fs.eq_power = pyo.Constraint(
+        expr=m.fs.power == m.fs.power_coefficient * (m.fs.dose + 4 / m.fs.dose)
+    )
+    m.fs.eq_chemical = pyo.Constraint(
+        expr=m.fs.chemical == 1e-4 * pyo.units.kg / pyo.units.s * m.fs.dose
+    )
+
+    m.fs.costing.register_flow_type("chemical", 1 * pyo.units.USD_2018 / pyo.units.kg)
+    m.fs.costing.cost_flow(m.fs.power, "electricity")
+    m.fs.costing.cost_flow(m.fs.chemical, "chemical")
+    m.fs.costing.cost_process()
+    m.fs.costing.add_LCOW(m.fs.product)
+    m.fs.objective = pyo.Objective(expr=m.fs.costing.LCOW)
+
+    m.fs.dose.value = max(dose_lb, _optimal_dose(0.07, 1))
+    calculate_variable_from_constraint(m.fs.power, m.fs.eq_power)
+    calculate_variable_from_constraint(m.fs.chemical, m.fs.eq_chemical)
+    for con in m.fs.costing.component_data_objects(
+        pyo.Constraint, active=True, descend_into=False
+    ):
+        var = con.expr.args[0]
+        if not var.fixed:
+            calculate_variable_from_constraint(var, con)
+    return m
+
+
+@pytest.mark.component
+def test_costing_scenarios_interior_optimum():
+    m = build(dose_lb=0.1)
+    evaluator = CostingScenarioEvaluator(m.fs.costing)
+
+    assert "fs.costing.electricity_cost" in evaluator.inputs
+    assert "fs.costing.chemical_cost" in evaluator.inputs
+    assert evaluator.nominal_stationarity == pytest.approx(0, abs=1e-8)
+
+    electricity_cost = np.array([0.07, 0.14, 0.07, 0.07])
+    utilization_factor = np.array([0.9, 0.9, 0.5, 0.9])
+    power_coefficient = np.array([1, 1, 1, 2])
+    results = evaluator.evaluate(
+        {
+            "fs.costing.electricity_cost": electricity_cost,
+            "fs.costing.utilization_factor": utilization_factor,
+            "fs.power_coefficient": power_coefficient,
+        }
+    )
+
+    # the process is held fixed
+    for i in range(3):
+        m.fs.costing.electricity_cost.value = electricity_cost[i]
+        m.fs.costing.utilization_factor.value = utilization_factor[i]
+        for con in m.fs.costing.component_data_objects(
+            pyo.Constraint, active=True, descend_into=False
+        ):
+            var = con.expr.args[0]
+            if not var.fixed:
+                calculate_variable_from_constraint(var, con)
+        assert results["fs.costing.LCOW"][i] == pytest.approx(
+            pyo.value(m.fs.costing.LCOW), rel=1e-10
+        )
+
+    assert results["stationarity"][0] == pytest.approx(0, abs=1e-8)
+    # the optimal dose changes with the price of electricity
+    assert results["stationarity"][1] > 1e-2
+    # but not with the utilization factor
+    assert results["stationarity"][2] == pytest.approx(0, abs=1e-8)
+    assert not results["active_set_changed"].any()
+    # the power coefficient is a parameter of the process
+    assert list(results["resolve_needed"]) == [False, True, False, True]
+
+
+@pytest.mark.component
+def test_costing_scenarios_non_analytic_objective():
+    m = build(dose_lb=0.1)
+    values = {"fs.costing.electricity_cost": np.array([0.07, 0.14])}
+    expected = CostingScenarioEvaluator(m.fs.costing).evaluate(values)
+
+    # same optimum, but the complex step method does not apply to abs
+    m.fs.objective.deactivate()
+    m.fs.objective_abs = pyo.Objective(expr=abs(m.fs.costing.LCOW))
+    evaluator = CostingScenarioEvaluator(m.fs.costing)
+    assert not evaluator._objective_function.analytic
+    assert evaluator.nominal_stationarity == pytest.approx(0, abs=1e-6)
+
+    results = evaluator.evaluate(values)
+    assert results["stationarity"][0] == pytest.approx(0, abs=1e-6)
+    assert results["stationarity"][1] == pytest.approx(
+        expected["stationarity"][1], rel=1e-4
+    )
+    assert list(results["resolve_needed"]) == [False, True]
+
+
+@pytest.mark.component
+def test_costing_scenarios_active_bound():
+    m = build(dose_lb=1)
+    assert _optimal_dose(0.07, 1) < 1
+
+    chemical_cost = np.array([1, 2, 0.5, 0.01])
+    results = m.fs.costing.evaluate_costing_scenarios(
+        {"fs.costing.chemical_cost": chemical_cost}
+    )
+
+    # at the bound of the dose, there is no other feasible direction
+    assert results["stationarity"] == pytest.approx(0, abs=1e-8)
+    # the bound stays active while the optimal dose is below it
+    expected = _optimal_dose(0.07, chemical_cost) > 1
+    assert list(results["active_set_changed"]) == list(expected)
+    assert list(results["resolve_needed"]) == list(expected)
+
+
+@pytest.mark.component
+def test_costing_scenarios_no_objective():
+    m = build(dose_lb=0.1)
+    m.fs.objective.deactivate()
+    evaluator = CostingScenarioEvaluator(m.fs.costing)
+    assert evaluator.nominal_stationarity is None
+
+    results = evaluator.evaluate({"fs.costing.electricity_cost": [0.07, 0.1]})
+    assert list(results["resolve_needed"]) == [False, False]
@@ -15,8 +15,9 @@ import pytest
 import re
 
 import pyomo.environ as pyo
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
 from idaes.core import FlowsheetBlock, UnitModelCostingBlock
-from watertap.costing import MultiUnitModelCostingBlock
+from watertap.costing import MultiUnitModelCostingBlock, screen_costing_blocks
 
 import watertap.property_models.NaCl_prop_pack as props
 from watertap.unit_models.reverse_osmosis_0D import (
@@ -269,3 +270,87 @@ def test_multiple_choice_costing_block():
         + m.fs.RO3.costing.costing_blocks["high_pressure"].capital_cost.value
     )
     assert m.fs.costing.aggregate_variable_operating_cost.value == 0
+
+
+def _lcow_with(m, selection):
+    for blk, k in selection.items():
+        blk.select_costing_block(k)
+    m.fs.costing.initialize()
+    return pyo.value(m.fs.costing.LCOW)
+
+
+@pytest.fixture
+def lcow_model():
+    m = setup_flowsheet()
+    m.fs.costing.add_LCOW(m.fs.RO.mixed_permeate[0].flow_vol_phase["Liq"])
+    m.fs.RO.mixed_permeate[0].flow_vol_phase["Liq"].set_value(1e-3)
+    m.fs.costing.initialize()
+    return m
+
+
+def test_rank_costing_blocks(lcow_model):
+    m = lcow_model
+    ranking = m.fs.RO3.costing.rank_costing_blocks()
+
+    assert set(ranking) == {"normal_pressure", "high_pressure", "my_own"}
+    # the selection is unchanged
+    assert m.fs.RO3.costing.selected_costing_block == "my_own"
+    lcows = list(ranking.values())
+    assert lcows == sorted(lcows)
+    assert lcows[0] < lcows[-1]
+    for k, lcow in ranking.items():
+        assert lcow == pytest.approx(_lcow_with(m, {m.fs.RO3.costing: k}), rel=1e-12)
+
+
+def test_screen_costing_blocks(lcow_model):
+    m = lcow_model
+    with pytest.raises(ValueError, match="top_k must be a positive integer"):
+        screen_costing_blocks(m.fs.costing, top_k=0)
+
+    results = screen_costing_blocks(m.fs.costing, top_k=3)
+
+    assert len(results) == 3
+    lcows = [r["screened_LCOW"] for r in results]
+    assert lcows == sorted(lcows)
+    # the best combination is selected
+    for b, k in results[0]["selection"].items():
+        assert m.find_component(b).selected_costing_block == k
+    for r in results:
+        selection = {m.find_component(b): k for b, k in r["selection"].items()}
+        assert r["screened_LCOW"] == pytest.approx(_lcow_with(m, selection), rel=1e-12)
+    # exhaustive check of the best combination
+    assert results[0]["screened_LCOW"] == pytest.approx(
+        min(
+            _lcow_with(
+                m, {m.fs.RO.costing: a, m.fs.RO2.costing: b, m.fs.RO3.costing: c}
+            )
+            for a in ("normal_pressure", "high_pressure")
+            for b in ("normal_pressure", "high_pressure")
+            for c in ("normal_pressure", "high_pressure", "my_own")
+        ),
+        rel=1e-12,
+    )
+
+
+def test_screen_costing_blocks_solve(lcow_model):
+    m = lcow_model
+    solved = []
+
+    def solve(model):
+        # stand-in for a solver, the second combination is "infeasible"
+        solved.append(m.fs.RO3.costing.selected_costing_block)
+        model.fs.costing.initialize()
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        if len(solved) == 2:
+            results.solver.termination_condition = TerminationCondition.infeasible
+        else:
+            results.solver.termination_condition = TerminationCondition.optimal
+        return results
+
+    results = screen_costing_blocks(m.fs.costing, top_k=2, solve=solve)
+
+    assert len(solved) == 2
+    assert [r["optimal"] for r in results] == [True, False]
+    assert results[0]["LCOW"] == pytest.approx(results[0]["screened_LCOW"])
+    assert m.fs.RO3.costing.selected_costing_block == solved[0]
@@ -284,6 +284,27 @@ class WaterTAPCostingBlockData(FlowsheetCostingBlockData):
             return str(variables[0])
         return str(flow_expr)
 
+    def evaluate_costing_scenarios(self, scenarios, name="LCOW", outputs=None):
+        """
+        Evaluate the LCOW, and its breakdowns, for scenarios of economic
+        parameters with the process solution held fixed, without re-solving.
+        See ``CostingScenarioEvaluator``; to evaluate several batches of
+        scenarios, create the evaluator once.
+        Args:
+            scenarios - dict mapping names of costing parameters (e.g.
+                        "fs.costing.electricity_cost") to arrays of values
+            name (optional) - name given to add_LCOW (default: LCOW)
+            outputs (optional) - list of additional Expressions to evaluate
+        Returns:
+            dict of arrays of the outputs, and of "stationarity",
+            "active_set_changed" and "resolve_needed" for each scenario
+        """
+        from watertap.costing.costing_scenarios import CostingScenarioEvaluator
+
+        return CostingScenarioEvaluator(self, name=name, outputs=outputs).evaluate(
+            scenarios
+        )
+
     def add_specific_energy_consumption(
         self, flow_rate, name="specific_energy_consumption"
     ):
@@ -11,6 +11,7 @@
 #################################################################################
 
 from watertap.core.solvers import get_solver
+from watertap.core.util.model_cache import cache_model_template
 from parameter_sweep import (
     UniformSample,
     NormalSample,
@@ -60,10 +61,8 @@ def get_sweep_params(m, num_samples, use_LHS=False):
     return sweep_params
 
 
-def build_model(
-    read_model_defauls_from_file=False,
-    defaults_fname="default_configuration.yaml",
-):
+@cache_model_template
+def _build_initialized_model():
     # Set up the solver
     solver = get_solver()
 
@@ -72,6 +71,16 @@ def build_model(
     set_operating_conditions(m, water_recovery=0.5, over_pressure=0.3, solver=solver)
     initialize_system(m, solver=solver)
 
+    return m
+
+
+def build_model(
+    read_model_defauls_from_file=False,
+    defaults_fname="default_configuration.yaml",
+):
+    # Repeated builds are copied from the first built and initialized model
+    m = _build_initialized_model()
+
     # Check if we need to read in the default model values from a file
     if read_model_defauls_from_file:
         set_defaults_from_yaml(m, defaults_fname)
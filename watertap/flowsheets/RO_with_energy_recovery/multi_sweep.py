@@ -14,6 +14,7 @@ import watertap.flowsheets.RO_with_energy_recovery.RO_with_energy_recovery as RO
 from watertap.flowsheets.RO_with_energy_recovery.RO_with_energy_recovery import (
     ERDtype,
 )
+from watertap.core.util.warm_start import WarmStartCache
 
 
 def set_up_sensitivity():
@@ -66,7 +67,13 @@ def set_up_sensitivity():
     return outputs, m
 
 
-def run_analysis(case_num=1, nx=5, interpolate_nan_outputs=True, output_filename=None):
+def run_analysis(
+    case_num=1,
+    nx=5,
+    interpolate_nan_outputs=True,
+    output_filename=None,
+    warm_start=False,
+):
 
     if output_filename is None:
         output_filename = "sensitivity_" + str(case_num) + ".csv"
@@ -94,12 +101,17 @@ def run_analysis(case_num=1, nx=5, interpolate_nan_outputs=True, output_filename
     else:
         raise ValueError(f"{case_num} is not yet implemented")
 
+    optimize_function = RO.solve
+    if warm_start:
+        # start each sample from the nearest converged sample
+        optimize_function = WarmStartCache(m, sweep_params).wrap(RO.solve)
+
     global_results = parameter_sweep(
         m,
         sweep_params,
         outputs,
         csv_results_file_name=output_filename,
-        optimize_function=RO.solve,
+        optimize_function=optimize_function,
         interpolate_nan_outputs=interpolate_nan_outputs,
     )
 
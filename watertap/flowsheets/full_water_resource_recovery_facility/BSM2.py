@@ -105,10 +105,23 @@ def main(reactor_volume_equalities=False):
     return m, results
 
 
-def build():
+def build(dynamic=False, time_set=None):
+    """
+    Build the flowsheet, steady-state by default. If dynamic, the reactors and
+    the anaerobic digester have holdup, the other units are steady-state, and
+    time is in seconds; the time domain must then be discretized.
+
+    Args:
+        dynamic: (optional) if True, build a dynamic flowsheet (default: False)
+        time_set: (optional) list of the bounds of the time domain [s] of a
+            dynamic flowsheet
+    """
     m = pyo.ConcreteModel()
 
-    m.fs = FlowsheetBlock(dynamic=False)
+    if dynamic:
+        m.fs = FlowsheetBlock(dynamic=True, time_set=time_set, time_units=pyo.units.s)
+    else:
+        m.fs = FlowsheetBlock(dynamic=False)
 
     m.fs.props_ASM1 = ASM1ParameterBlock()
     m.fs.props_ADM1 = ADM1ParameterBlock()
@@ -180,7 +193,7 @@ def build():
     m.fs.Treated = Product(property_package=m.fs.props_ASM1)
     m.fs.Sludge = Product(property_package=m.fs.props_ASM1)
     # Recycle pressure changer - use a simple isothermal unit for now
-    m.fs.P1 = PressureChanger(property_package=m.fs.props_ASM1)
+    m.fs.P1 = PressureChanger(property_package=m.fs.props_ASM1, dynamic=False)
 
     # Link units
     m.fs.stream2 = Arc(source=m.fs.MX1.outlet, destination=m.fs.R1.inlet)
@@ -288,18 +301,18 @@ def set_operating_conditions(m):
     m.fs.FeedWater.flow_vol.fix(20648 * pyo.units.m**3 / pyo.units.day)
     m.fs.FeedWater.temperature.fix(308.15 * pyo.units.K)
     m.fs.FeedWater.pressure.fix(1 * pyo.units.atm)
-    m.fs.FeedWater.conc_mass_comp[0, "S_I"].fix(27 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "S_S"].fix(58 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_I"].fix(92 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_S"].fix(363 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_BH"].fix(50 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_BA"].fix(0 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_P"].fix(0 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "S_O"].fix(0 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "S_NO"].fix(0 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "S_NH"].fix(23 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "S_ND"].fix(5 * pyo.units.g / pyo.units.m**3)
-    m.fs.FeedWater.conc_mass_comp[0, "X_ND"].fix(16 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_I"].fix(27 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_S"].fix(58 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_I"].fix(92 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_S"].fix(363 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_BH"].fix(50 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_BA"].fix(0 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_P"].fix(0 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_O"].fix(0 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_NO"].fix(0 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_NH"].fix(23 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "S_ND"].fix(5 * pyo.units.g / pyo.units.m**3)
+    m.fs.FeedWater.conc_mass_comp[:, "X_ND"].fix(16 * pyo.units.g / pyo.units.m**3)
     m.fs.FeedWater.alkalinity.fix(7 * pyo.units.mol / pyo.units.m**3)
 
     # Reactor sizing in activated sludge process
@@ -326,20 +339,20 @@ def set_operating_conditions(m):
 
     # Secondary clarifier
     # TODO: Update once secondary clarifier with more detailed model available
-    m.fs.CL1.split_fraction[0, "effluent", "H2O"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "S_I"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "S_S"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "X_I"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "X_S"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "X_BH"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "X_BA"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "X_P"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "S_O"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "S_NO"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "S_NH"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "S_ND"].fix(0.48956)
-    m.fs.CL1.split_fraction[0, "effluent", "X_ND"].fix(0.00187)
-    m.fs.CL1.split_fraction[0, "effluent", "S_ALK"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "H2O"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "S_I"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "S_S"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "X_I"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "X_S"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "X_BH"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "X_BA"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "X_P"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "S_O"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "S_NO"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "S_NH"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "S_ND"].fix(0.48956)
+    m.fs.CL1.split_fraction[:, "effluent", "X_ND"].fix(0.00187)
+    m.fs.CL1.split_fraction[:, "effluent", "S_ALK"].fix(0.48956)
 
     m.fs.CL1.surface_area.fix(1500 * pyo.units.m**2)
 
@@ -351,20 +364,20 @@ def set_operating_conditions(m):
 
     # Primary Clarifier
     # TODO: Update primary clarifier once more detailed model available
-    m.fs.CL.split_fraction[0, "effluent", "H2O"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "S_I"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "S_S"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "X_I"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "X_S"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "X_BH"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "X_BA"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "X_P"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "S_O"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "S_NO"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "S_NH"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "S_ND"].fix(0.993)
-    m.fs.CL.split_fraction[0, "effluent", "X_ND"].fix(0.5192)
-    m.fs.CL.split_fraction[0, "effluent", "S_ALK"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "H2O"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "S_I"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "S_S"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "X_I"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "X_S"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "X_BH"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "X_BA"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "X_P"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "S_O"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "S_NO"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "S_NH"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "S_ND"].fix(0.993)
+    m.fs.CL.split_fraction[:, "effluent", "X_ND"].fix(0.5192)
+    m.fs.CL.split_fraction[:, "effluent", "S_ALK"].fix(0.993)
 
     # Anaerobic digester
     m.fs.RADM.volume_liquid.fix(3400)
@@ -375,7 +388,7 @@ def set_operating_conditions(m):
     m.fs.DU.hydraulic_retention_time.fix(1800 * pyo.units.s)
 
     # Set specific energy consumption averaged for centrifuge
-    m.fs.DU.energy_electric_flow_vol_inlet[0] = 0.069 * pyo.units.kWh / pyo.units.m**3
+    m.fs.DU.energy_electric_flow_vol_inlet[:] = 0.069 * pyo.units.kWh / pyo.units.m**3
 
     # Thickener unit
     m.fs.TU.hydraulic_retention_time.fix(86400 * pyo.units.s)
@@ -383,7 +396,7 @@ def set_operating_conditions(m):
 
     # TODO: resolve the danger of redundant constraint related to pressure equality constraints created in mixer, specifically for isobaric conditions. the mixer initializer will turn these constraints back on
     for mx in m.mixers:
-        mx.pressure_equality_constraints[0.0, 2].deactivate()
+        mx.pressure_equality_constraints[:, 2].deactivate()
 
     for var in m.fs.component_data_objects(pyo.Var, descend_into=True):
         if "flow_vol" in var.name:
@@ -398,7 +411,7 @@ def set_operating_conditions(m):
     iscale.calculate_scaling_factors(m)
 
 
-def initialize_system(m):
+def initialize_system(m, presolve=False):
     # Initialize flowsheet
     # Apply sequential decomposition - 1 iteration should suffice
     seq = SequentialDecomposition()
@@ -460,8 +473,14 @@ def initialize_system(m):
     seq.set_guesses_for(m.fs.R1.inlet, tear_guesses1)
     seq.set_guesses_for(m.fs.asm_adm.inlet, tear_guesses2)
 
+    # Reactors which can be pre-solved with a Newton method before IPOPT
+    presolved_units = [m.fs.R1, m.fs.R2, m.fs.R3, m.fs.R4, m.fs.R5, m.fs.RADM]
+
     def function(unit):
-        unit.initialize(outlvl=idaeslog.INFO_HIGH)
+        if presolve and any(unit is u for u in presolved_units):
+            unit.initialize(outlvl=idaeslog.INFO_HIGH, presolve=True)
+        else:
+            unit.initialize(outlvl=idaeslog.INFO_HIGH)
 
     seq.run(m, function)
 
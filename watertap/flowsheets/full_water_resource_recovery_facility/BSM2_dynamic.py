@@ -0,0 +1,459 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+Dynamic simulation of the full Water Resource Recovery Facility (WRRF) flowsheet
+with ASM1 and ADM1 (see BSM2.py) over long influent time series, e.g. the 609
+day dynamic influent of BSM2.
+
+Rather than discretizing the whole horizon, the flowsheet is discretized over
+a time window which is solved repeatedly: the influent is read as a stream and
+interpolated over each window, the final state of each window is carried
+forward as the initial condition of the next, and the trajectories are written
+to disk after each window. Memory use and solve time per window thus depend on
+the window length, not the total horizon.
+"""
+
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+import pyomo.environ as pyo
+from pyomo.contrib.incidence_analysis import IncidenceGraphInterface
+from pyomo.dae import DerivativeVar
+from pyomo.dae.flatten import flatten_dae_components
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+import idaes.logger as idaeslog
+
+import watertap.flowsheets.full_water_resource_recovery_facility.BSM2 as BSM2
+
+_log = idaeslog.getLogger(__name__)
+
+# Columns of the BSM2 dynamic influent files (e.g. dyninfluent_bsm2.ascii):
+# time [d], concentrations of the ASM1 components [g/m3], alkalinity [mol/m3],
+# TSS [g/m3], flow [m3/d], temperature [degC] and dummy states
+BSM2_INFLUENT_COLUMNS = (
+    "time",
+    "S_I",
+    "S_S",
+    "X_I",
+    "X_S",
+    "X_BH",
+    "X_BA",
+    "X_P",
+    "S_O",
+    "S_NO",
+    "S_NH",
+    "S_ND",
+    "X_ND",
+    "S_ALK",
+    "TSS",
+    "flow_vol",
+    "temperature",
+    "S_D1",
+    "S_D2",
+    "S_D3",
+    "X_D4",
+    "X_D5",
+)
+
+_SECONDS_PER_DAY = 86400
+
+
+def main(influent_file, end_time=609, window=1, nfe=24, filename="BSM2_dynamic.csv"):
+    m = build(window=window, nfe=nfe)
+    set_operating_conditions(m)
+    initialize_system(m)
+
+    simulate(m, read_influent(influent_file), end_time, filename)
+
+    return m
+
+
+def build(window=1, nfe=24):
+    """
+    Build the dynamic flowsheet over one time window, discretized by backward
+    finite differences.
+
+    Args:
+        window: (optional) length of the time window [d] (default: 1)
+        nfe: (optional) number of finite elements per window (default: 24)
+    """
+    m = BSM2.build(dynamic=True, time_set=[0, window * _SECONDS_PER_DAY])
+    pyo.TransformationFactory("dae.finite_difference").apply_to(
+        m.fs, nfe=nfe, wrt=m.fs.time, scheme="BACKWARD"
+    )
+
+    # Time indexed Params only have values at the time points they were
+    # built with
+    t0 = m.fs.time.first()
+    for param in m.fs.component_objects(pyo.Param, descend_into=True):
+        if param.mutable and param.index_set() is m.fs.time:
+            for t in m.fs.time:
+                param[t] = param[t0].value
+
+    # Variables indexed by time, as References indexed by time only
+    m.dae_vars = flatten_dae_components(m, m.fs.time, pyo.Var)[1]
+
+    return m
+
+
+def set_operating_conditions(m):
+    """
+    Set the operating conditions of BSM2 at all time points, and fix the
+    initial conditions of the window.
+    """
+    BSM2.set_operating_conditions(m)
+    m.initial_condition_vars = get_initial_condition_vars(m)
+    for var in m.initial_condition_vars:
+        var.fix()
+
+
+def get_initial_condition_vars(m):
+    """
+    Get the variables to fix at the start of the time window to define its
+    initial conditions.
+
+    Holdups with a fixed composition or volume (e.g. water, or oxygen in the
+    aerated reactors) are not independent states, so the initial conditions
+    cannot be all differential variables. They are chosen from a matching of
+    the incidence graph of the flowsheet, preferring differential variables,
+    then their derivatives, so the flowsheet is structurally square.
+
+    Returns:
+        list of the variables at the first time point
+    """
+    time = m.fs.time
+    t0 = time.first()
+    states = []
+    derivatives = []
+    for var in m.component_objects(pyo.Var, descend_into=True):
+        if not isinstance(var, DerivativeVar) or not any(
+            s is time for s in var.get_continuousset_list()
+        ):
+            continue
+        subsets = list(var.index_set().subsets())
+        position = [s is time for s in subsets].index(True)
+        state = var.get_state_var()
+        for index in var:
+            t = index[position] if len(subsets) > 1 else index
+            if t == t0:
+                states.append(state[index])
+                derivatives.append(var[index])
+
+    igraph = IncidenceGraphInterface(m, include_inequality=False)
+    # Matched variables are calculated, so states are the most costly to match
+    weight = {id(v): 3.0 for v in states}
+    weight.update({id(v): 2.0 for v in derivatives})
+    cost = np.array([weight.get(id(v), 1.0) for v in igraph.variables])
+    incidence = igraph.incidence_matrix.tocsr()
+    incidence.data = cost[incidence.indices]
+    try:
+        _, matched = min_weight_full_bipartite_matching(incidence)
+    except ValueError:
+        raise RuntimeError(
+            f"{m.name} is structurally singular; check the degrees of freedom "
+            f"of the flowsheet."
+        )
+    matched = {id(igraph.variables[j]) for j in matched}
+
+    unmatched = [v for v in igraph.variables if id(v) not in matched]
+    initial = [v for v in unmatched if id(v) in weight]
+    if len(initial) != len(unmatched):
+        _log.warning(
+            f"Degrees of freedom of {m.name} other than initial conditions: "
+            f"{[v.name for v in unmatched if id(v) not in weight]}"
+        )
+    return initial
+
+
+def initialize_system(m, steady_state=None):
+    """
+    Initialize all time points of the window from a steady-state solution of
+    the flowsheet, with all derivatives zero.
+
+    Args:
+        steady_state: (optional) solved steady-state BSM2 flowsheet; if not
+            given, it is built, initialized and solved
+    """
+    if steady_state is None:
+        steady_state = BSM2.build()
+        BSM2.set_operating_conditions(steady_state)
+        BSM2.initialize_system(steady_state)
+        BSM2.solve(steady_state)
+
+    t0 = m.fs.time.first()
+    holdups = []
+    for ref in m.dae_vars:
+        if isinstance(ref[t0].parent_component(), DerivativeVar):
+            val = 0
+        else:
+            var = steady_state.find_component(ref[t0].name)
+            if var is None:
+                holdups.append(ref)
+                continue
+            val = var.value
+        for t in m.fs.time:
+            ref[t].set_value(val, skip_validation=True)
+
+    # Holdups are not in the steady-state flowsheet, but are calculated from
+    # its state by the constraints of the control volumes
+    for ref in holdups:
+        for t in m.fs.time:
+            var = ref[t]
+            con = var.parent_block().component(
+                var.parent_component().local_name + "_calculation"
+            )
+            if con is not None and var.index() in con:
+                calculate_variable_from_constraint(var, con[var.index()])
+
+
+def read_influent(filename, columns=None, chunksize=10000, key=None):
+    """
+    Read an influent time series in chunks.
+
+    Files with the .h5 or .hdf5 extension are read with pandas.read_hdf, and
+    must be in table format. Other files are read as comma separated values if
+    they have the .csv extension, else whitespace separated. Files read as
+    comma separated values have a header, unless the columns are given; other
+    files have the columns of BSM2 influent files by default.
+
+    Args:
+        filename: path of the file
+        columns: (optional) names of the columns of a file without header
+        chunksize: (optional) number of rows per chunk (default: 10000)
+        key: (optional) key of the table in an HDF5 file
+
+    Yields:
+        DataFrames of consecutive rows, with a "time" column [d] and columns
+        named as in BSM2_INFLUENT_COLUMNS
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in (".h5", ".hdf5"):
+        reader = pd.read_hdf(filename, key=key, chunksize=chunksize)
+    elif extension == ".csv":
+        reader = pd.read_csv(
+            filename,
+            header=None if columns else "infer",
+            names=columns,
+            chunksize=chunksize,
+        )
+    else:
+        reader = pd.read_csv(
+            filename,
+            sep=r"\s+",
+            header=None,
+            names=columns or BSM2_INFLUENT_COLUMNS,
+            comment="%",
+            chunksize=chunksize,
+        )
+    try:
+        yield from reader
+    finally:
+        reader.close()
+
+
+class InfluentBuffer:
+    """
+    Buffer of an influent time series read as a stream of chunks, holding only
+    the rows needed to interpolate it over the current time window.
+    """
+
+    def __init__(self, chunks):
+        """
+        Args:
+            chunks: iterable of DataFrames of consecutive rows of the
+                influent, with a "time" column [d] (see read_influent)
+        """
+        self._chunks = iter(chunks)
+        self.columns = None
+        self._data = None
+        self._exhausted = False
+
+    def _read(self):
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            return
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        data = chunk[self.columns].to_numpy(dtype=float)
+        self._data = data if self._data is None else np.vstack([self._data, data])
+
+    @property
+    def end_time(self):
+        """
+        Last time of the influent read so far [d]
+        """
+        return None if self._data is None else self._data[-1, 0]
+
+    def interpolate(self, times):
+        """
+        Interpolate the influent linearly at the given times, reading chunks
+        as needed. Values beyond the end of the influent are held constant.
+
+        Args:
+            times: increasing array of times [d]
+
+        Returns:
+            dict mapping column names to arrays of values at the times
+        """
+        while not self._exhausted and (self._data is None or self.end_time < times[-1]):
+            self._read()
+        if self._data is None:
+            raise ValueError("The influent has no rows.")
+        time = self._data[:, 0]
+        return {
+            name: np.interp(times, time, self._data[:, i])
+            for i, name in enumerate(self.columns)
+        }
+
+    def discard_before(self, time):
+        """
+        Discard the rows not needed to interpolate from the given time [d].
+        """
+        if self._data is not None:
+            start = max(np.searchsorted(self._data[:, 0], time, side="right") - 1, 0)
+            self._data = self._data[start:]
+
+
+def set_influent(m, influent):
+    """
+    Fix the feed of the flowsheet at each time point of the window.
+
+    Args:
+        influent: dict mapping columns of BSM2 influent files to arrays of
+            values at each time point, in the units of BSM2 influent files
+    """
+    for i, t in enumerate(m.fs.time):
+        m.fs.FeedWater.flow_vol[t].fix(
+            influent["flow_vol"][i] * pyo.units.m**3 / pyo.units.day
+        )
+        m.fs.FeedWater.temperature[t].fix(influent["temperature"][i] + 273.15)
+        for j in m.fs.props_ASM1.solute_set:
+            m.fs.FeedWater.conc_mass_comp[t, j].fix(
+                influent[j][i] * pyo.units.g / pyo.units.m**3
+            )
+        m.fs.FeedWater.alkalinity[t].fix(
+            influent["S_ALK"][i] * pyo.units.mol / pyo.units.m**3
+        )
+
+
+def shift_window(m):
+    """
+    Carry the final state of the window forward as the initial condition of
+    the next window, and as the initial guess at all its time points.
+    """
+    t_end = m.fs.time.last()
+    for ref in m.dae_vars:
+        val = ref[t_end].value
+        for t in m.fs.time:
+            if t != t_end:
+                ref[t].set_value(val, skip_validation=True)
+
+
+def get_default_outputs(m):
+    """
+    Get the trajectories written by default: flow, concentrations and
+    alkalinity of the treated water, and biogas flow.
+
+    Returns:
+        dict mapping names to components indexed by time
+    """
+    outputs = {"Treated.flow_vol": m.fs.Treated.flow_vol}
+    for j in m.fs.props_ASM1.solute_set:
+        outputs[f"Treated.conc_mass_comp[{j}]"] = m.fs.Treated.conc_mass_comp[:, j]
+    outputs["Treated.alkalinity"] = m.fs.Treated.alkalinity
+    outputs["RADM.vapor_outlet.flow_vol"] = m.fs.RADM.vapor_outlet.flow_vol
+    return outputs
+
+
+def _time_indexed(component):
+    if isinstance(component, pyo.Component):
+        return component
+    return pyo.Reference(component)
+
+
+def simulate(
+    m,
+    influent,
+    end_time,
+    filename,
+    start_time=0,
+    outputs=None,
+    solver=None,
+):
+    """
+    Simulate the flowsheet over rolling time windows, writing the trajectories
+    to a CSV file after each window.
+
+    Args:
+        m: dynamic flowsheet built by ``build``, with operating conditions set
+            and initialized
+        influent: InfluentBuffer, or iterable of DataFrames (see
+            read_influent)
+        end_time: time to simulate to [d]
+        filename: path of the CSV file to write the trajectories to
+        start_time: (optional) time of the influent to start from [d]
+            (default: 0)
+        outputs: (optional) dict mapping names to components indexed by time
+            (or slices) to write (default: ``get_default_outputs``)
+        solver: (optional) solver to use
+
+    Returns:
+        number of windows solved
+    """
+    if not isinstance(influent, InfluentBuffer):
+        influent = InfluentBuffer(influent)
+    if outputs is None:
+        outputs = get_default_outputs(m)
+    outputs = {name: _time_indexed(c) for name, c in outputs.items()}
+
+    times = np.array(list(m.fs.time)) / _SECONDS_PER_DAY
+    window = times[-1] - times[0]
+    t_start = start_time
+    num_windows = 0
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["time [d]"]
+            + [
+                f"{name} [{pyo.units.get_units(c[m.fs.time.first()])}]"
+                for name, c in outputs.items()
+            ]
+        )
+        while t_start < end_time - 1e-9 * window:
+            set_influent(m, influent.interpolate(t_start + times - times[0]))
+            _log.info(f"Solving window from {t_start} d to {t_start + window} d")
+            BSM2.solve(m, solver=solver)
+
+            # The first time point repeats the end of the previous window
+            first = 0 if num_windows == 0 else 1
+            for tau, t in list(zip(times, m.fs.time))[first:]:
+                if t_start + tau - times[0] > end_time + 1e-9 * window:
+                    break
+                writer.writerow(
+                    [t_start + tau - times[0]]
+                    + [pyo.value(c[t]) for c in outputs.values()]
+                )
+            f.flush()
+
+            shift_window(m)
+            t_start += window
+            influent.discard_before(t_start)
+            num_windows += 1
+
+    return num_windows
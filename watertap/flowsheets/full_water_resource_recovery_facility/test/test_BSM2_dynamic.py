@@ -0,0 +1,185 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+"""
+Tests for the dynamic simulation of the full Water Resource Recovery Facility
+flowsheet over rolling time windows.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyomo.environ import value, units as pyunits
+from pyomo.dae import DerivativeVar
+
+from idaes.core.util.model_statistics import degrees_of_freedom
+
+import watertap.flowsheets.full_water_resource_recovery_facility.BSM2_dynamic as BSM2_dynamic
+from watertap.flowsheets.full_water_resource_recovery_facility.BSM2_dynamic import (
+    BSM2_INFLUENT_COLUMNS,
+    InfluentBuffer,
+    read_influent,
+)
+
+
+def _write_influent(path, times):
+    # Constant influent with the default feed of the BSM2 flowsheet
+    row = {
+        "S_I": 27,
+        "S_S": 58,
+        "X_I": 92,
+        "X_S": 363,
+        "X_BH": 50,
+        "X_BA": 0,
+        "X_P": 0,
+        "S_O": 0,
+        "S_NO": 0,
+        "S_NH": 23,
+        "S_ND": 5,
+        "X_ND": 16,
+        "S_ALK": 7,
+        "TSS": 380,
+        "flow_vol": 20648,
+        "temperature": 35,
+    }
+    data = np.zeros((len(times), len(BSM2_INFLUENT_COLUMNS)))
+    data[:, 0] = times
+    for i, name in enumerate(BSM2_INFLUENT_COLUMNS[1:], start=1):
+        data[:, i] = row.get(name, 0)
+    np.savetxt(path, data)
+
+
+@pytest.mark.unit
+def test_influent_buffer(tmp_path):
+    path = str(tmp_path / "influent.ascii")
+    times = np.arange(0, 2, 1 / 96)
+    _write_influent(path, times)
+
+    chunks = read_influent(path, chunksize=10)
+    buffer = InfluentBuffer(chunks)
+    assert buffer.end_time is None
+
+    values = buffer.interpolate(np.array([0, 0.05]))
+    assert buffer.columns == list(BSM2_INFLUENT_COLUMNS)
+    assert values["flow_vol"] == pytest.approx([20648, 20648])
+    # only the chunks needed are read
+    assert buffer.end_time == pytest.approx(times[9])
+
+    buffer.discard_before(0.05)
+    assert buffer._data[0, 0] == pytest.approx(times[4])
+    values = buffer.interpolate(np.array([0.5, 1.0]))
+    assert values["time"] == pytest.approx([0.5, 1.0])
+    assert buffer.end_time == pytest.approx(times[99])
+
+    # values beyond the end are held
+    values = buffer.interpolate(np.array([1.5, 3.0]))
+    assert values["S_NH"] == pytest.approx([23, 23])
+
+
+@pytest.mark.unit
+def test_read_influent_csv(tmp_path):
+    path = str(tmp_path / "influent.csv")
+    pd.DataFrame({"time": [0, 1, 2], "flow_vol": [1, 3, 5]}).to_csv(path, index=False)
+
+    buffer = InfluentBuffer(read_influent(path, chunksize=2))
+    values = buffer.interpolate(np.array([0.5, 1.5]))
+    assert values["flow_vol"] == pytest.approx([2, 4])
+
+    with pytest.raises(ValueError, match="The influent has no rows."):
+        InfluentBuffer([]).interpolate(np.array([0]))
+
+
+class TestDynamicFlowsheet:
+    @pytest.fixture(scope="class")
+    def model(self):
+        m = BSM2_dynamic.build(window=0.5, nfe=2)
+        BSM2_dynamic.set_operating_conditions(m)
+        return m
+
+    @pytest.mark.component
+    def test_build(self, model):
+        m = model
+        assert list(m.fs.time) == [0, 21600, 43200]
+        assert degrees_of_freedom(m) == 0
+
+        t0 = m.fs.time.first()
+        for var in m.initial_condition_vars:
+            assert var.fixed
+            assert var.index()[0] == t0
+        # the initial conditions are mostly holdups
+        num_derivatives = sum(
+            isinstance(var.parent_component(), DerivativeVar)
+            for var in m.initial_condition_vars
+        )
+        assert num_derivatives < len(m.initial_condition_vars) / 10
+        assert m.fs.R3.control_volume.material_holdup[t0, "Liq", "S_NH"].fixed
+        # the oxygen concentration is fixed
+        assert not m.fs.R3.control_volume.material_holdup[t0, "Liq", "S_O"].fixed
+
+        # time indexed Params are defined at all time points
+        assert value(m.fs.TU.energy_electric_flow_vol_inlet[43200]) == pytest.approx(
+            0.01255
+        )
+
+    @pytest.mark.component
+    def test_set_influent(self, model, tmp_path):
+        m = model
+        path = str(tmp_path / "influent.ascii")
+        _write_influent(path, np.arange(0, 1, 1 / 96))
+        buffer = InfluentBuffer(read_influent(path))
+
+        times = np.array(list(m.fs.time)) / 86400
+        BSM2_dynamic.set_influent(m, buffer.interpolate(times))
+        for t in m.fs.time:
+            assert value(
+                pyunits.convert(
+                    m.fs.FeedWater.flow_vol[t], to_units=pyunits.m**3 / pyunits.day
+                )
+            ) == pytest.approx(20648)
+            assert value(m.fs.FeedWater.conc_mass_comp[t, "S_NH"]) == pytest.approx(
+                0.023
+            )
+            assert value(m.fs.FeedWater.alkalinity[t]) == pytest.approx(7e-3)
+            assert value(m.fs.FeedWater.temperature[t]) == pytest.approx(308.15)
+        assert degrees_of_freedom(m) == 0
+
+    @pytest.mark.component
+    def test_shift_window(self, model):
+        m = model
+        holdup = m.fs.R1.control_volume.material_holdup
+        holdup[43200, "Liq", "S_S"].set_value(42)
+        BSM2_dynamic.shift_window(m)
+        for t in m.fs.time:
+            assert holdup[t, "Liq", "S_S"].value == 42
+        assert holdup[0, "Liq", "S_S"].fixed
+
+
+@pytest.mark.requires_idaes_solver
+@pytest.mark.integration
+def test_simulate(tmp_path):
+    path = str(tmp_path / "influent.ascii")
+    _write_influent(path, np.arange(0, 1, 1 / 96))
+    output = str(tmp_path / "trajectories.csv")
+
+    m = BSM2_dynamic.build(window=0.25, nfe=2)
+    BSM2_dynamic.set_operating_conditions(m)
+    BSM2_dynamic.initialize_system(m)
+    steady_flow = value(m.fs.Treated.flow_vol[0])
+
+    num_windows = BSM2_dynamic.simulate(m, read_influent(path), 0.5, output)
+
+    assert num_windows == 2
+    results = pd.read_csv(output)
+    assert list(results["time [d]"]) == pytest.approx([0, 0.125, 0.25, 0.375, 0.5])
+    # the influent is the steady-state feed
+    column = [c for c in results.columns if c.startswith("Treated.flow_vol")][0]
+    assert results[column].to_numpy() == pytest.approx(steady_flow, rel=1e-3)
@@ -16,9 +16,11 @@ from pyomo.environ import (
 )
 
 from parameter_sweep import LinearSample, parameter_sweep
+from watertap.core.util.model_cache import cache_model_template
 from watertap.flowsheets.lsrro import lsrro
 
 
+@cache_model_template
 def _lsrro_presweep(
     number_of_stages=2, A_value=5 / 3.6e11, permeate_quality_limit=1000e-6, has_CP=True
 ):
@@ -29,6 +29,7 @@ from pyomo.environ import (
     check_optimal_termination,
 )
 from pyomo.environ import units as pyunits
+from pyomo.common.config import ConfigValue, Bool
 
 # Import IDAES cores
 from idaes.core import (
@@ -62,6 +63,10 @@ from idaes.core.util.exceptions import (
 import idaes.core.util.scaling as iscale
 
 from watertap.core.util.scaling import transform_property_constraints
+from watertap.core.util.property_correlations import (
+    correlation_coefficients,
+    horner,
+)
 
 # Set up logger
 _log = idaeslog.getLogger(__name__)
@@ -71,6 +76,20 @@ _log = idaeslog.getLogger(__name__)
 class NaClParameterData(PhysicalParameterBlock):
     CONFIG = PhysicalParameterBlock.CONFIG()
 
+    CONFIG.declare(
+        "compiled_correlations",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Build correlations in compact Horner form",
+            doc="""If True, the density, viscosity, diffusivity and osmotic coefficient
+correlations are built in Horner form with their parameters as dimensionless
+coefficients, giving smaller expressions which are faster to
+construct, write and differentiate for models with many state blocks.
+**default** - False.""",
+        ),
+    )
+
     def build(self):
         """
         Callable method for Block construction.
@@ -110,7 +129,7 @@ class NaClParameterData(PhysicalParameterBlock):
         # mass density parameters, eq 4 in Bartholomew
         dens_mass_param_dict = {"0": 995, "1": 756}
         self.dens_mass_param = Var(
-            dens_mass_param_dict.keys(),
+            list(dens_mass_param_dict),
             domain=Reals,
             initialize=dens_mass_param_dict,
             units=pyunits.kg / pyunits.m**3,
@@ -120,7 +139,7 @@ class NaClParameterData(PhysicalParameterBlock):
         # dynamic viscosity parameters, eq 5 in Bartholomew
         visc_d_param_dict = {"0": 9.80e-4, "1": 2.15e-3}
         self.visc_d_param = Var(
-            visc_d_param_dict.keys(),
+            list(visc_d_param_dict),
             domain=Reals,
             initialize=visc_d_param_dict,
             units=pyunits.Pa * pyunits.s,
@@ -136,7 +155,7 @@ class NaClParameterData(PhysicalParameterBlock):
             "4": 1.53e-7,
         }
         self.diffus_param = Var(
-            diffus_param_dict.keys(),
+            list(diffus_param_dict),
             domain=Reals,
             initialize=diffus_param_dict,
             units=pyunits.m**2 / pyunits.s,
@@ -146,7 +165,7 @@ class NaClParameterData(PhysicalParameterBlock):
         # osmotic coefficient parameters, eq. 3b in Bartholomew
         osm_coeff_param_dict = {"0": 0.918, "1": 8.89e-2, "2": 4.92}
         self.osm_coeff_param = Var(
-            osm_coeff_param_dict.keys(),
+            list(osm_coeff_param_dict),
             domain=Reals,
             initialize=osm_coeff_param_dict,
             units=pyunits.dimensionless,
@@ -532,6 +551,13 @@ class NaClStateBlockData(StateBlockData):
         )
 
         def rule_dens_mass_phase(b, p):  # density, eq. 4 in Bartholomew
+            if b.params.config.compiled_correlations:
+                c = correlation_coefficients(
+                    b.params.dens_mass_param["0"], b.params.dens_mass_param["1"]
+                )
+                return b.dens_mass_phase[p] == horner(
+                    b.mass_frac_phase_comp[p, "NaCl"], c
+                ) * (pyunits.kg * pyunits.m**-3)
             return (
                 b.dens_mass_phase[p]
                 == b.params.dens_mass_param["1"] * b.mass_frac_phase_comp[p, "NaCl"]
@@ -665,6 +691,13 @@ class NaClStateBlockData(StateBlockData):
         )
 
         def rule_visc_d_phase(b, p):  # dynamic viscosity, eq 5 in Bartholomew
+            if b.params.config.compiled_correlations:
+                c = correlation_coefficients(
+                    b.params.visc_d_param["0"], b.params.visc_d_param["1"]
+                )
+                return b.visc_d_phase[p] == horner(
+                    b.mass_frac_phase_comp[p, "NaCl"], c
+                ) * (pyunits.Pa * pyunits.s)
             return (
                 b.visc_d_phase[p]
                 == b.params.visc_d_param["1"] * b.mass_frac_phase_comp[p, "NaCl"]
@@ -686,6 +719,13 @@ class NaClStateBlockData(StateBlockData):
         )
 
         def rule_diffus_phase_comp(b, p, j):  # diffusivity, eq 6 in Bartholomew
+            if b.params.config.compiled_correlations:
+                c = correlation_coefficients(
+                    *(b.params.diffus_param[str(i)] for i in range(5))
+                )
+                return b.diffus_phase_comp[p, j] == horner(
+                    b.mass_frac_phase_comp[p, "NaCl"], c
+                ) * (pyunits.m**2 * pyunits.s**-1)
             return b.diffus_phase_comp[p, j] == (
                 b.params.diffus_param["4"] * b.mass_frac_phase_comp[p, "NaCl"] ** 4
                 + b.params.diffus_param["3"] * b.mass_frac_phase_comp[p, "NaCl"] ** 3
@@ -707,6 +747,11 @@ class NaClStateBlockData(StateBlockData):
         )
 
         def rule_osm_coeff(b):
+            if b.params.config.compiled_correlations:
+                c = correlation_coefficients(
+                    *(b.params.osm_coeff_param[str(i)] for i in range(3))
+                )
+                return b.osm_coeff == horner(b.mass_frac_phase_comp["Liq", "NaCl"], c)
             return b.osm_coeff == (
                 b.params.osm_coeff_param["2"]
                 * b.mass_frac_phase_comp["Liq", "NaCl"] ** 2
@@ -32,6 +32,7 @@ from pyomo.environ import (
     check_optimal_termination,
 )
 from pyomo.environ import units as pyunits
+from pyomo.common.config import ConfigValue, Bool
 
 # Import IDAES cores
 from idaes.core import (
@@ -63,6 +64,10 @@ from idaes.core.util.exceptions import (
 )
 import idaes.core.util.scaling as iscale
 from watertap.core.util.scaling import transform_property_constraints
+from watertap.core.util.property_correlations import (
+    correlation_coefficients,
+    horner,
+)
 
 # Set up logger
 _log = idaeslog.getLogger(__name__)
@@ -74,6 +79,20 @@ class SeawaterParameterData(PhysicalParameterBlock):
 
     CONFIG = PhysicalParameterBlock.CONFIG()
 
+    CONFIG.declare(
+        "compiled_correlations",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Build correlations in compact Horner form",
+            doc="""If True, the density, viscosity, osmotic coefficient, enthalpy
+and vapor pressure correlations are built in Horner form with their
+parameters as dimensionless coefficients, giving smaller expressions which are
+faster to construct, write and differentiate for models with many state blocks.
+**default** - False.""",
+        ),
+    )
+
     def build(self):
         """
         Callable method for Block construction.
@@ -1095,6 +1114,20 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 8, 0-180 C, 0-150 g/kg, 0-12 MPa
         def rule_dens_mass_phase(b, p):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                s = b.mass_frac_phase_comp[p, "TDS"]
+                B = correlation_coefficients(
+                    b.params.dens_mass_param_B1,
+                    b.params.dens_mass_param_B2,
+                    b.params.dens_mass_param_B3,
+                    b.params.dens_mass_param_B4,
+                    b.params.dens_mass_param_B5,
+                )
+                return b.dens_mass_phase[p] == b.dens_mass_solvent + horner(
+                    s, [0, horner(t, B[:4]), horner(t, [0, 0, B[4]])]
+                ) * (pyunits.kg * pyunits.m**-3)
+
             t = b.temperature - 273.15 * pyunits.K
             s = b.mass_frac_phase_comp[p, "TDS"]
             dens_mass = (
@@ -1121,6 +1154,19 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 8, 0-180 C
         def rule_dens_mass_solvent(b):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                A = correlation_coefficients(
+                    b.params.dens_mass_param_A1,
+                    b.params.dens_mass_param_A2,
+                    b.params.dens_mass_param_A3,
+                    b.params.dens_mass_param_A4,
+                    b.params.dens_mass_param_A5,
+                )
+                return b.dens_mass_solvent == horner(t, A) * (
+                    pyunits.kg * pyunits.m**-3
+                )
+
             t = b.temperature - 273.15 * pyunits.K
             dens_mass_w = (
                 b.params.dens_mass_param_A1
@@ -1257,6 +1303,30 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 22 and 23, 0-180 C, 0-150 g/kg
         def rule_visc_d_phase(b, p):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                s = b.mass_frac_phase_comp[p, "TDS"]
+                muw_A, muw_B, muw_C, muw_D = correlation_coefficients(
+                    b.params.visc_d_param_muw_A,
+                    b.params.visc_d_param_muw_B,
+                    b.params.visc_d_param_muw_C,
+                    b.params.visc_d_param_muw_D,
+                )
+                A = correlation_coefficients(
+                    b.params.visc_d_param_A_1,
+                    b.params.visc_d_param_A_2,
+                    b.params.visc_d_param_A_3,
+                )
+                B = correlation_coefficients(
+                    b.params.visc_d_param_B_1,
+                    b.params.visc_d_param_B_2,
+                    b.params.visc_d_param_B_3,
+                )
+                mu_w = muw_A + (muw_B * (t + muw_C) ** 2 - muw_D) ** -1
+                return b.visc_d_phase[p] == mu_w * horner(
+                    s, [1, horner(t, A), horner(t, B)]
+                ) * (pyunits.Pa * pyunits.s)
+
             # temperature in degC, but pyunits are K
             t = b.temperature - 273.15 * pyunits.K
             s = b.mass_frac_phase_comp[p, "TDS"]
@@ -1319,6 +1389,30 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 49, 0-200 C, 0-120 g/kg
         def rule_osm_coeff(b):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                s = b.mass_frac_phase_comp["Liq", "TDS"]
+                c = correlation_coefficients(
+                    b.params.osm_coeff_param_1,
+                    b.params.osm_coeff_param_2,
+                    b.params.osm_coeff_param_3,
+                    b.params.osm_coeff_param_4,
+                    b.params.osm_coeff_param_5,
+                    b.params.osm_coeff_param_6,
+                    b.params.osm_coeff_param_7,
+                    b.params.osm_coeff_param_8,
+                    b.params.osm_coeff_param_9,
+                    b.params.osm_coeff_param_10,
+                )
+                return b.osm_coeff == horner(
+                    s,
+                    [
+                        horner(t, [c[0], c[1], c[2], 0, c[3]]),
+                        horner(t, [c[4], c[5], 0, c[6]]),
+                        horner(t, c[7:10]),
+                    ],
+                )
+
             s = b.mass_frac_phase_comp["Liq", "TDS"]
             # temperature in degC, but pyunits are still K
             t = b.temperature - 273.15 * pyunits.K
@@ -1375,6 +1469,49 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Nayar et al. (2016), eq. 25 and 26, 10-120 C, 0-120 g/kg, 0-12 MPa
         def rule_enth_mass_phase(b, p):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                S = b.mass_frac_phase_comp[p, "TDS"]
+                P_MPa = (b.pressure / pyunits.Pa - 101325) * 1e-6
+                C = correlation_coefficients(
+                    b.params.enth_mass_param_C1,
+                    b.params.enth_mass_param_C2,
+                    b.params.enth_mass_param_C3,
+                    b.params.enth_mass_param_C4,
+                )
+                B = correlation_coefficients(
+                    *(getattr(b.params, f"enth_mass_param_B{i}") for i in range(1, 11))
+                )
+                A = correlation_coefficients(
+                    b.params.enth_mass_param_A1,
+                    b.params.enth_mass_param_A2,
+                    b.params.enth_mass_param_A3,
+                    b.params.enth_mass_param_A4,
+                )
+                # salinity in g/kg in the pressure term
+                A_S = correlation_coefficients(
+                    b.params.enth_mass_param_A5,
+                    b.params.enth_mass_param_A6,
+                    b.params.enth_mass_param_A7,
+                    b.params.enth_mass_param_A8,
+                    scale=1000,
+                )
+                h_sw = (
+                    horner(t, C)
+                    - S
+                    * horner(
+                        S,
+                        [
+                            horner(t, [B[0], B[4], B[5], B[6]]),
+                            horner(t, [B[1], B[7], B[9]]),
+                            horner(t, [B[2], B[8]]),
+                            B[3],
+                        ],
+                    )
+                    + P_MPa * (horner(t, A) + S * horner(t, A_S))
+                )
+                return b.enth_mass_phase[p] == h_sw * (pyunits.J * pyunits.kg**-1)
+
             # temperature in degC, but pyunits in K
             t = b.temperature - 273.15 * pyunits.K
             S_kg_kg = b.mass_frac_phase_comp[p, "TDS"]
@@ -1437,6 +1574,25 @@ class SeawaterStateBlockData(StateBlockData):
 
         # Nayar et al.(2016), eq. 5 and 6, 0-180 C, 0-160 g/kg
         def rule_pressure_sat(b):
+            if b.params.config.compiled_correlations:
+                T = b.temperature / pyunits.K
+                A = correlation_coefficients(
+                    *(
+                        getattr(b.params, f"pressure_sat_param_psatw_A{i}")
+                        for i in range(1, 7)
+                    )
+                )
+                # salinity in g/kg
+                B = correlation_coefficients(
+                    b.params.pressure_sat_param_B1, scale=1e3
+                ) + correlation_coefficients(b.params.pressure_sat_param_B2, scale=1e6)
+                return b.pressure_sat == exp(
+                    A[0] / T
+                    + horner(T, A[1:5])
+                    + A[5] * log(T)
+                    + horner(b.mass_frac_phase_comp["Liq", "TDS"], [0] + B)
+                ) * (pyunits.Pa)
+
             t = b.temperature
             s = b.mass_frac_phase_comp["Liq", "TDS"] * 1000 * pyunits.g / pyunits.kg
             psatw = (
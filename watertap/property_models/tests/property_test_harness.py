@@ -22,6 +22,7 @@ from pyomo.environ import (
     value,
     assert_optimal_termination,
 )
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
 from pyomo.util.check_units import assert_units_consistent
 from idaes.core import FlowsheetBlock, ControlVolume0DBlock
 from idaes.core.util.model_statistics import (
@@ -631,3 +632,47 @@ class PropertyCalculateStateTest:
             raise PropertyValueError(
                 "The following variable(s) are poorly scaled: {lst}".format(lst=lst)
             )
+
+
+def check_compiled_correlations(param_block_class, state, properties):
+    """
+    Check that the property correlations built with compiled_correlations=True
+    give the same values as the original expressions.
+
+    Args:
+        param_block_class: property parameter block class with a
+            compiled_correlations config option
+        state: dict mapping names of state variables to their value, or to a
+            dict of values by index
+        properties: list of names of properties to compare, each calculated
+            from its constraint eq_<name>
+    """
+    results = []
+    for compiled in (False, True):
+        m = ConcreteModel()
+        m.fs = FlowsheetBlock(dynamic=False)
+        m.fs.properties = param_block_class(compiled_correlations=compiled)
+        m.fs.sb = m.fs.properties.build_state_block([0], defined_state=True)
+        sb = m.fs.sb[0]
+        for name, val in state.items():
+            var = getattr(sb, name)
+            if isinstance(val, dict):
+                for index, v in val.items():
+                    var[index].fix(v)
+            else:
+                var.fix(val)
+        for name in properties:
+            var = getattr(sb, name)
+            for index, con in getattr(sb, "eq_" + name).items():
+                calculate_variable_from_constraint(var[index], con)
+        assert_units_consistent(m)
+        results.append(
+            {
+                (name, index): var.value
+                for name in properties
+                for index, var in getattr(sb, name).items()
+            }
+        )
+
+    for key, val in results[0].items():
+        assert results[1][key] == pytest.approx(val, rel=1e-12)
@@ -19,6 +19,7 @@ from watertap.property_models.tests.property_test_harness import (
     PropertyTestHarness,
     PropertyRegressionTest,
     PropertyCalculateStateTest,
+    check_compiled_correlations,
 )
 
 
@@ -256,3 +257,22 @@ class TestNaClCalculateState_3(PropertyCalculateStateTest):
             ("flow_mass_phase_comp", ("Liq", "H2O")): 0.9608,
             ("flow_mass_phase_comp", ("Liq", "NaCl")): 0.1151,
         }
+
+
+@pytest.mark.component
+def test_compiled_correlations():
+    check_compiled_correlations(
+        props.NaClParameterBlock,
+        {
+            "flow_mass_phase_comp": {("Liq", "H2O"): 0.95, ("Liq", "NaCl"): 0.05},
+            "temperature": 298.15,
+            "pressure": 101325,
+        },
+        [
+            "mass_frac_phase_comp",
+            "dens_mass_phase",
+            "visc_d_phase",
+            "diffus_phase_comp",
+            "osm_coeff",
+        ],
+    )
@@ -18,6 +18,7 @@ from watertap.property_models.tests.property_test_harness import (
     PropertyTestHarness,
     PropertyRegressionTest,
     PropertyCalculateStateTest,
+    check_compiled_correlations,
 )
 
 
@@ -332,3 +333,24 @@ class TestSeawaterCalculateState_5(PropertyCalculateStateTest):
             ("flow_mass_phase_comp", ("Liq", "TDS")): 1239.69,
             ("enth_mass_phase", "Liq"): 3.8562e5,
         }
+
+
+@pytest.mark.component
+def test_compiled_correlations():
+    check_compiled_correlations(
+        props.SeawaterParameterBlock,
+        {
+            "flow_mass_phase_comp": {("Liq", "H2O"): 0.95, ("Liq", "TDS"): 0.05},
+            "temperature": 320,
+            "pressure": 5e6,
+        },
+        [
+            "mass_frac_phase_comp",
+            "dens_mass_solvent",
+            "dens_mass_phase",
+            "visc_d_phase",
+            "osm_coeff",
+            "enth_mass_phase",
+            "pressure_sat",
+        ],
+    )
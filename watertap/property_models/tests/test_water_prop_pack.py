@@ -17,6 +17,7 @@ from idaes.models.properties.tests.test_harness import (
 from watertap.property_models.tests.property_test_harness import (
     PropertyTestHarness,
     PropertyRegressionTest,
+    check_compiled_correlations,
 )
 
 
@@ -136,3 +137,22 @@ class TestWaterPropertySolution_2(PropertyRegressionTest):
             ("visc_d_phase", "Liq"): 2.819e-4,
             ("therm_cond_phase", "Liq"): 0.6756,
         }
+
+
+@pytest.mark.component
+def test_compiled_correlations():
+    check_compiled_correlations(
+        props.WaterParameterBlock,
+        {
+            "flow_mass_phase_comp": {("Liq", "H2O"): 0.9, ("Vap", "H2O"): 0.1},
+            "temperature": 340,
+            "pressure": 2e5,
+        },
+        [
+            "dens_mass_phase",
+            "dh_vap_mass",
+            "enth_mass_phase",
+            "pressure_sat",
+            "visc_d_phase",
+        ],
+    )
@@ -32,6 +32,7 @@ from pyomo.environ import (
     check_optimal_termination,
 )
 from pyomo.environ import units as pyunits
+from pyomo.common.config import ConfigValue, Bool
 
 # Import IDAES cores
 from idaes.core import (
@@ -62,6 +63,10 @@ from idaes.core.util.exceptions import (
 )
 import idaes.core.util.scaling as iscale
 from watertap.core.util.scaling import transform_property_constraints
+from watertap.core.util.property_correlations import (
+    correlation_coefficients,
+    horner,
+)
 
 # Set up logger
 _log = idaeslog.getLogger(__name__)
@@ -73,6 +78,20 @@ class WaterParameterData(PhysicalParameterBlock):
 
     CONFIG = PhysicalParameterBlock.CONFIG()
 
+    CONFIG.declare(
+        "compiled_correlations",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Build correlations in compact Horner form",
+            doc="""If True, the liquid density, viscosity, enthalpy and vapor pressure
+correlations are built in Horner form with their parameters as dimensionless
+coefficients, giving smaller expressions which are faster to
+construct, write and differentiate for models with many state blocks.
+**default** - False.""",
+        ),
+    )
+
     def build(self):
         """
         Callable method for Block construction.
@@ -770,6 +789,18 @@ class WaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 8, 0-180 C
         def rule_dens_mass_phase(b, phase):
+            if phase == "Liq" and b.params.config.compiled_correlations:
+                A = correlation_coefficients(
+                    b.params.dens_mass_param_A1,
+                    b.params.dens_mass_param_A2,
+                    b.params.dens_mass_param_A3,
+                    b.params.dens_mass_param_A4,
+                    b.params.dens_mass_param_A5,
+                )
+                return b.dens_mass_phase[phase] == horner(
+                    b.temperature / pyunits.K - 273.15, A
+                ) * (pyunits.kg * pyunits.m**-3)
+
             t = b.temperature - 273.15 * pyunits.K
             if phase == "Liq":
                 dens_mass = (
@@ -872,6 +903,29 @@ class WaterStateBlockData(StateBlockData):
 
         # Nayar et al. (2016), eq. 25 and 26, 0-120 C
         def rule_enth_mass_phase(b, p):
+            if b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                P_MPa = (b.pressure / pyunits.Pa - 101325) * 1e-6
+                C = correlation_coefficients(
+                    b.params.enth_mass_param_C1,
+                    b.params.enth_mass_param_C2,
+                    b.params.enth_mass_param_C3,
+                    b.params.enth_mass_param_C4,
+                )
+                A = correlation_coefficients(
+                    b.params.enth_mass_param_A1,
+                    b.params.enth_mass_param_A2,
+                    b.params.enth_mass_param_A3,
+                    b.params.enth_mass_param_A4,
+                )
+                h_w_P = (horner(t, C) + P_MPa * horner(t, A)) * (
+                    pyunits.J * pyunits.kg**-1
+                )
+                if p == "Liq":
+                    return b.enth_mass_phase[p] == h_w_P
+                else:
+                    return b.enth_mass_phase[p] == h_w_P + b.dh_vap_mass
+
             # temperature in degC, but pyunits in K
             t = b.temperature - 273.15 * pyunits.K
             P = b.pressure - 101325 * pyunits.Pa
@@ -912,6 +966,18 @@ class WaterStateBlockData(StateBlockData):
 
         # Nayar et al.(2016), eq. 5 and 6, 0-180 C
         def rule_pressure_sat(b):
+            if b.params.config.compiled_correlations:
+                T = b.temperature / pyunits.K
+                A = correlation_coefficients(
+                    *(
+                        getattr(b.params, f"pressure_sat_param_psatw_A{i}")
+                        for i in range(1, 7)
+                    )
+                )
+                return b.pressure_sat == exp(
+                    A[0] / T + horner(T, A[1:5]) + A[5] * log(T)
+                ) * (pyunits.Pa)
+
             t = b.temperature
             psatw = (
                 exp(
@@ -1019,7 +1085,18 @@ class WaterStateBlockData(StateBlockData):
 
         # Sharqawy et al. (2010), eq. 22 and 23, 0-180 C
         def rule_visc_d_phase(b, p):
-            if p == "Liq":
+            if p == "Liq" and b.params.config.compiled_correlations:
+                t = b.temperature / pyunits.K - 273.15
+                muw_A, muw_B, muw_C, muw_D = correlation_coefficients(
+                    b.params.visc_d_param_muw_A,
+                    b.params.visc_d_param_muw_B,
+                    b.params.visc_d_param_muw_C,
+                    b.params.visc_d_param_muw_D,
+                )
+                return b.visc_d_phase[p] == (
+                    muw_A + (muw_B * (t + muw_C) ** 2 - muw_D) ** -1
+                ) * (pyunits.Pa * pyunits.s)
+            elif p == "Liq":
                 t = b.temperature - 273.15 * pyunits.K
                 # temp. in degC, but pyunits are K
                 mu_w = (
@@ -11,5 +11,7 @@
 #################################################################################
 from . import credentials
 from . import client
-from .client import OLIApi
+from .client import OLIApi, PollingStrategy
 from .credentials import CredentialManager
+from .cache import FlashResultCache
+from .checkpoint import SurveyCheckpoint
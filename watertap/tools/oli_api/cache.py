@@ -0,0 +1,207 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+
+def canonical_json(content):
+    """
+    Serialize JSON-compatible content with sorted keys and no whitespace.
+
+    :param content: JSON-compatible object
+
+    :return canonical: string that is identical for equal content
+    """
+
+    return json.dumps(content, sort_keys=True, separators=(",", ":"))
+
+
+def hash_content(content):
+    """
+    Get SHA-256 hex digest of bytes, or of the canonical JSON of other content.
+
+    :param content: bytes, or JSON-compatible object
+
+    :return digest: string hex digest
+    """
+
+    if not isinstance(content, bytes):
+        content = canonical_json(content).encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+class FlashResultCache:
+    """
+    A class to store OLI flash results on disk, keyed by their inputs.
+
+    Entries live in a SQLite database and are evicted least-recently-used first
+    once the total size of stored results exceeds max_size.
+    """
+
+    def __init__(self, file_name="./oli_flash_cache.sqlite", max_size=2**30):
+        """
+        Construct all necessary attributes for FlashResultCache class.
+
+        :param file_name: string path to SQLite database file (":memory:" for no file)
+        :param max_size: integer for maximum bytes of stored results before eviction
+        """
+
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, not {max_size}.")
+        self.max_size = max_size
+        if file_name == ":memory:":
+            self.file_name = file_name
+        else:
+            self.file_name = Path(file_name).resolve()
+        self._lock = threading.Lock()
+        # one connection shared by all threads, serialized by the lock
+        self._connection = sqlite3.connect(str(self.file_name), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "last_used INTEGER NOT NULL)"
+            )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return row[0]
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def get_key(dbs_key, flash_method, input_params):
+        """
+        Get cache key for a flash calculation.
+
+        :param dbs_key: string for DBS file ID or hash of DBS file content
+        :param flash_method: string for flash calculation name
+        :param input_params: dictionary for flash calculation inputs
+
+        :return key: string hex digest identifying the calculation
+        """
+
+        return hash_content(
+            {
+                "dbs": dbs_key,
+                "flash_method": flash_method,
+                "input_params": input_params,
+            }
+        )
+
+    def get(self, key):
+        """
+        Get a stored result.
+
+        :param key: string cache key
+
+        :return result: dictionary for stored result, or None if not stored
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE results SET last_used = "
+                    "(SELECT MAX(last_used) + 1 FROM results) WHERE key = ?",
+                    (key,),
+                )
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """
+        Store a result, evicting least-recently-used entries if needed.
+
+        :param key: string cache key
+        :param result: JSON-compatible dictionary for flash result
+        """
+
+        value = json.dumps(result)
+        size = len(value)
+        if size > self.max_size:
+            _logger.debug(f"Result for {key} exceeds cache size; not stored.")
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES "
+                "(?, ?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM results))",
+                (key, value, size),
+            )
+            total_size = self._connection.execute(
+                "SELECT SUM(size) FROM results"
+            ).fetchone()[0]
+            while total_size > self.max_size:
+                oldest_key, oldest_size = self._connection.execute(
+                    "SELECT key, size FROM results ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                self._connection.execute(
+                    "DELETE FROM results WHERE key = ?", (oldest_key,)
+                )
+                total_size -= oldest_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Delete all stored results and reset statistics.
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_statistics(self):
+        """
+        Get cache usage statistics.
+
+        :return statistics: dictionary for hits, misses, hit rate, evictions, entries and size
+        """
+
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size": size,
+            }
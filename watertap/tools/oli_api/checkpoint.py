@@ -0,0 +1,205 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SUBMITTED = "submitted"
+PROCESSED = "processed"
+FAILED = "failed"
+
+
+class SurveyCheckpoint:
+    """
+    A class to persist the status and result of each sample in an OLI survey.
+
+    Samples are identified by a key derived from their inputs, so re-running the
+    same survey against a checkpoint file only processes samples that are not yet
+    processed, retrying failed samples until max_attempts is reached.
+    """
+
+    def __init__(self, file_name, max_attempts=3):
+        """
+        Construct all necessary attributes for SurveyCheckpoint class.
+
+        :param file_name: string path to SQLite checkpoint file
+        :param max_attempts: integer for number of tries per sample (over all runs) before it is left failed
+        """
+
+        if max_attempts < 1:
+            raise ValueError(
+                f"max_attempts must be a positive integer, not {max_attempts}."
+            )
+        self.max_attempts = max_attempts
+        self.file_name = Path(file_name).resolve()
+        self._lock = threading.Lock()
+        # one connection shared by all threads, serialized by the lock
+        self._connection = sqlite3.connect(str(self.file_name), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS samples ("
+                "idx INTEGER PRIMARY KEY, "
+                "key TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL, "
+                "result TEXT, "
+                "error TEXT)"
+            )
+
+    def close(self):
+        """
+        Close the checkpoint file.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def start(self, sample_keys):
+        """
+        Register the samples of a survey and get those still to be processed.
+
+        :param sample_keys: list of strings identifying each sample's inputs
+
+        :return indices: list of sample indices that are not processed and have attempts left
+        """
+
+        with self._lock, self._connection:
+            rows = self._connection.execute(
+                "SELECT idx, key FROM samples ORDER BY idx"
+            ).fetchall()
+            if not rows:
+                self._connection.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, 0, NULL, NULL)",
+                    [(idx, key, PENDING) for idx, key in enumerate(sample_keys)],
+                )
+            elif [key for _, key in rows] != list(sample_keys):
+                raise RuntimeError(
+                    f"Checkpoint file {self.file_name} belongs to a different survey."
+                )
+            # samples interrupted while in flight are submitted again
+            self._connection.execute(
+                "UPDATE samples SET status = ? WHERE status = ?",
+                (PENDING, SUBMITTED),
+            )
+            rows = self._connection.execute(
+                "SELECT idx FROM samples WHERE status = ? "
+                "OR (status = ? AND attempts < ?) ORDER BY idx",
+                (PENDING, FAILED, self.max_attempts),
+            ).fetchall()
+        indices = [idx for (idx,) in rows]
+        _logger.info(
+            f"Checkpoint {self.file_name}: {len(indices)} of {len(sample_keys)} "
+            + "samples to process."
+        )
+        return indices
+
+    def mark_submitted(self, index):
+        """
+        Record that a sample was submitted.
+
+        :param index: integer for sample index
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE samples SET status = ?, attempts = attempts + 1 WHERE idx = ?",
+                (SUBMITTED, index),
+            )
+
+    def mark_processed(self, index, result):
+        """
+        Record the result of a processed sample.
+
+        :param index: integer for sample index
+        :param result: JSON-compatible dictionary for sample result
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE samples SET status = ?, result = ?, error = NULL WHERE idx = ?",
+                (PROCESSED, json.dumps(result), index),
+            )
+
+    def mark_failed(self, index, error):
+        """
+        Record that a sample failed.
+
+        :param index: integer for sample index
+        :param error: exception or message describing the failure
+
+        :return retry: bool indicating whether the sample has attempts left
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE samples SET status = ?, error = ? WHERE idx = ?",
+                (FAILED, str(error), index),
+            )
+            (attempts,) = self._connection.execute(
+                "SELECT attempts FROM samples WHERE idx = ?", (index,)
+            ).fetchone()
+        return attempts < self.max_attempts
+
+    def get_processed_results(self):
+        """
+        Get results of processed samples.
+
+        :return results: generator of (index, result) for processed samples
+        """
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT idx FROM samples WHERE status = ? ORDER BY idx",
+                (PROCESSED,),
+            ).fetchall()
+        # load one result at a time so payloads are not all held together
+        for (idx,) in rows:
+            with self._lock:
+                (result,) = self._connection.execute(
+                    "SELECT result FROM samples WHERE idx = ?", (idx,)
+                ).fetchone()
+            yield idx, json.loads(result)
+
+    def get_failures(self):
+        """
+        Get errors of failed samples.
+
+        :return failures: dictionary mapping sample index to error message
+        """
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT idx, error FROM samples WHERE status = ? ORDER BY idx",
+                (FAILED,),
+            ).fetchall()
+        return dict(rows)
+
+    def get_status_counts(self):
+        """
+        Get number of samples in each status.
+
+        :return counts: dictionary mapping status to number of samples
+        """
+
+        counts = {PENDING: 0, SUBMITTED: 0, PROCESSED: 0, FAILED: 0}
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM samples GROUP BY status"
+            ).fetchall()
+        counts.update(rows)
+        return counts
@@ -52,10 +52,16 @@ import logging
 import sys
 import json
 import time
+import random
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pyomo.common.dependencies import attempt_import
 
 requests, requests_available = attempt_import("requests", defer_import=False)
 from watertap.tools.oli_api.util.watertap_to_oli_helper_functions import get_oli_name
+from watertap.tools.oli_api.cache import FlashResultCache, hash_content
 
 
 _logger = logging.getLogger(__name__)
@@ -68,21 +74,103 @@ _logger.addHandler(handler)
 _logger.setLevel(logging.DEBUG)
 
 
+class PollingStrategy:
+    """
+    A class to schedule waits between OLI Cloud requests.
+
+    Waits start short and grow exponentially (with random jitter) up to a ceiling,
+    until a wall-clock deadline is reached.
+    """
+
+    def __init__(
+        self,
+        initial_delay=0.1,
+        max_delay=5.0,
+        growth_factor=2.0,
+        jitter=0.25,
+        timeout=600.0,
+    ):
+        """
+        Construct all necessary attributes for PollingStrategy class.
+
+        :param initial_delay: float for seconds to wait before the first poll
+        :param max_delay: float for ceiling on seconds between polls
+        :param growth_factor: float multiplying the wait after each poll
+        :param jitter: float for relative random variation applied to each wait
+        :param timeout: float for seconds after which polling gives up
+        """
+
+        if initial_delay < 0 or max_delay < initial_delay:
+            raise ValueError(
+                "Expected 0 <= initial_delay <= max_delay, "
+                + f"got initial_delay={initial_delay}, max_delay={max_delay}."
+            )
+        if growth_factor < 1:
+            raise ValueError(f"growth_factor must be >= 1, not {growth_factor}.")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"jitter must be in [0, 1), not {jitter}.")
+        if timeout <= 0:
+            raise ValueError(f"timeout must be positive, not {timeout}.")
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.growth_factor = growth_factor
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def delays(self):
+        """
+        Generate successive waits until the timeout elapses.
+
+        :return delay: generator of floats for seconds to wait before the next request
+        """
+
+        deadline = time.monotonic() + self.timeout
+        delay = self.initial_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            wait = delay * (1 + random.uniform(-self.jitter, self.jitter))
+            yield min(wait, remaining)
+            delay = min(delay * self.growth_factor, self.max_delay)
+
+
 class OLIApi:
     """
     A class to wrap OLI Cloud API calls and access functions for interfacing with WaterTAP.
     """
 
-    def __init__(self, credential_manager, interactive_mode=True, debug_level="INFO"):
+    def __init__(
+        self,
+        credential_manager,
+        interactive_mode=True,
+        debug_level="INFO",
+        polling_strategy=None,
+        result_cache=None,
+        max_request_timings=10000,
+    ):
         """
         Construct all necessary attributes for OLIApi class.
 
         :param credential_manager_class: class used to manage credentials
         :param interactive_mode: enables direct interaction with user through prompts
         :param debug_level: string defining level of logging activity
+        :param polling_strategy: PollingStrategy used to wait for results and retry requests
+        :param result_cache: FlashResultCache consulted before submitting flash requests, if any
+        :param max_request_timings: integer for number of most recent per-request timing records to keep
         """
 
         self.credential_manager = credential_manager
+        self.polling_strategy = (
+            PollingStrategy() if polling_strategy is None else polling_strategy
+        )
+        # most recent per-request timing records, appended by call()
+        self.request_timings = deque(maxlen=max_request_timings)
+        self._num_request_timings = 0
+        self._timings_lock = threading.Lock()
+        self.result_cache = result_cache
+        # DBS file ID -> hash of DBS content, so cache keys survive re-uploads
+        self.dbs_file_hashes = {}
         self.interactive_mode = interactive_mode
         if self.interactive_mode:
             _logger.info(
@@ -96,6 +184,13 @@ class OLIApi:
         # TODO: unknown bug where only "liquid1" phase is found in Flash analysis
         self.valid_phases = ["liquid1", "vapor", "solid", "liquid2"]
 
+    @property
+    def session(self):
+        """
+        Pooled HTTP session shared with the credential manager.
+        """
+        return self.credential_manager.session
+
     # binds OLIApi instance to context manager
     def __enter__(self):
         self.session_dbs_files = []
@@ -108,6 +203,8 @@ class OLIApi:
             f"Exiting: deleting {len(self.session_dbs_files)} remaining DBS files created during the session that were not marked by keep_file=True."
         )
         self.dbs_file_cleanup(self.session_dbs_files)
+        # release the pooled connections of the session
+        self.credential_manager.close()
         return False
 
     def _prompt(self, msg, default=""):
@@ -130,13 +227,16 @@ class OLIApi:
         """
 
         with open(dbs_file_path, "rb") as file:
-            req = requests.post(
+            dbs_file_hash = hash_content(file.read())
+            file.seek(0)
+            req = self.session.post(
                 self.credential_manager.upload_dbs_url,
                 headers=self.credential_manager.headers,
                 files={"files": file},
             )
         dbs_file_id = _request_status_test(req, ["UPLOADED"])["file"][0]["id"]
         if bool(dbs_file_id):
+            self.dbs_file_hashes[dbs_file_id] = dbs_file_hash
             if not keep_file:
                 self.session_dbs_files.append(dbs_file_id)
             _logger.info(f"Uploaded DBS file ID is {dbs_file_id}")
@@ -223,7 +323,7 @@ class OLIApi:
             "params": {k: v for k, v in dbs_file_inputs.items() if v is not None},
         }
         _logger.debug(f"DBS input dictionary: {dbs_dict}")
-        req = requests.post(
+        req = self.session.post(
             self.credential_manager.dbs_url,
             headers=self.credential_manager.update_headers(
                 {"Content-Type": "application/json"}
@@ -232,6 +332,7 @@ class OLIApi:
         )
         dbs_file_id = _request_status_test(req, ["SUCCESS"])["data"]["id"]
         if bool(dbs_file_id):
+            self.dbs_file_hashes[dbs_file_id] = hash_content(dbs_dict)
             if not keep_file:
                 self.session_dbs_files.append(dbs_file_id)
             _logger.info(f"Generated DBS file ID is {dbs_file_id}")
@@ -250,7 +351,7 @@ class OLIApi:
 
         _logger.info(f"Getting summary for {dbs_file_id} ...")
         chemistry_info = self.call("chemistry-info", dbs_file_id)
-        req_flash_hist = requests.get(
+        req_flash_hist = self.session.get(
             f"{self.credential_manager.engine_url}/flash/history/{dbs_file_id}",
             headers=self.credential_manager.headers,
         )
@@ -275,7 +376,7 @@ class OLIApi:
         """
 
         _logger.info("Getting DBS file IDs for user ...")
-        req = requests.get(
+        req = self.session.get(
             self.credential_manager.dbs_url,
             headers=self.credential_manager.headers,
         )
@@ -305,7 +406,7 @@ class OLIApi:
         if (r.lower() == "y") or (r == ""):
             for dbs_file_id in dbs_file_ids:
                 _logger.info(f"Deleting {dbs_file_id} ...")
-                req = requests.request(
+                req = self.session.request(
                     "DELETE",
                     f"{self.credential_manager._delete_dbs_url}{dbs_file_id}",
                     headers=self.credential_manager.headers,
@@ -399,37 +500,170 @@ class OLIApi:
             )
         return mode, url, headers
 
-    def process_request_list(self, requests, **kwargs):
+    def process_request_list(
+        self,
+        requests,
+        max_concurrent_processes=1,
+        batch_size=None,
+        burst_job_tag=None,
+        result_callback=None,
+        checkpoint=None,
+    ):
         """
         Process a list of flash calculation requests for OLI.
 
         :param requests: list of request dictionaries containing flash_method, dbs_file_id, and json_input
+        :param max_concurrent_processes: integer for maximum number of requests submitted and polled at once (1 for serial mode)
+        :param batch_size: integer for number of requests in each batch; batches are processed one after another
+        :param burst_job_tag: string to tag requests as part of a burst job on OLI Cloud
+        :param result_callback: function called with (index, result) as soon as each result is processed; results are then not retained
+        :param checkpoint: SurveyCheckpoint recording each sample, so a re-run only processes missing or failed samples
+
+        :return result_list: list of results in the same order as requests, None for failed samples (None if result_callback is given)
+
+        A failed sample does not stop the others: its error is logged and its result is left as None.
         """
 
-        _logger.info("Collecting requested samples in serial mode ...")
-        result_list = []
+        num_samples = len(requests)
+        if max_concurrent_processes is None or max_concurrent_processes < 1:
+            raise ValueError(
+                "max_concurrent_processes must be a positive integer, "
+                + f"not {max_concurrent_processes}."
+            )
+        if batch_size is None:
+            batch_size = max(num_samples, 1)
+        elif batch_size < 1:
+            raise ValueError(
+                f"batch_size must be a positive integer, not {batch_size}."
+            )
+
+        def _process_request(idx):
+            request = requests[idx]
+            _logger.info(f"Submitting sample #{idx+1} of {num_samples} ...")
+            if checkpoint is None:
+                try:
+                    result = self.call(**{"burst_job_tag": burst_job_tag, **request})
+                except Exception as e:
+                    _logger.warning(f"Sample #{idx+1} failed: {e}")
+                    failures.append(idx)
+                    return None
+                result["submitted_requests"] = request
+                return result
+            while True:
+                checkpoint.mark_submitted(idx)
+                try:
+                    result = self.call(**{"burst_job_tag": burst_job_tag, **request})
+                except Exception as e:
+                    retry = checkpoint.mark_failed(idx, e)
+                    _logger.warning(f"Sample #{idx+1} failed: {e}")
+                    if retry:
+                        continue
+                    return None
+                result["submitted_requests"] = request
+                checkpoint.mark_processed(idx, result)
+                return result
+
+        result_list = None if result_callback else [None] * num_samples
+        failures = []
+
+        def _collect_result(idx, result):
+            if result is None:
+                return
+            if result_callback:
+                result_callback(idx, result)
+            else:
+                result_list[idx] = result
+
+        if checkpoint is None:
+            indices = list(range(num_samples))
+        else:
+            indices = checkpoint.start(
+                [self._get_request_key(**request) for request in requests]
+            )
+            for idx, result in checkpoint.get_processed_results():
+                _collect_result(idx, result)
+
+        num_timings = self._num_request_timings
+        if max_concurrent_processes > 1:
+            self.credential_manager.ensure_pool_size(
+                min(max_concurrent_processes, batch_size)
+            )
         acquire_timer = time.time()
-        for idx, request in enumerate(requests):
-            _logger.info(f"Submitting sample #{idx+1} of {len(requests)} ...")
-            result = self.call(**request)
-            result["submitted_requests"] = request
-            result_list.append(result)
+        if max_concurrent_processes == 1:
+            _logger.info("Collecting requested samples in serial mode ...")
+            for idx in indices:
+                _collect_result(idx, _process_request(idx))
+        else:
+            _logger.info(
+                "Collecting requested samples in concurrent mode "
+                + f"(max_concurrent_processes={max_concurrent_processes}) ..."
+            )
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start : start + batch_size]
+                num_workers = min(max_concurrent_processes, len(batch))
+                with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                    futures = {
+                        executor.submit(_process_request, idx): idx for idx in batch
+                    }
+                    for future in as_completed(futures):
+                        _collect_result(futures[future], future.result())
+        if checkpoint is not None:
+            failures = checkpoint.get_failures()
+            if failures:
+                _logger.warning(
+                    f"{len(failures)} samples failed: {sorted(failures)}. "
+                    + "Re-run with the same checkpoint to retry them."
+                )
+        elif failures:
+            _logger.warning(f"{len(failures)} samples failed: {sorted(failures)}.")
         acquire_time = time.time() - acquire_timer
-        num_samples = len(requests)
         _logger.info(
             f"Finished all {num_samples} jobs from OLI. "
             + f"Total: {acquire_time} s, "
-            + f"Rate: {acquire_time/num_samples} s/sample"
+            + f"Rate: {acquire_time/max(num_samples, 1)} s/sample"
         )
+        if self.result_cache is not None:
+            _logger.info(f"Result cache: {self.result_cache.get_statistics()}")
+        with self._timings_lock:
+            num_timings = self._num_request_timings - num_timings
+            timings = list(self.request_timings)[-num_timings:] if num_timings else []
+        if timings:
+            _logger.info(
+                "Mean queue time: "
+                + f"{sum(t['queue_time'] for t in timings)/len(timings)} s, "
+                + "mean processing time: "
+                + f"{sum(t['processing_time'] for t in timings)/len(timings)} s"
+            )
         return result_list
 
+    def _get_request_key(
+        self, flash_method=None, dbs_file_id=None, input_params=None, **kwargs
+    ):
+        """
+        Get a key identifying a flash request by its DBS content and inputs.
+
+        :param flash_method: string indicating flash method
+        :param dbs_file_id: string indicating DBS file
+        :param input_params: dictionary for flash calculation inputs
+
+        :return key: string hex digest
+        """
+
+        return FlashResultCache.get_key(
+            self.dbs_file_hashes.get(dbs_file_id, dbs_file_id),
+            flash_method,
+            input_params,
+        )
+
     def call(
         self,
         flash_method=None,
         dbs_file_id=None,
         input_params=None,
-        poll_time=0.5,
-        max_request=100,
+        polling_strategy=None,
+        burst_job_tag=None,
+        poll_time=None,
+        max_request=None,
         **kwargs,
     ):
         """
@@ -438,30 +672,75 @@ class OLIApi:
         :param flash_method: string indicating flash method
         :param dbs_file_id: string indicating DBS file
         :param input_params: dictionary for flash calculation inputs
-        :param poll_time: seconds between each poll
-        :param max_request: maximum number of times to try request before failure
+        :param polling_strategy: PollingStrategy to use instead of the instance default
+        :param burst_job_tag: string to tag request as part of a burst job on OLI Cloud
+        :param poll_time: deprecated, seconds between each poll; use polling_strategy instead
+        :param max_request: deprecated, maximum number of polls; use polling_strategy instead
 
         :return result: dictionary for JSON output result
         """
 
-        mode, url, headers = self._get_flash_mode(dbs_file_id, flash_method)
-        try:
-            req = requests.request(
-                mode, url, headers=headers, data=json.dumps(input_params)
-            )
-            req_json = _request_status_test(req, ["SUCCESS"])
-        except requests.JSONDecodeError:
-            delay = 1
-            time.sleep(delay)
-            _logger.debug(
-                f"JSONDecodeError occurred. Trying to convert response object to JSON again."
+        if poll_time is not None or max_request is not None:
+            if polling_strategy is not None:
+                raise TypeError(
+                    "poll_time and max_request cannot be combined with polling_strategy."
+                )
+            warnings.warn(
+                "poll_time and max_request are deprecated, use polling_strategy instead.",
+                DeprecationWarning,
+                stacklevel=2,
             )
-            req = requests.request(
-                mode, url, headers=headers, data=json.dumps(input_params)
+            poll_time = 0.5 if poll_time is None else poll_time
+            max_request = 100 if max_request is None else max_request
+            polling_strategy = PollingStrategy(
+                initial_delay=poll_time,
+                max_delay=poll_time,
+                growth_factor=1.0,
+                jitter=0.0,
+                timeout=poll_time * max_request,
             )
-            req_json = _request_status_test(req, ["SUCCESS"])
+
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self._get_request_key(flash_method, dbs_file_id, input_params)
+            result = self.result_cache.get(cache_key)
+            if result is not None:
+                _logger.debug(f"Using cached {flash_method} result for {dbs_file_id}")
+                return result
+
+        if polling_strategy is None:
+            polling_strategy = self.polling_strategy
+        mode, url, headers = self._get_flash_mode(
+            dbs_file_id, flash_method, burst_job_tag
+        )
+        submit_start = time.monotonic()
+        retry_delays = polling_strategy.delays()
+        while True:
+            try:
+                req = self.session.request(
+                    mode, url, headers=headers, data=json.dumps(input_params)
+                )
+                req_json = _request_status_test(req, ["SUCCESS"])
+                break
+            except requests.JSONDecodeError:
+                delay = next(retry_delays, None)
+                if delay is None:
+                    raise
+                _logger.debug(
+                    f"JSONDecodeError occurred. Retrying request in {delay:.2f} s."
+                )
+                time.sleep(delay)
+        submit_time = time.monotonic() - submit_start
         result_link = _get_result_link(req_json)
-        result = _poll_result_link(result_link, headers, max_request, poll_time)
+        result, timing = _poll_result_link(
+            result_link, headers, polling_strategy, session=self.session
+        )
+        timing.update({"flash_method": flash_method, "submit_time": submit_time})
+        with self._timings_lock:
+            self.request_timings.append(timing)
+            self._num_request_timings += 1
+        if cache_key is not None and timing["status"] == "PROCESSED":
+            self.result_cache.put(cache_key, result)
         return result
 
 
@@ -512,27 +791,48 @@ def _request_status_test(req, target_keys):
     )
 
 
-def _poll_result_link(result_link, headers, max_request, poll_time):
+def _poll_result_link(result_link, headers, polling_strategy, session=None):
     """
     Poll result link from OLI Flash calculation request.
 
     :param result_link: string indicating URL to access call results
     :param headers: dictionary for OLI Cloud headers
-    :param max_request: integer for number of requests before poll limit error
-    :param poll_time: float for time in between poll requests
+    :param polling_strategy: PollingStrategy scheduling waits between polls
+    :param session: requests session to poll with (module-level requests if None)
 
     return result: JSON containing results from successful Flash calculation
+    return timing: dictionary for queue, processing and total time (s) and number of polls
     """
 
-    for _ in range(max_request):
-        time.sleep(poll_time)
-        result_req = requests.get(result_link, headers=headers)
+    if session is None:
+        session = requests
+    start_time = time.monotonic()
+    dequeue_time = None
+    num_polls = 0
+    for delay in polling_strategy.delays():
+        time.sleep(delay)
+        result_req = session.get(result_link, headers=headers)
+        num_polls += 1
         result_req = _request_status_test(
             result_req, ["IN QUEUE", "IN PROGRESS", "PROCESSED", "FAILED"]
         )
-        _logger.info(f"Polling result link: {result_req['status']}")
-        if result_req["status"] in ["PROCESSED", "FAILED"]:
+        status = result_req["status"]
+        _logger.info(f"Polling result link: {status}")
+        if dequeue_time is None and status != "IN QUEUE":
+            dequeue_time = time.monotonic()
+        if status in ["PROCESSED", "FAILED"]:
             if result_req["data"]:
-                result = result_req["data"]
-                return result
-    raise RuntimeError("Poll limit exceeded.")
+                end_time = time.monotonic()
+                timing = {
+                    "result_link": result_link,
+                    "status": status,
+                    "queue_time": dequeue_time - start_time,
+                    "processing_time": end_time - dequeue_time,
+                    "total_time": end_time - start_time,
+                    "num_polls": num_polls,
+                }
+                return result_req["data"], timing
+    raise RuntimeError(
+        f"Poll limit exceeded: no result after {polling_strategy.timeout} s "
+        + f"({num_polls} polls)."
+    )
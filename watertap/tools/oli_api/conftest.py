@@ -45,12 +45,15 @@
 # or derivative works thereof, in binary and source code form.
 ###############################################################################
 import contextlib
+import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
 
-from watertap.tools.oli_api.client import OLIApi
+from watertap.tools.oli_api.client import OLIApi, PollingStrategy
 from watertap.tools.oli_api.flash import Flash
 from watertap.tools.oli_api.credentials import (
     CredentialManager,
@@ -141,3 +144,144 @@ def flash_instance(scope="session"):
 @pytest.fixture
 def source_water(scope="session"):
     return {"Cl_-": 1000, "Na_+": 1000}
+
+
+class LocalOLIServer(ThreadingHTTPServer):
+    """
+    Minimal stand-in for the OLI Cloud endpoints used by OLIApi.
+
+    Flash requests are queued and reported as processed after ``polls_to_process``
+    polls of their result link; the processed result echoes the submitted input.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, polls_to_process=2):
+        super().__init__(("127.0.0.1", 0), _LocalOLIRequestHandler)
+        self.root_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.polls_to_process = polls_to_process
+        # submitted sample input -> number of times to reject its submission
+        self.submissions_to_reject = {}
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.num_connections = 0
+        self.num_submitted = 0
+        self.num_polls = 0
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+
+
+class _LocalOLIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.num_connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, content, status_code=200):
+        body = json.dumps(content).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/channel/dbs"):
+            self._send_json({"status": "SUCCESS", "data": []})
+        elif self.path.startswith("/result/"):
+            job_id = self.path.split("/")[-1]
+            with server.lock:
+                server.num_polls += 1
+                job = server.jobs[job_id]
+                job["polls"] += 1
+                processed = job["polls"] >= server.polls_to_process
+                if processed and not job["processed"]:
+                    job["processed"] = True
+                    server.num_in_flight -= 1
+            if processed:
+                self._send_json(
+                    {
+                        "status": "PROCESSED",
+                        "data": {"result": {"echo": job["input"], "url": job["url"]}},
+                    }
+                )
+            else:
+                self._send_json({"status": "IN PROGRESS", "data": {}})
+        else:
+            self._send_json({"status": "FAILED"}, status_code=404)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"null")
+        if self.path.startswith("/engine/flash/"):
+            sample = json.dumps(body, sort_keys=True)
+            with server.lock:
+                reject = server.submissions_to_reject.get(sample, 0) > 0
+                if reject:
+                    server.submissions_to_reject[sample] -= 1
+            if reject:
+                self._send_json({"status": "FAILED"}, status_code=500)
+                return
+            with server.lock:
+                server.num_submitted += 1
+                server.num_in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.num_in_flight)
+                job_id = str(server.num_submitted)
+                server.jobs[job_id] = {
+                    "input": body,
+                    "url": self.path,
+                    "polls": 0,
+                    "processed": False,
+                }
+            self._send_json(
+                {
+                    "status": "SUCCESS",
+                    "data": {
+                        "status": "IN QUEUE",
+                        "resultsLink": f"{server.root_url}/result/{job_id}",
+                    },
+                }
+            )
+        else:
+            self._send_json({"status": "FAILED"}, status_code=404)
+
+
+@pytest.fixture(scope="function")
+def local_oli_server() -> LocalOLIServer:
+    server = LocalOLIServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture(scope="function")
+def local_oliapi_instance(tmp_path: Path, local_oli_server: LocalOLIServer) -> OLIApi:
+
+    if not cryptography_available:
+        pytest.skip(reason="cryptography module not available.")
+    credential_manager = CredentialManager(
+        root_url=local_oli_server.root_url,
+        access_keys=["local-test-key"],
+        config_file=tmp_path / "pytest-credentials.txt",
+        interactive_mode=False,
+        test=True,
+    )
+    polling_strategy = PollingStrategy(initial_delay=0.005, max_delay=0.02, timeout=5)
+    with OLIApi(
+        credential_manager,
+        interactive_mode=False,
+        polling_strategy=polling_strategy,
+    ) as oliapi:
+        yield oliapi
@@ -62,6 +62,9 @@ cryptography, cryptography_available = attempt_import(
 if cryptography_available:
     from cryptography.fernet import Fernet
 requests, requests_available = attempt_import("requests", defer_import=False)
+if requests_available:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
 _logger = logging.getLogger(__name__)
 # set to info level, so user can see what is going on
@@ -92,6 +95,9 @@ class CredentialManager:
         interactive_mode=True,
         refresh=False,
         debug_level="INFO",
+        pool_size=10,
+        max_retries=3,
+        backoff_factor=0.5,
     ):
         """
         Manages credentials for OLIApi authentication requests.
@@ -107,6 +113,9 @@ class CredentialManager:
         :param interactive_mode: enables direct interaction with user through prompts
         :param refresh: bool to use refresh token in login method
         :param debug_level: string defining level of logging activity
+        :param pool_size: integer for maximum number of pooled connections kept alive per host; grown by OLIApi.process_request_list to its number of concurrent requests
+        :param max_retries: integer for number of transport-level retries on connection errors and 502/503/504 responses
+        :param backoff_factor: float for exponential backoff (in seconds) between transport-level retries
 
         """
 
@@ -121,6 +130,7 @@ class CredentialManager:
             _logger.setLevel(logging.INFO)
         else:
             _logger.setLevel(logging.DEBUG)
+        self.session = self._build_session(pool_size, max_retries, backoff_factor)
         self._manage_credentials(
             username,
             password,
@@ -142,6 +152,64 @@ class CredentialManager:
             self.login()
             self.headers = {"authorization": "Bearer " + self.jwt_token}
 
+    def _build_session(self, pool_size, max_retries, backoff_factor):
+        """
+        Create the pooled HTTP session shared by all OLI Cloud requests.
+
+        :param pool_size: integer for maximum number of pooled connections kept alive per host
+        :param max_retries: integer for number of transport-level retries
+        :param backoff_factor: float for exponential backoff (in seconds) between retries
+
+        :return session: requests session with keep-alive connection pooling
+        """
+
+        if not requests_available:
+            raise ModuleNotFoundError("Module 'requests' not available.")
+
+        # POST is excluded from status retries (urllib3 default) so flash jobs
+        # are never submitted twice; connection errors are retried for all methods
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        )
+        self._retry = retry
+        session = requests.Session()
+        self._mount_adapter(session, pool_size)
+        return session
+
+    def _mount_adapter(self, session, pool_size):
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=self._retry
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.pool_size = pool_size
+
+    def ensure_pool_size(self, pool_size):
+        """
+        Grow the connection pool so that pool_size requests can run at once
+        without urllib3 discarding connections. Call between requests, as
+        connections pooled so far are closed.
+
+        :param pool_size: integer for number of concurrent requests
+        """
+
+        if pool_size <= self.pool_size:
+            return
+        _logger.debug(f"Growing connection pool to {pool_size} connections")
+        old_adapter = self.session.get_adapter("https://")
+        self._mount_adapter(self.session, pool_size)
+        old_adapter.close()
+
+    def close(self):
+        """
+        Close all pooled connections held by the session.
+        """
+
+        self.session.close()
+
     def update_headers(self, new_header):
         """
         Updates existing headers with new header.
@@ -317,7 +385,7 @@ class CredentialManager:
             unix_timestamp_ms = int(expiry_timestamp * 1000)
             return unix_timestamp_ms
 
-        response = requests.post(
+        response = self.session.post(
             self.access_key_url,
             headers=self.update_headers({"Content-Type": "application/json"}),
             data=json.dumps({"expiry": _set_expiry_timestamp(key_lifetime)}),
@@ -338,7 +406,7 @@ class CredentialManager:
         :return string: Response text containing the success message or an error message
         """
 
-        response = requests.delete(
+        response = self.session.delete(
             self.access_key_url,
             headers=self.update_headers({"Content-Type": "application/json"}),
             data=json.dumps({"apiKey": api_key}),
@@ -356,7 +424,7 @@ class CredentialManager:
         req_result = ""
         if self.access_key:
             _logger.info("Logging into OLI API using access key")
-            req_result = requests.get(
+            req_result = self.session.get(
                 self.dbs_url,
                 headers=self.update_headers(
                     {"Content-Type": "application/x-www-form-urlencoded"}
@@ -400,7 +468,7 @@ class CredentialManager:
         """
 
         if not req_result:
-            req_result = requests.post(
+            req_result = self.session.post(
                 self.credentials["auth_url"],
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 data=body,
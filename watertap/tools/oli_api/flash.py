@@ -50,6 +50,7 @@ __author__ = "Oluwamayowa Amusat, Alexander Dudchenko, Paul Vecchiarelli, Adam A
 import logging
 
 import json
+import threading
 from pathlib import Path
 
 from copy import deepcopy
@@ -60,13 +61,17 @@ from watertap.tools.oli_api.util.watertap_to_oli_helper_functions import (
     get_charge,
     get_charge_group,
 )
+from watertap.tools.oli_api.checkpoint import SurveyCheckpoint
 from watertap.tools.oli_api.util.fixed_keys_dict import (
     optional_properties,
     input_unit_set,
     output_unit_set,
 )
 
-from numpy import reshape, sqrt
+from numpy import full as np_full, reshape, sqrt, zeros as np_zeros
+from pyomo.common.dependencies import attempt_import
+
+h5py, h5py_available = attempt_import("h5py", defer_import=False)
 
 _logger = logging.getLogger(__name__)
 handler = logging.StreamHandler()
@@ -859,9 +864,11 @@ class Flash:
         json_input,
         survey=None,
         file_name=None,
-        # max_concurrent_processes=1000,
-        # burst_job_tag=None,
-        # batch_size=None,
+        max_concurrent_processes=1,
+        burst_job_tag=None,
+        batch_size=None,
+        results_file=None,
+        checkpoint=None,
     ):
         """
         Conduct single point analysis with initial JSON input, or conduct a survey on that input.
@@ -872,6 +879,11 @@ class Flash:
         :param json_input: JSON input for flash calculation
         :param survey: dictionary containing names and input values to modify in JSON
         :param file_name: string for file to write, if any
+        :param max_concurrent_processes: integer for maximum number of samples submitted to OLI Cloud at once (1 for serial mode)
+        :param burst_job_tag: string to tag samples as part of a burst job on OLI Cloud
+        :param batch_size: integer for number of samples in each concurrent batch
+        :param results_file: string for HDF5 file to write flattened results to as each sample is processed, if any; samples already in the file are not run again
+        :param checkpoint: SurveyCheckpoint, or string path to checkpoint file, for resuming an interrupted survey
 
         :return processed_requests: results from processed OLI flash requests
         """
@@ -908,14 +920,40 @@ class Flash:
                     ),
                 }
             )
-        processed_requests = oliapi_instance.process_request_list(
-            requests_to_process,
-            # burst_job_tag=burst_job_tag,
-            # max_concurrent_processes=max_concurrent_processes,
-            # batch_size=batch_size,
-        )
-        _logger.info("Completed running flash calculations")
-        result = flatten_results(processed_requests)
+        close_checkpoint = False
+        if checkpoint is not None and not isinstance(checkpoint, SurveyCheckpoint):
+            checkpoint = SurveyCheckpoint(checkpoint)
+            close_checkpoint = True
+        try:
+            with FlashResultsFlattener(num_samples, results_file) as flattener:
+                # the checkpoint tracks the whole survey, otherwise samples
+                # already in the results file are skipped
+                indices = list(range(num_samples))
+                if checkpoint is None:
+                    completed = set(flattener.completed_indices)
+                    indices = [idx for idx in indices if idx not in completed]
+                    if completed:
+                        _logger.info(
+                            f"Resuming from {results_file}: {len(completed)} of "
+                            + f"{num_samples} samples already processed"
+                        )
+
+                def _add_result(idx, result):
+                    flattener.add_result(indices[idx], result)
+
+                oliapi_instance.process_request_list(
+                    [requests_to_process[idx] for idx in indices],
+                    burst_job_tag=burst_job_tag,
+                    max_concurrent_processes=max_concurrent_processes,
+                    batch_size=batch_size,
+                    result_callback=_add_result,
+                    checkpoint=checkpoint,
+                )
+                _logger.info("Completed running flash calculations")
+                result = flattener.to_dict()
+        finally:
+            if close_checkpoint:
+                checkpoint.close()
         if file_name:
             write_output(result, file_name)
         return result
@@ -1036,184 +1074,395 @@ class Flash:
         return inflows
 
 
-def flatten_results(processed_requests):
+float_nan = float("nan")
+_terminal_keys = ["unit", "value", "found", "fullVersion", "values"]
 
-    _logger.info("Flattening OLI stream output ... ")
-
-    props = []
-    terminal_keys = ["unit", "value", "found", "fullVersion", "values"]
 
-    def _find_props(data, path=None):
-        """
-        Get the path to all nested items in input data (recursive search).
+def _find_props(data, path=None, props=None):
+    """
+    Get the path to all nested items in input data (recursive search).
 
-        :param data: dictionary containing OLI flash output
-        :param path: list of paths to endpoint
+    :param data: dictionary containing OLI flash output
+    :param path: list of paths to endpoint
+    :param props: list to append discovered paths to
 
-        :return props: list of nested path lists
-        """
-        path = path if path is not None else []
-        if isinstance(data, dict):
-            for k, v in data.items():
-                if isinstance(v, (str, bool)):
+    :return props: list of nested path lists
+    """
+    path = path if path is not None else []
+    props = props if props is not None else []
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if isinstance(v, (str, bool)):
+                props.append([*path, k])
+            elif isinstance(v, list):
+                if all(k not in _terminal_keys for k in v):
+                    _find_props(v, [*path, k], props)
+            elif isinstance(v, dict):
+                if all(k not in _terminal_keys for k in v):
+                    _find_props(v, [*path, k], props)
+                else:
                     props.append([*path, k])
-                elif isinstance(v, list):
-                    if all(k not in terminal_keys for k in v):
-                        _find_props(v, [*path, k])
-                elif isinstance(v, dict):
-                    if all(k not in terminal_keys for k in v):
-                        _find_props(v, [*path, k])
-                    else:
-                        props.append([*path, k])
-        elif isinstance(data, list):
-            for idx, v in enumerate(data):
-                if isinstance(v, (dict, list)):
-                    if all(k not in terminal_keys for k in v):
-                        _find_props(v, [*path, idx])
-                    else:
-                        props.append([*path, idx])
-        else:
-            raise RuntimeError(f"Unexpected type for data: {type(data)}")
+    elif isinstance(data, list):
+        for idx, v in enumerate(data):
+            if isinstance(v, (dict, list)):
+                if all(k not in _terminal_keys for k in v):
+                    _find_props(v, [*path, idx], props)
+                else:
+                    props.append([*path, idx])
+    else:
+        raise RuntimeError(f"Unexpected type for data: {type(data)}")
+    return props
 
-    def _get_nested_data(data, keys):
 
-        for key in keys:
-            data = data[key]
-        return data
+def _get_nested_data(data, keys):
 
-    def _extract_values(data, keys):
-        values = _get_nested_data(data, keys)
-        extracted_values = {}
-        if isinstance(values, str):
-            extracted_values = values
-        elif isinstance(values, bool):
-            extracted_values = bool(values)
-        elif isinstance(values, dict):
-            if any(k in values for k in ["group", "name", "fullVersion"]):
-                if "value" in values:
-                    extracted_values.update({"values": values["value"]})
-                if "unit" in values:
-                    unit = values["unit"] if values["unit"] else "dimensionless"
-                    extracted_values.update({"units": unit})
-
-            elif all(k in values for k in ["found", "phase"]):
-                extracted_values = values
-            else:
+    for key in keys:
+        data = data[key]
+    return data
+
+
+def _extract_values(data, keys):
+    values = _get_nested_data(data, keys)
+    extracted_values = {}
+    if isinstance(values, str):
+        extracted_values = values
+    elif isinstance(values, bool):
+        extracted_values = bool(values)
+    elif isinstance(values, dict):
+        if any(k in values for k in ["group", "name", "fullVersion"]):
+            if "value" in values:
+                extracted_values.update({"values": values["value"]})
+            if "unit" in values:
                 unit = values["unit"] if values["unit"] else "dimensionless"
-                if "value" in values:
-                    extracted_values = {
+                extracted_values.update({"units": unit})
+
+        elif all(k in values for k in ["found", "phase"]):
+            extracted_values = values
+        else:
+            unit = values["unit"] if values["unit"] else "dimensionless"
+            if "value" in values:
+                extracted_values = {
+                    "units": unit,
+                    "values": values["value"],
+                }
+            elif "values" in values:
+                extracted_values = {
+                    k: {
                         "units": unit,
-                        "values": values["value"],
-                    }
-                elif "values" in values:
-                    extracted_values = {
-                        k: {
-                            "units": unit,
-                            "values": values["values"][k],
-                        }
-                        for k, v in values["values"].items()
+                        "values": values["values"][k],
                     }
-                elif "data" in values:
-                    # intended for vaporDiffusivityMatrix
-                    mat_dim = int(sqrt(len(values["data"])))
-                    diffmat = reshape(values["data"], newshape=(mat_dim, mat_dim))
-
-                    extracted_values = {
-                        f'({values["speciesNames"][i]},{values["speciesNames"][j]})': {
-                            "units": values["unit"],
-                            "values": diffmat[i][j],
-                        }
-                        for i in range(len(diffmat))
-                        for j in range(i, len(diffmat))
+                    for k, v in values["values"].items()
+                }
+            elif "data" in values:
+                # intended for vaporDiffusivityMatrix
+                mat_dim = int(sqrt(len(values["data"])))
+                diffmat = reshape(values["data"], newshape=(mat_dim, mat_dim))
+
+                extracted_values = {
+                    f'({values["speciesNames"][i]},{values["speciesNames"][j]})': {
+                        "units": values["unit"],
+                        "values": diffmat[i][j],
                     }
-                else:
-                    raise NotImplementedError(
-                        f"results structure not accounted for. results:\n{values}"
-                    )
-        else:
-            raise RuntimeError(f"Unexpected type for data: {type(values)}")
-        return extracted_values
-
-    def _create_input_dict(props, result):
-        input_dict = {k: {} for k in set([prop[0] for prop in props])}
-        for prop in props:
-            k = prop[0]
-            phase_tag = ""
-            if "metaData" in prop:
+                    for i in range(len(diffmat))
+                    for j in range(i, len(diffmat))
+                }
+            else:
+                raise NotImplementedError(
+                    f"results structure not accounted for. results:\n{values}"
+                )
+    else:
+        raise RuntimeError(f"Unexpected type for data: {type(values)}")
+    return extracted_values
+
+
+def _create_input_dict(props, result):
+    input_dict = {k: {} for k in set([prop[0] for prop in props])}
+    for prop in props:
+        k = prop[0]
+        phase_tag = ""
+        if "metaData" in prop:
+            prop_tag = prop[-1]
+        elif "result" in prop:
+            # get property tag
+            if isinstance(prop[-1], int):
+                prop_tag = prop[-2]
+            else:
                 prop_tag = prop[-1]
-            elif "result" in prop:
-                # get property tag
+            # get phase tag
+            if any(k in prop for k in ["phases", "total"]):
+                if "total" in prop:
+                    phase_tag = "total"
+                else:
+                    phase_tag = prop[prop.index("phases") + 1]
+        elif "submitted_requests" in prop:
+            prop_tag = prop[-1]
+            if "params" in prop:
                 if isinstance(prop[-1], int):
-                    prop_tag = prop[-2]
+                    prop_tag = _get_nested_data(result, prop)["name"]
+        else:
+            _logger.warning(
+                f"Unexpected result:\n{result}\n\ninput_dict:\n{input_dict} from prop {prop}"
+            )
+            continue
+        label = f"{prop_tag}_{phase_tag}" if phase_tag else prop_tag
+        input_dict[k][label] = _extract_values(result, prop)
+    return input_dict
+
+
+def _get_leaf_values(input_dict, path=(), leaf_values=None):
+    """
+    Get flattened leaf values from nested flash result data.
+
+    :param input_dict: dictionary for incoming data
+    :param path: tuple of keys leading to input_dict
+    :param leaf_values: list to append leaf values to
+
+    :return leaf_values: list of (path, kind, value), where kind is "group" for nested dictionaries, "constant" for units and versions, "float" or "str"
+    """
+
+    leaf_values = leaf_values if leaf_values is not None else []
+    for k, v in input_dict.items():
+        if isinstance(v, dict):
+            leaf_values.append(((*path, k), "group", None))
+            _get_leaf_values(v, (*path, k), leaf_values)
+            continue
+        try:
+            leaf_values.append(((*path, k), "float", float(v)))
+        except:
+            if isinstance(v, str):
+                if k in ["fullVersion", "units"]:
+                    leaf_values.append(((*path, k), "constant", v))
                 else:
-                    prop_tag = prop[-1]
-                # get phase tag
-                if any(k in prop for k in ["phases", "total"]):
-                    if "total" in prop:
-                        phase_tag = "total"
-                    else:
-                        phase_tag = prop[prop.index("phases") + 1]
-            elif "submitted_requests" in prop:
-                prop_tag = prop[-1]
-                if "params" in prop:
-                    if isinstance(prop[-1], int):
-                        prop_tag = _get_nested_data(result, prop)["name"]
+                    leaf_values.append(((*path, k), "str", v))
             else:
-                _logger.warning(
-                    f"Unexpected result:\n{result}\n\ninput_dict:\n{input_dict} from prop {prop}"
-                )
-                continue
-            label = f"{prop_tag}_{phase_tag}" if phase_tag else prop_tag
-            input_dict[k][label] = _extract_values(result, prop)
-        return input_dict
+                raise Exception(f"Unexpected value: {v}")
+    return leaf_values
+
 
-    float_nan = float("nan")
+class FlashResultsFlattener:
+    """
+    A class to flatten OLI flash results into columns, one sample at a time.
 
-    def _add_to_output(input_dict, output_dict, index, number_samples):
+    Each sample is stored as a row of NumPy column arrays and, if a file name is
+    given, written to HDF5 as it arrives, so raw JSON payloads never need to be held
+    together and an interrupted survey can be reopened and resumed.
+    """
+
+    _completed_key = "__completed__"
+
+    def __init__(self, num_samples, file_name=None):
         """
-        Add incoming flash results to output data.
+        Construct all necessary attributes for FlashResultsFlattener class.
+
+        :param num_samples: integer for total number of samples
+        :param file_name: string path to HDF5 file to write incrementally, if any
+        """
+
+        self.num_samples = num_samples
+        self.file_name = file_name
+        self._groups = {}
+        self._columns = {}
+        self._lock = threading.Lock()
+        self.completed = np_zeros(num_samples, dtype=bool)
+        self._file = None
+        if file_name is not None:
+            if not h5py_available:
+                raise ModuleNotFoundError("Module 'h5py' not available.")
+            self._file = h5py.File(file_name, "a")
+            self._load_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type=None, exc_value=None, traceback=None):
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Close the HDF5 file, if any.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def completed_indices(self):
+        """
+        Indices of samples already added.
+        """
+        return [int(i) for i in self.completed.nonzero()[0]]
+
+    def add_result(self, index, result):
+        """
+        Add one processed flash result.
 
-        :param input_dict: dictionary for incoming data
-        :param output_dict: dictionary for output data
         :param index: integer for index of incoming data
-        :param number_samples: integer for total number of incoming data samples
+        :param result: dictionary for flash result (including submitted_requests)
         """
 
-        for k, v in input_dict.items():
-            try:
-                val = float(v)
-            except:
-                val = None
-            if val is not None:
-                if k not in output_dict:
-                    output_dict[k] = [float_nan] * number_samples
-                output_dict[k][index] = val
-            elif isinstance(v, str):
-                if k not in output_dict:
-                    if k in ["fullVersion", "units"]:
-                        output_dict[k] = v
-                    else:
-                        output_dict[k] = [float_nan] * number_samples
-                if k in ["fullVersion", "units"]:
-                    if input_dict[k] != output_dict[k]:
-                        raise Exception(f"Input and output do not agree for key {k}")
-                else:
-                    output_dict[k][index] = v
-            elif isinstance(v, dict):
-                if k not in output_dict:
-                    output_dict[k] = {}
-                _add_to_output(input_dict[k], output_dict[k], index, number_samples)
+        input_dict = _create_input_dict(_find_props(result), result)
+
+        with self._lock:
+            for path, kind, value in _get_leaf_values(input_dict):
+                self._set_value(path, kind, value, index)
+            self.completed[index] = True
+            if self._file is not None:
+                self._file[self._completed_key][index] = True
+                self._file.flush()
+
+    def _set_value(self, path, kind, value, index):
+        if kind == "group":
+            if path not in self._groups:
+                self._groups[path] = None
+                if self._file is not None:
+                    self._get_group(path)
+            return
+        column = self._columns.get(path)
+        if kind == "constant":
+            if column is None:
+                self._columns[path] = value
+                if self._file is not None:
+                    self._get_group(path[:-1]).attrs[_escape_key(path[-1])] = value
+            elif column != value:
+                raise Exception(f"Input and output do not agree for key {path[-1]}")
+            return
+        if column is None:
+            if kind == "float":
+                column = np_full(self.num_samples, float_nan)
             else:
-                raise Exception(f"Unexpected value: {v}")
+                column = np_full(self.num_samples, float_nan, dtype=object)
+            self._columns[path] = column
+            if self._file is not None:
+                self._create_dataset(path, kind)
+        elif kind == "str" and column.dtype != object:
+            # keep mixed numeric/string columns as Python objects
+            column = column.astype(object)
+            self._columns[path] = column
+        column[index] = value
+        if self._file is not None:
+            dataset = self._file[_get_dataset_name(path)]
+            if dataset.dtype.kind == "f":
+                dataset[index] = value if kind == "float" else float_nan
+            else:
+                dataset[index] = str(value)
+
+    def _get_group(self, keys):
+        group = self._file
+        for k in keys:
+            group = group.require_group(_escape_key(k))
+        return group
+
+    def _create_dataset(self, path, kind):
+        group = self._get_group(path[:-1])
+        if kind == "float":
+            group.create_dataset(
+                _escape_key(path[-1]),
+                data=np_full(self.num_samples, float_nan),
+            )
+        else:
+            group.create_dataset(
+                _escape_key(path[-1]),
+                shape=(self.num_samples,),
+                dtype=h5py.string_dtype(),
+            )
+
+    def _load_file(self):
+        if self._completed_key not in self._file:
+            self._file.create_dataset(
+                self._completed_key, data=np_zeros(self.num_samples, dtype=bool)
+            )
+            return
+        completed = self._file[self._completed_key][()]
+        if len(completed) != self.num_samples:
+            raise RuntimeError(
+                f"{self.file_name} holds {len(completed)} samples, "
+                + f"expected {self.num_samples}."
+            )
+        self.completed = completed
+
+        def _load(name, obj):
+            if name == self._completed_key:
+                return
+            path = tuple(_unescape_key(k) for k in name.split("/"))
+            if isinstance(obj, h5py.Group):
+                self._groups[path] = None
+            else:
+                data = obj[()]
+                if obj.dtype.kind == "f":
+                    self._columns[path] = data
+                else:
+                    column = np_full(self.num_samples, float_nan, dtype=object)
+                    for i, v in enumerate(data):
+                        if v:
+                            column[i] = v.decode() if isinstance(v, bytes) else v
+                    self._columns[path] = column
+            for k, v in obj.attrs.items():
+                self._columns[(*path, _unescape_key(k))] = v
+
+        for k, v in self._file.attrs.items():
+            self._columns[(_unescape_key(k),)] = v
+        self._file.visititems(_load)
+
+    def to_dict(self):
+        """
+        Get flattened results as nested dictionary of lists.
+
+        :return output_dict: dictionary of flattened results, as returned by flatten_results
+        """
+
+        output_dict = {}
+        with self._lock:
+            for path in self._groups:
+                d = output_dict
+                for k in path:
+                    d = d.setdefault(k, {})
+            for path, column in self._columns.items():
+                d = output_dict
+                for k in path[:-1]:
+                    d = d.setdefault(k, {})
+                d[path[-1]] = column if isinstance(column, str) else column.tolist()
+        return output_dict
+
+    def to_arrays(self):
+        """
+        Get flattened results as columns.
+
+        :return columns: dictionary mapping key path tuples to NumPy arrays (or unit strings)
+        """
+
+        with self._lock:
+            return dict(self._columns)
+
+
+def _escape_key(key):
+    return str(key).replace("%", "%25").replace("/", "%2F")
+
+
+def _unescape_key(key):
+    return key.replace("%2F", "/").replace("%25", "%")
+
+
+def _get_dataset_name(path):
+    return "/".join(_escape_key(k) for k in path)
+
+
+def flatten_results(processed_requests):
+    """
+    Flatten processed OLI flash results into a nested dictionary of lists.
+
+    :param processed_requests: list of flash results (including submitted_requests)
+
+    :return output_dict: dictionary of flattened results
+    """
+
+    _logger.info("Flattening OLI stream output ... ")
 
-    output_dict = {}
-    num_samples = len(processed_requests)
+    flattener = FlashResultsFlattener(len(processed_requests))
     for idx, result in enumerate(processed_requests):
-        props = []
-        _find_props(result)
-        input_dict = _create_input_dict(props, result)
-        _add_to_output(input_dict, output_dict, idx, num_samples)
-    return output_dict
+        flattener.add_result(idx, result)
+    return flattener.to_dict()
 
 
 def write_output(content, file_name):
@@ -0,0 +1,99 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+from pathlib import Path
+
+import pytest
+
+from watertap.tools.oli_api.cache import FlashResultCache, hash_content
+from watertap.tools.oli_api.client import OLIApi
+from watertap.tools.oli_api.conftest import LocalOLIServer
+
+
+@pytest.mark.unit
+def test_key_is_canonical():
+    key = FlashResultCache.get_key("dbs", "isothermal", {"a": 1, "b": [1, 2]})
+    assert key == FlashResultCache.get_key("dbs", "isothermal", {"b": [1, 2], "a": 1})
+    assert key != FlashResultCache.get_key("dbs", "isothermal", {"a": 2, "b": [1, 2]})
+    assert key != FlashResultCache.get_key(
+        "dbs", "wateranalysis", {"a": 1, "b": [1, 2]}
+    )
+    assert key != FlashResultCache.get_key("dbs2", "isothermal", {"a": 1, "b": [1, 2]})
+    assert hash_content(b"abc") != hash_content("abc")
+
+
+@pytest.mark.unit
+def test_get_put_persist(tmp_path: Path):
+    file_name = tmp_path / "cache.sqlite"
+    cache = FlashResultCache(file_name)
+    assert cache.get("k") is None
+    cache.put("k", {"result": [1, 2]})
+    assert cache.get("k") == {"result": [1, 2]}
+    assert cache.get_statistics()["hits"] == 1
+    assert cache.get_statistics()["misses"] == 1
+    cache.close()
+
+    cache = FlashResultCache(file_name)
+    assert len(cache) == 1
+    assert cache.get("k") == {"result": [1, 2]}
+    cache.clear()
+    assert len(cache) == 0
+    cache.close()
+
+
+@pytest.mark.unit
+def test_lru_eviction():
+    entry_size = len('{"v": 0}')
+    cache = FlashResultCache(":memory:", max_size=3 * entry_size)
+    for i in range(3):
+        cache.put(f"k{i}", {"v": i})
+    # touch k0 so k1 becomes least recently used
+    cache.get("k0")
+    cache.put("k3", {"v": 3})
+    assert cache.get("k1") is None
+    assert all(cache.get(k) is not None for k in ["k0", "k2", "k3"])
+    statistics = cache.get_statistics()
+    assert statistics["evictions"] == 1
+    assert statistics["entries"] == 3
+    assert statistics["size"] <= cache.max_size
+    # entries larger than the cache are not stored
+    cache.put("big", {"v": "x" * cache.max_size})
+    assert cache.get("big") is None
+    cache.close()
+
+    with pytest.raises(ValueError, match="max_size"):
+        FlashResultCache(":memory:", max_size=0)
+
+
+@pytest.mark.unit
+def test_process_request_list_uses_cache(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    local_oliapi_instance.result_cache = FlashResultCache(":memory:")
+    requests = [
+        {
+            "flash_method": "isothermal",
+            "dbs_file_id": "local-dbs",
+            "input_params": {"params": {"sample": idx % 2}},
+        }
+        for idx in range(4)
+    ]
+    results = local_oliapi_instance.process_request_list(requests)
+    assert [r["result"]["echo"]["params"]["sample"] for r in results] == [0, 1, 0, 1]
+    assert local_oli_server.num_submitted == 2
+    assert results[2]["submitted_requests"] is requests[2]
+
+    local_oliapi_instance.process_request_list(requests, max_concurrent_processes=4)
+    assert local_oli_server.num_submitted == 2
+    statistics = local_oliapi_instance.result_cache.get_statistics()
+    assert statistics["hits"] == 6
+    assert statistics["misses"] == 2
+    local_oliapi_instance.result_cache.close()
@@ -0,0 +1,139 @@
+#################################################################################
+# WaterTAP Copyright (c) 2020-2024, The Regents of the University of California,
+# through Lawrence Berkeley National Laboratory, Oak Ridge National Laboratory,
+# National Renewable Energy Laboratory, and National Energy Technology
+# Laboratory (subject to receipt of any required approvals from the U.S. Dept.
+# of Energy). All rights reserved.
+#
+# Please see the files COPYRIGHT.md and LICENSE.md for full copyright and license
+# information, respectively. These files are also available online at the URL
+# "https://github.com/watertap-org/watertap/"
+#################################################################################
+import json
+from pathlib import Path
+
+import pytest
+
+from watertap.tools.oli_api.checkpoint import SurveyCheckpoint
+from watertap.tools.oli_api.client import OLIApi
+from watertap.tools.oli_api.conftest import LocalOLIServer
+from watertap.tools.oli_api.flash import Flash, build_survey
+
+
+def _local_requests(num_samples):
+    return [
+        {
+            "flash_method": "isothermal",
+            "dbs_file_id": "local-dbs",
+            "input_params": {"params": {"sample": idx}},
+        }
+        for idx in range(num_samples)
+    ]
+
+
+def _reject(server, request, times):
+    key = json.dumps(request["input_params"], sort_keys=True)
+    server.submissions_to_reject[key] = times
+
+
+@pytest.mark.unit
+def test_checkpoint_status(tmp_path: Path):
+    checkpoint = SurveyCheckpoint(tmp_path / "survey.sqlite", max_attempts=2)
+    assert checkpoint.start(["a", "b", "c"]) == [0, 1, 2]
+    checkpoint.mark_submitted(0)
+    checkpoint.mark_processed(0, {"result": 0})
+    checkpoint.mark_submitted(1)
+    assert checkpoint.mark_failed(1, "error") is True
+    checkpoint.mark_submitted(2)
+    assert checkpoint.get_status_counts() == {
+        "pending": 0,
+        "submitted": 1,
+        "processed": 1,
+        "failed": 1,
+    }
+    checkpoint.close()
+
+    checkpoint = SurveyCheckpoint(tmp_path / "survey.sqlite", max_attempts=2)
+    # interrupted and failed samples are resumed, processed ones are not
+    assert checkpoint.start(["a", "b", "c"]) == [1, 2]
+    assert list(checkpoint.get_processed_results()) == [(0, {"result": 0})]
+    assert checkpoint.get_failures() == {1: "error"}
+    checkpoint.mark_submitted(1)
+    assert checkpoint.mark_failed(1, "error") is False
+    assert checkpoint.start(["a", "b", "c"]) == [2]
+    with pytest.raises(RuntimeError, match="different survey"):
+        checkpoint.start(["a", "b", "d"])
+    checkpoint.close()
+
+    with pytest.raises(ValueError, match="max_attempts"):
+        SurveyCheckpoint(tmp_path / "other.sqlite", max_attempts=0)
+
+
+@pytest.mark.unit
+def test_process_request_list_resume(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer, tmp_path: Path
+):
+    requests = _local_requests(6)
+    _reject(local_oli_server, requests[4], 2)
+    checkpoint = SurveyCheckpoint(tmp_path / "survey.sqlite", max_attempts=2)
+    results = local_oliapi_instance.process_request_list(
+        requests, max_concurrent_processes=3, checkpoint=checkpoint
+    )
+    assert results[4] is None
+    assert [r["result"]["echo"]["params"]["sample"] for r in results if r] == [
+        0,
+        1,
+        2,
+        3,
+        5,
+    ]
+    assert list(checkpoint.get_failures()) == [4]
+    assert local_oli_server.num_submitted == 5
+    checkpoint.close()
+
+    # resuming only submits the failed sample
+    checkpoint = SurveyCheckpoint(tmp_path / "survey.sqlite", max_attempts=3)
+    results = local_oliapi_instance.process_request_list(
+        requests, checkpoint=checkpoint
+    )
+    assert [r["result"]["echo"]["params"]["sample"] for r in results] == list(range(6))
+    assert local_oli_server.num_submitted == 6
+    assert checkpoint.get_status_counts()["processed"] == 6
+    checkpoint.close()
+
+
+@pytest.mark.unit
+def test_run_flash_resume(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer, tmp_path: Path
+):
+    flash = Flash(relative_inflows=False)
+    json_input = {"params": {"temperature": {"unit": "K", "value": 300.0}}}
+    survey = build_survey({"temperature": [300.0, 310.0, 320.0]})
+    key = json.dumps(
+        flash.get_clone("isothermal", json_input, 1, survey), sort_keys=True
+    )
+    local_oli_server.submissions_to_reject[key] = 1
+    checkpoint = SurveyCheckpoint(tmp_path / "survey.sqlite", max_attempts=1)
+    output = flash.run_flash(
+        "isothermal",
+        local_oliapi_instance,
+        "local-dbs",
+        json_input,
+        survey,
+        checkpoint=checkpoint,
+    )
+    checkpoint.close()
+    values = output["result"]["temperature"]["values"]
+    assert values[0] == 300.0 and values[2] == 320.0
+    assert values[1] != values[1]
+
+    output = flash.run_flash(
+        "isothermal",
+        local_oliapi_instance,
+        "local-dbs",
+        json_input,
+        survey,
+        checkpoint=tmp_path / "survey.sqlite",
+    )
+    assert output["result"]["temperature"]["values"] == [300.0, 310.0, 320.0]
+    assert local_oli_server.num_submitted == 3
@@ -44,11 +44,16 @@
 # derivative works, incorporate into other computer software, distribute, and sublicense such enhancements
 # or derivative works thereof, in binary and source code form.
 ###############################################################################
+import json
+import time
+from collections import deque
 from pathlib import Path
 
 import pytest
 
-from watertap.tools.oli_api.client import OLIApi
+from watertap.tools.oli_api.conftest import LocalOLIServer
+
+from watertap.tools.oli_api.client import OLIApi, PollingStrategy
 
 
 @pytest.mark.unit
@@ -97,3 +102,210 @@ def test_valid_phases(oliapi_instance: OLIApi):
 @pytest.mark.unit
 def test_invalid_phases(oliapi_instance_with_invalid_phase: OLIApi):
     oliapi_instance_with_invalid_phase
+
+
+def _local_requests(num_samples):
+    return [
+        {
+            "flash_method": "isothermal",
+            "dbs_file_id": "local-dbs",
+            "input_params": {"params": {"sample": idx}},
+        }
+        for idx in range(num_samples)
+    ]
+
+
+@pytest.mark.unit
+def test_process_request_list_serial(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    results = local_oliapi_instance.process_request_list(_local_requests(3))
+    assert [r["result"]["echo"]["params"]["sample"] for r in results] == [0, 1, 2]
+    assert local_oli_server.max_in_flight == 1
+
+
+@pytest.mark.unit
+def test_process_request_list_concurrent(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    requests = _local_requests(12)
+    results = local_oliapi_instance.process_request_list(
+        requests, max_concurrent_processes=4, burst_job_tag="test"
+    )
+    assert [r["result"]["echo"]["params"]["sample"] for r in results] == list(range(12))
+    assert [r["submitted_requests"] for r in results] == requests
+    assert all("burst=watertap_burst_test" in r["result"]["url"] for r in results)
+    assert 1 < local_oli_server.max_in_flight <= 4
+    assert local_oli_server.num_submitted == 12
+
+
+@pytest.mark.unit
+def test_process_request_list_batches(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    results = local_oliapi_instance.process_request_list(
+        _local_requests(5), max_concurrent_processes=8, batch_size=2
+    )
+    assert [r["result"]["echo"]["params"]["sample"] for r in results] == list(range(5))
+    assert local_oli_server.max_in_flight <= 2
+
+
+@pytest.mark.unit
+def test_session_reuses_connections(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    assert (
+        local_oliapi_instance.session
+        is local_oliapi_instance.credential_manager.session
+    )
+    local_oliapi_instance.process_request_list(_local_requests(5))
+    # login + 5 submits + at least 10 polls over a single keep-alive connection
+    assert local_oli_server.num_polls >= 10
+    assert local_oli_server.num_connections == 1
+
+
+@pytest.mark.unit
+def test_exit_closes_session(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    local_oliapi_instance.process_request_list(_local_requests(2))
+    assert local_oli_server.num_connections == 1
+    local_oliapi_instance.__exit__()
+    # the pooled connection was closed, so a new one is opened
+    local_oliapi_instance.process_request_list(_local_requests(2))
+    assert local_oli_server.num_connections == 2
+
+
+@pytest.mark.unit
+def test_session_pool_grows_with_concurrency(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    credential_manager = local_oliapi_instance.credential_manager
+    assert credential_manager.pool_size == 10
+    local_oliapi_instance.process_request_list(
+        _local_requests(24), max_concurrent_processes=12
+    )
+    assert credential_manager.pool_size == 12
+    # login connection + at most one connection per thread, none discarded
+    assert local_oli_server.num_connections <= 13
+
+
+@pytest.mark.unit
+def test_process_request_list_concurrent_failure(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    requests = _local_requests(6)
+    key = json.dumps(requests[2]["input_params"], sort_keys=True)
+    local_oli_server.submissions_to_reject[key] = 1
+    results = local_oliapi_instance.process_request_list(
+        requests, max_concurrent_processes=3
+    )
+    # the failed sample does not discard the others
+    assert results[2] is None
+    assert [r["result"]["echo"]["params"]["sample"] for r in results if r] == [
+        0,
+        1,
+        3,
+        4,
+        5,
+    ]
+
+
+@pytest.mark.unit
+def test_process_request_list_invalid_args(local_oliapi_instance: OLIApi):
+    with pytest.raises(ValueError, match="max_concurrent_processes"):
+        local_oliapi_instance.process_request_list(
+            _local_requests(1), max_concurrent_processes=0
+        )
+    with pytest.raises(ValueError, match="batch_size"):
+        local_oliapi_instance.process_request_list(_local_requests(1), batch_size=0)
+    with pytest.raises(TypeError, match="max_concurent_processes"):
+        local_oliapi_instance.process_request_list(
+            _local_requests(1), max_concurent_processes=8
+        )
+
+
+@pytest.mark.unit
+def test_polling_strategy_delays():
+    strategy = PollingStrategy(
+        initial_delay=0.1, max_delay=0.8, growth_factor=2, jitter=0, timeout=60
+    )
+    delays = strategy.delays()
+    assert [next(delays) for _ in range(6)] == [0.1, 0.2, 0.4, 0.8, 0.8, 0.8]
+
+    strategy = PollingStrategy(initial_delay=1, max_delay=2, jitter=0.5, timeout=60)
+    delays = strategy.delays()
+    assert all(0.5 <= next(delays) <= 3 for _ in range(20))
+
+
+@pytest.mark.unit
+def test_polling_strategy_deadline():
+    strategy = PollingStrategy(initial_delay=0.01, max_delay=0.01, timeout=0.05)
+    total = 0
+    for delay in strategy.delays():
+        total += delay
+        time.sleep(delay)
+    assert total == pytest.approx(0.05, abs=0.03)
+
+
+@pytest.mark.unit
+def test_polling_strategy_invalid_args():
+    with pytest.raises(ValueError, match="initial_delay"):
+        PollingStrategy(initial_delay=2, max_delay=1)
+    with pytest.raises(ValueError, match="growth_factor"):
+        PollingStrategy(growth_factor=0.5)
+    with pytest.raises(ValueError, match="jitter"):
+        PollingStrategy(jitter=1)
+    with pytest.raises(ValueError, match="timeout"):
+        PollingStrategy(timeout=0)
+
+
+@pytest.mark.unit
+def test_call_records_timings(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    local_oliapi_instance.call(**_local_requests(1)[0])
+    (timing,) = local_oliapi_instance.request_timings
+    assert timing["flash_method"] == "isothermal"
+    assert timing["status"] == "PROCESSED"
+    assert timing["num_polls"] == local_oli_server.polls_to_process
+    assert timing["queue_time"] >= 0
+    assert timing["processing_time"] >= 0
+    assert timing["total_time"] == pytest.approx(
+        timing["queue_time"] + timing["processing_time"]
+    )
+
+
+@pytest.mark.unit
+def test_call_request_timings_capped(local_oliapi_instance: OLIApi):
+    local_oliapi_instance.request_timings = deque(maxlen=2)
+    local_oliapi_instance.process_request_list(_local_requests(3))
+    assert len(local_oliapi_instance.request_timings) == 2
+
+
+@pytest.mark.unit
+def test_call_deprecated_polling_arguments(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    local_oli_server.polls_to_process = 10**6
+    with pytest.warns(DeprecationWarning, match="poll_time and max_request"):
+        with pytest.raises(RuntimeError, match="Poll limit exceeded"):
+            local_oliapi_instance.call(
+                **_local_requests(1)[0], poll_time=0.01, max_request=5
+            )
+    with pytest.raises(TypeError, match="cannot be combined"):
+        local_oliapi_instance.call(
+            **_local_requests(1)[0],
+            poll_time=0.01,
+            polling_strategy=PollingStrategy(),
+        )
+
+
+@pytest.mark.unit
+def test_call_poll_deadline(
+    local_oliapi_instance: OLIApi, local_oli_server: LocalOLIServer
+):
+    local_oli_server.polls_to_process = 10**6
+    strategy = PollingStrategy(initial_delay=0.01, max_delay=0.02, timeout=0.1)
+    with pytest.raises(RuntimeError, match="Poll limit exceeded"):
+        local_oliapi_instance.call(**_local_requests(1)[0], polling_strategy=strategy)
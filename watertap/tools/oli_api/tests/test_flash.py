@@ -46,10 +46,17 @@
 ###############################################################################
 import pytest
 
+from math import isnan
 from pathlib import Path
 
-from watertap.tools.oli_api.flash import Flash, build_survey
+from watertap.tools.oli_api.flash import (
+    Flash,
+    FlashResultsFlattener,
+    build_survey,
+    flatten_results,
+)
 from watertap.tools.oli_api.client import OLIApi
+from watertap.tools.oli_api.conftest import LocalOLIServer
 
 from numpy import linspace
 
@@ -171,3 +178,136 @@ def test_bubble_point(
     pytest.approx(
         saturation_pressure["result"]["calculatedVariables"]["values"][0], rel=1e-3
     ) == 32.04094
+
+
+def _make_flash_result(index):
+    return {
+        "result": {
+            "phases": {
+                "liquid1": {
+                    "density": {"unit": "g/cm3", "value": 1.0 + index},
+                    "molecularConcentration": {
+                        "unit": "mg/L",
+                        "values": {"H2O": 55.0, "NACL": 0.1 * index},
+                    },
+                },
+            },
+            "total": {"osmoticPressure": {"unit": "Pa", "value": 100.0 * index}},
+            "status": "ok",
+        },
+        "metaData": {"executionTime": {"unit": "ms", "value": 10}},
+        "submitted_requests": {
+            "flash_method": "isothermal",
+            "dbs_file_id": "local-dbs",
+        },
+    }
+
+
+@pytest.mark.unit
+def test_flatten_results():
+    results = [_make_flash_result(i) for i in range(3)]
+    # a later sample with an extra species must not reuse a stale structure
+    results[2]["result"]["phases"]["liquid1"]["molecularConcentration"]["values"][
+        "CACL2"
+    ] = 1.0
+    output = flatten_results(results)
+    assert output["result"]["density_liquid1"] == {
+        "units": "g/cm3",
+        "values": [1.0, 2.0, 3.0],
+    }
+    assert output["result"]["osmoticPressure_total"]["values"] == [0.0, 100.0, 200.0]
+    assert output["result"]["molecularConcentration_liquid1"]["NACL"]["values"] == [
+        0.0,
+        0.1,
+        pytest.approx(0.2),
+    ]
+    cacl2 = output["result"]["molecularConcentration_liquid1"]["CACL2"]["values"]
+    assert all(isnan(v) for v in cacl2[:2]) and cacl2[2] == 1.0
+    assert output["result"]["status"] == ["ok", "ok", "ok"]
+    assert output["metaData"]["executionTime"]["values"] == [10.0, 10.0, 10.0]
+    assert output["submitted_requests"]["dbs_file_id"] == ["local-dbs"] * 3
+
+
+@pytest.mark.unit
+def test_flattener_deep_keys():
+    results = [_make_flash_result(i) for i in range(3)]
+    for result in results:
+        liquid = result["result"]["phases"]["liquid1"]
+        liquid["properties"] = {"density": liquid.pop("density")}
+    # a property nested below the top levels that only appears in a later sample
+    results[2]["result"]["phases"]["liquid1"]["properties"]["ionicStrength"] = {
+        "unit": "mol/kg",
+        "value": 0.5,
+    }
+    output = flatten_results(results)
+    assert output["result"]["density_liquid1"]["values"] == [1.0, 2.0, 3.0]
+    ionic_strength = output["result"]["ionicStrength_liquid1"]["values"]
+    assert all(isnan(v) for v in ionic_strength[:2]) and ionic_strength[2] == 0.5
+
+
+@pytest.mark.unit
+def test_flattener_resume(tmp_path: Path):
+    results = [_make_flash_result(i) for i in range(4)]
+    file_name = tmp_path / "results.h5"
+    with FlashResultsFlattener(4, file_name) as flattener:
+        flattener.add_result(0, results[0])
+        flattener.add_result(3, results[3])
+
+    with FlashResultsFlattener(4, file_name) as flattener:
+        assert flattener.completed_indices == [0, 3]
+        for idx in [1, 2]:
+            flattener.add_result(idx, results[idx])
+        resumed = flattener.to_dict()
+    assert resumed == flatten_results(results)
+    columns = FlashResultsFlattener(4, file_name)
+    assert columns.to_arrays()[("result", "density_liquid1", "values")].tolist() == [
+        1.0,
+        2.0,
+        3.0,
+        4.0,
+    ]
+    columns.close()
+
+    with pytest.raises(RuntimeError, match="holds 4 samples"):
+        FlashResultsFlattener(5, file_name)
+
+
+@pytest.mark.unit
+def test_run_flash_streams_results(
+    flash_instance: Flash, local_oliapi_instance: OLIApi, tmp_path: Path
+):
+    json_input = {"params": {"temperature": {"unit": "K", "value": 300.0}}}
+    survey = build_survey({"temperature": [0, 10, 20]})
+    output = flash_instance.run_flash(
+        "isothermal",
+        local_oliapi_instance,
+        "local-dbs",
+        json_input,
+        survey,
+        max_concurrent_processes=3,
+        results_file=tmp_path / "survey.h5",
+    )
+    assert output["result"]["temperature"]["values"] == [300.0, 310.0, 320.0]
+    with FlashResultsFlattener(3, tmp_path / "survey.h5") as flattener:
+        assert flattener.completed_indices == [0, 1, 2]
+        assert flattener.to_dict() == output
+
+
+@pytest.mark.unit
+def test_run_flash_resumes_from_results_file(
+    flash_instance: Flash,
+    local_oliapi_instance: OLIApi,
+    local_oli_server: LocalOLIServer,
+    tmp_path: Path,
+):
+    json_input = {"params": {"temperature": {"unit": "K", "value": 300.0}}}
+    survey = build_survey({"temperature": [0, 10, 20]})
+    results_file = tmp_path / "survey.h5"
+    args = ("isothermal", local_oliapi_instance, "local-dbs", json_input, survey)
+    output = flash_instance.run_flash(*args, results_file=results_file)
+    assert local_oli_server.num_submitted == 3
+
+    # samples already in the results file are not submitted again
+    resumed = flash_instance.run_flash(*args, results_file=results_file)
+    assert local_oli_server.num_submitted == 3
+    assert resumed == output
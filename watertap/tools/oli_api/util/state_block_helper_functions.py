@@ -24,10 +24,7 @@ from watertap.core.solvers import get_solver
 
 from watertap.property_models.multicomp_aq_sol_prop_pack import MCASParameterBlock
 
-from watertap.tools.oli_api.util.watertap_to_oli_helper_functions import (
-    get_molar_mass,
-    get_charge,
-)
+from watertap.core.util.chemistry import get_charge, get_molar_masses
 
 
 def create_state_block(source_water):
@@ -119,11 +116,10 @@ def create_property_model_input(components, property_model_type: str = ""):
         mw_data = {}
         charge = {}
 
+        molar_masses = get_molar_masses(components)
         for component in components:
-            molar_mass = get_molar_mass(component)
-            charge_value = get_charge(component)
             solute_list.append(component)
-            mw_data[component] = get_molar_mass(component) * 1e-3
+            mw_data[component] = molar_masses[component] * 1e-3
             charge_value = get_charge(component)
 
             if charge_value != 0:
@@ -62,6 +62,7 @@ from idaes.core.util.config import (
 import idaes.logger as idaeslog
 from idaes.core.util import scaling as iscale
 from watertap.core.solvers import get_solver
+from watertap.core.util.presolve import presolve_block
 
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.constants import Constants
@@ -333,6 +334,9 @@ see reaction package for documentation.}""",
             has_equilibrium=self.config.has_equilibrium_reactions
         )
 
+        # Geometry is needed before the balances to have holdup
+        self.liquid_phase.add_geometry()
+
         # Separate liquid and vapor phases means that phase equilibrium will
         # be handled at the unit model level, thus has_phase_equilibrium is
         # False, but has_mass_transfer is True.
@@ -378,8 +382,6 @@ see reaction package for documentation.}""",
                 f"same material flow basis."
             )
 
-        self.liquid_phase.add_geometry()
-
         # Add Ports
         self.add_inlet_port(name="inlet", block=self.liquid_phase, doc="Liquid feed")
         self.add_outlet_port(
@@ -941,6 +943,7 @@ see reaction package for documentation.}""",
         outlvl=idaeslog.NOTSET,
         solver=None,
         optarg=None,
+        presolve=False,
     ):
         """
         Initialization routine for anaerobic digester unit model.
@@ -959,6 +962,9 @@ see reaction package for documentation.}""",
                      default solver options)
             solver : str indicating which solver to use during
                      initialization (default = None, use default IDAES solver)
+            presolve : bool indicating whether to pre-solve the unit model with
+                     a Newton method before solving it with the solver
+                     (default = False)
 
         Returns:
             None
@@ -1030,6 +1036,9 @@ see reaction package for documentation.}""",
             self.Ch4_Henrys_law.deactivate()
             self.H2_Henrys_law.deactivate()
 
+            if presolve:
+                presolve_block(self, outlvl=outlvl)
+
             results = solverobj.solve(self, tee=slc.tee, options={"ma27_pivtol": 1e-2})
 
             if not check_optimal_termination(results):
@@ -29,6 +29,7 @@ from pyomo.environ import (
     units as pyunits,
 )
 
+from watertap.core import PresolveInitializationMixin
 from watertap.costing.unit_models.cstr import cost_cstr
 
 __author__ = "Marcus Holly"
@@ -39,7 +40,7 @@ _log = idaeslog.getLogger(__name__)
 
 
 @declare_process_block_class("CSTR")
-class CSTRData(CSTRIDAESData):
+class CSTRData(PresolveInitializationMixin, CSTRIDAESData):
     """
     CSTR unit block for BSM2
     """
@@ -43,7 +43,7 @@ from idaes.core.util.config import (
 from idaes.core.util.exceptions import ConfigurationError
 from enum import Enum, auto
 
-from watertap.core import InitializationMixin
+from watertap.core import InitializationMixin, PresolveInitializationMixin
 
 from watertap.costing.unit_models.cstr_injection import cost_cstr_injection
 
@@ -65,7 +65,9 @@ class ElectricityConsumption(Enum):
 
 
 @declare_process_block_class("CSTR_Injection")
-class CSTR_InjectionData(InitializationMixin, UnitModelBlockData):
+class CSTR_InjectionData(
+    InitializationMixin, PresolveInitializationMixin, UnitModelBlockData
+):
     """
     CSTR Unit Model with Injection Class
     """
@@ -10,6 +10,8 @@
 # "https://github.com/watertap-org/watertap/"
 #################################################################################
 
+import os
+
 # Import Pyomo libraries
 from pyomo.environ import (
     Set,
@@ -38,11 +40,35 @@ import idaes.logger as idaeslog
 from watertap.costing.unit_models.surrogate_crystallizer import (
     cost_surrogate_crystallizer,
 )
+from watertap.core.util.rbf_surrogate import load_rbf_surrogate
 
 _log = idaeslog.getLogger(__name__)
 
 __author__ = "Oluwamayowa Amusat, Adam Atia"
 
+_DEFAULT_SURROGATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "data",
+    "surrogate_defaults",
+    "surrogate_crystallizer_defaults",
+)
+
+
+def load_default_surrogate(name):
+    """
+    Load one of the default RBF surrogates for the crystallizer, parsed once
+    and cached as NumPy arrays.
+
+    Args:
+        name: name of the surrogate, e.g. "Vapor_Pressure" or "Halite_g"
+
+    Returns:
+        RBFSurrogate, which can be added to a block with
+        watertap.core.util.rbf_surrogate.build_rbf_surrogate
+    """
+    return load_rbf_surrogate(os.path.join(_DEFAULT_SURROGATE_PATH, f"{name}.json"))
+
 
 @declare_process_block_class("SurrogateCrystallizer")
 class SurrogateCrystallizerData(UnitModelBlockData):
@@ -39,6 +39,7 @@ from idaes.core.util.testing import (
 )
 from idaes.core.util.exceptions import ConfigurationError
 from watertap.core.solvers import get_solver
+from watertap.core.util.presolve import presolve_block
 from pyomo.util.check_units import assert_units_consistent, assert_units_equivalent
 
 from watertap.unit_models.aeration_tank import AerationTank, ElectricityConsumption
@@ -284,6 +285,57 @@ class TestAeration_withASM1(object):
         model.fs.unit.report()
 
 
+def build_presolve_ASM1():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(dynamic=False)
+    m.fs.properties = ASM1ParameterBlock()
+    m.fs.reactions = ASM1ReactionParameterBlock(property_package=m.fs.properties)
+    m.fs.unit = AerationTank(
+        property_package=m.fs.properties,
+        reaction_package=m.fs.reactions,
+    )
+
+    m.fs.unit.inlet.flow_vol.fix(20648 * units.m**3 / units.day)
+    m.fs.unit.inlet.temperature.fix(308.15 * units.K)
+    m.fs.unit.inlet.pressure.fix(1 * units.atm)
+    for j, conc in {
+        "S_I": 27,
+        "S_S": 58,
+        "X_I": 92,
+        "X_S": 363,
+        "X_BH": 50,
+        "X_BA": 0,
+        "X_P": 0,
+        "S_O": 0,
+        "S_NO": 0,
+        "S_NH": 23,
+        "S_ND": 5,
+        "X_ND": 16,
+    }.items():
+        m.fs.unit.inlet.conc_mass_comp[0, j].fix(conc * units.g / units.m**3)
+    m.fs.unit.inlet.alkalinity.fix(7 * units.mol / units.m**3)
+
+    m.fs.unit.volume.fix(500)
+    m.fs.unit.injection.fix(0)
+    m.fs.unit.injection[0, "Liq", "S_O"].fix(2e-3)
+
+    return m
+
+
+@pytest.mark.component
+def test_presolve():
+    m = build_presolve_ASM1()
+    assert presolve_block(m.fs.unit)
+
+    assert pytest.approx(6.258e-3, rel=1e-3) == value(
+        m.fs.unit.outlet.conc_mass_comp[0, "S_O"]
+    )
+    assert pytest.approx(18.3765, rel=1e-5) == value(
+        m.fs.unit.electricity_consumption[0]
+    )
+    assert pytest.approx(8.2694, rel=1e-4) == value(m.fs.unit.KLa)
+
+
 @pytest.mark.build
 @pytest.mark.unit
 def test_with_asm2d():
@@ -19,8 +19,11 @@ Aspects on ADM1 Implementation within the BSM2 Framework.
 Department of Industrial Electrical Engineering and Automation, Lund University, Lund, Sweden, pp.1-35.
 
 """
+import pytest
+
 from pyomo.environ import (
     ConcreteModel,
+    value,
 )
 
 from idaes.core import (
@@ -28,6 +31,7 @@ from idaes.core import (
 )
 
 from watertap.core.solvers import get_solver
+from watertap.core.util.presolve import presolve_block
 
 from watertap.unit_models.anaerobic_digester import AD
 from watertap.property_models.unit_specific.anaerobic_digestion.adm1_properties import (
@@ -238,3 +242,19 @@ class TestAnaerobicDigester(UnitTestHarness):
         }
 
         return m
+
+
+@pytest.mark.component
+def test_presolve():
+    m = build()
+    assert presolve_block(m.fs.unit)
+
+    outlet = m.fs.unit.liquid_outlet
+    assert value(outlet.conc_mass_comp[0, "S_h2"]) == pytest.approx(
+        2.35916e-07, rel=1e-4
+    )
+    assert value(outlet.conc_mass_comp[0, "X_ac"]) == pytest.approx(0.760653, rel=1e-4)
+    assert value(outlet.conc_mass_comp[0, "S_IC"]) == pytest.approx(1.8320212, rel=1e-4)
+    assert value(m.fs.unit.vapor_outlet.flow_vol[0]) == pytest.approx(
+        0.03249637, rel=1e-4
+    )
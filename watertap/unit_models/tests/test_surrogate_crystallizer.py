@@ -13,6 +13,7 @@
 import os
 import pytest
 from pyomo.environ import (
+    Block,
     ConcreteModel,
     Var,
     Constraint,
@@ -33,7 +34,11 @@ from idaes.core.surrogate.surrogate_block import SurrogateBlock
 from idaes.core.surrogate.pysmo_surrogate import (
     PysmoSurrogate,
 )
-from watertap.unit_models.surrogate_crystallizer import SurrogateCrystallizer
+from watertap.unit_models.surrogate_crystallizer import (
+    SurrogateCrystallizer,
+    load_default_surrogate,
+)
+from watertap.core.util.rbf_surrogate import build_rbf_surrogate
 
 from idaes.core import UnitModelCostingBlock
 from watertap.costing import WaterTAPCosting
@@ -48,6 +53,7 @@ def add_crystallizer_rbf_model(
     surrogate_inputs_with_bounds,
     surrogate_outputs,
     surrogate_to_flowsheet_basis_ratio,
+    compact_rbf=False,
 ):
     ##############################################################################################################
     # block loading into IDAES Surrogate Block
@@ -77,6 +83,16 @@ def add_crystallizer_rbf_model(
 
     for sm in range(0, len(filename)):
         block_name = "crystallizer_surrogate" + "_" + filename[sm]
+        if compact_rbf:
+            # Compact RBF constraints built from the cached default surrogates
+            blk.add_component(block_name, Block())
+            build_rbf_surrogate(
+                getattr(blk, block_name),
+                load_default_surrogate(filename[sm]),
+                input_vars=crystallizer_inputs,
+                output_var=crystallizer_outputs[sm],
+            )
+            continue
         blk.add_component(block_name, SurrogateBlock(concrete=True))
         surrogate_name = f"{filename[sm]}.json"
         surrogate_path = os.path.join(
@@ -121,7 +137,8 @@ def add_crystallizer_rbf_model(
 
 
 @pytest.mark.component
-def test_rbf_surrogate():
+@pytest.mark.parametrize("compact_rbf", [False, True])
+def test_rbf_surrogate(compact_rbf):
     m = ConcreteModel()
     m.case = "BGW1"
     m.fs = FlowsheetBlock(dynamic=False)
@@ -206,6 +223,7 @@ def test_rbf_surrogate():
         surrogate_inputs_with_bounds=surrogate_inputs,
         surrogate_outputs=surrogate_outputs,
         surrogate_to_flowsheet_basis_ratio=1,
+        compact_rbf=compact_rbf,
     )
 
     # Costing